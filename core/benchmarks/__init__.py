@@ -0,0 +1,98 @@
+"""Standalone performance benchmarks.
+
+Run from the ``core/`` directory, e.g. ``python -m benchmarks.bench_indexes``.
+Each script works on a throwaway test database and never touches the
+development database.
+"""
+
+import os
+import statistics
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator
+
+import django
+
+
+def setup_django() -> None:
+    """Configure Django with the project settings."""
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+    django.setup()
+
+
+@contextmanager
+def benchmark_database(on_disk: bool = False) -> Iterator[str]:
+    """Create and migrate a throwaway test database for the duration of a run.
+
+    Uses the ``default`` connection's test database, in-memory for SQLite
+    unless ``on_disk``, which concurrent benchmarks need for WAL and locking
+    to behave as in real use.
+    """
+    from django.db import connection
+
+    old_name = connection.settings_dict["NAME"]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        if on_disk and connection.vendor == "sqlite":
+            connection.settings_dict["TEST"]["NAME"] = os.path.join(tmpdir, "bench.db")
+        test_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            yield test_name
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def timeit(func: Callable[[], object], repeat: int = 20) -> Dict[str, float]:
+    """Run ``func`` ``repeat`` times and return timing stats in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "mean_ms": statistics.fmean(samples),
+        "p50_ms": samples[len(samples) // 2],
+        "p99_ms": samples[min(len(samples) - 1, int(len(samples) * 0.99))],
+    }
+
+
+def seed_users(count: int, batch_size: int = 10_000, with_contacts: bool = True) -> None:
+    """Bulk insert ``count`` users spread over 80 years of birth dates.
+
+    Each user gets a unique CPF and, with ``with_contacts``, one active EMAIL
+    contact. Generation is deterministic so runs are comparable.
+    """
+    import random
+    from datetime import date, timedelta
+
+    from user.models import Contact, User, month_day_key
+
+    rng = random.Random(42)
+    first_birth = date(1940, 1, 1)
+    for start in range(0, count, batch_size):
+        births = [
+            first_birth + timedelta(days=rng.randrange(365 * 80))
+            for _ in range(start, min(start + batch_size, count))
+        ]
+        users = User.objects.bulk_create(
+            [
+                User(
+                    username=f"user{i}",
+                    email=f"user{i}@example.com",
+                    first_name=f"First{i}",
+                    last_name=f"Last{i}",
+                    cpf=f"{i:011d}",
+                    date_birth=birth,
+                    birth_month_day=month_day_key(birth),
+                )
+                for i, birth in enumerate(births, start)
+            ],
+        )
+        if with_contacts:
+            Contact.objects.bulk_create(
+                [
+                    Contact(user=user, type=Contact.ContactType.EMAIL, value=user.email)
+                    for user in users
+                ],
+            )
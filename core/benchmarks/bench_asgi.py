@@ -0,0 +1,146 @@
+"""Throughput and latency of the user API served over WSGI and over ASGI.
+
+Sends ``--requests`` requests to ``/api2/users/me`` and ``/api2/users/``,
+keeping ``--concurrency`` of them in flight:
+
+- ``wsgi``: ``core.wsgi`` called from ``--concurrency`` threads, as a threaded
+  WSGI server (e.g. ``gunicorn --threads``) does. Async routes run through
+  ``async_to_sync`` there.
+- ``asgi``: ``core.asgi`` with ``--concurrency`` tasks on one event loop, as
+  one ASGI server worker (e.g. ``uvicorn``) does.
+
+Both run in-process through httpx transports, so the numbers leave out the
+network and the server's HTTP parsing.
+
+Usage (from ``core/``):
+    python -m benchmarks.bench_asgi --users 10000 --requests 2000 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+import httpx
+
+from benchmarks import benchmark_database, seed_users, setup_django
+
+ROUTES = {
+    "/users/me": "/api2/users/me",
+    "/users/": "/api2/users/?limit=20",
+}
+
+
+def _report(mode: str, route: str, samples: List[float], errors: int, elapsed: float):
+    samples.sort()
+    p50 = samples[len(samples) // 2] if samples else 0
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))] if samples else 0
+    rps = len(samples) / elapsed
+    print(f"{mode:<5} {route:<10} {rps:9.1f} {p50:8.2f} {p99:8.2f} {errors:7d}")
+
+
+def run_wsgi(path: str, headers: Dict[str, str], requests: int, concurrency: int):
+    from django.core.wsgi import get_wsgi_application
+    from django.db import connections
+
+    client = httpx.Client(
+        transport=httpx.WSGITransport(app=get_wsgi_application()),
+        base_url="http://testserver",
+        headers=headers,
+    )
+
+    def request(_) -> float | None:
+        began = time.perf_counter()
+        response = client.get(path)
+        if response.status_code != 200:
+            return None
+        return (time.perf_counter() - began) * 1000
+
+    def close_connections(_) -> None:
+        connections.close_all()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        start = time.perf_counter()
+        results = list(pool.map(request, range(requests)))
+        elapsed = time.perf_counter() - start
+        list(pool.map(close_connections, range(concurrency)))
+    client.close()
+    return results, elapsed
+
+
+async def run_asgi(path: str, headers: Dict[str, str], requests: int, concurrency: int):
+    from django.core.asgi import get_asgi_application
+
+    remaining = iter(range(requests))
+    results = []
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=get_asgi_application()),
+        base_url="http://testserver",
+        headers=headers,
+    ) as client:
+
+        async def worker() -> None:
+            for _ in remaining:
+                began = time.perf_counter()
+                response = await client.get(path)
+                if response.status_code != 200:
+                    results.append(None)
+                else:
+                    results.append((time.perf_counter() - began) * 1000)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return results, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+    from ninja_jwt.tokens import AccessToken
+
+    from user.models import User
+
+    # Allows the "testserver" host
+    setup_test_environment()
+    logging.disable(logging.WARNING)
+
+    with benchmark_database(on_disk=True):
+        seed_users(args.users)
+        admin = User.objects.create_user(username="bench-admin", is_staff=True)
+        headers = {"Authorization": f"Bearer {AccessToken.for_user(admin)}"}
+        connection.close()
+
+        print(
+            f"{args.requests} requests per route, {args.concurrency} in flight,"
+            f" {connection.vendor}, {args.users} users"
+        )
+        print(
+            f"{'mode':<5} {'route':<10} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}"
+        )
+        for route, path in ROUTES.items():
+            for mode in ("wsgi", "asgi"):
+                if mode == "wsgi":
+                    results, elapsed = run_wsgi(
+                        path, headers, args.requests, args.concurrency
+                    )
+                else:
+                    results, elapsed = asyncio.run(
+                        run_asgi(path, headers, args.requests, args.concurrency),
+                    )
+                samples = [r for r in results if r is not None]
+                _report(mode, route, samples, len(results) - len(samples), elapsed)
+
+
+if __name__ == "__main__":
+    main()
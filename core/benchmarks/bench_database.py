@@ -0,0 +1,140 @@
+"""Concurrent API and worker load against the configured database profile.
+
+Runs ``--readers`` threads that call the user API (detail and list pages)
+alongside ``--writers`` threads that do what queue workers do (small write
+transactions on users and contacts) for ``--seconds``, then reports the
+throughput, latency and errors of each side.
+
+The profile comes from the environment (see ``DB_ENGINE`` in the README), e.g.
+from ``core/``:
+    python -m benchmarks.bench_database
+    DB_ENGINE=postgres DB_HOST=/tmp/pgdata python -m benchmarks.bench_database
+    DB_ENGINE=postgres DB_POOL=false python -m benchmarks.bench_database
+
+SQLite runs on a temporary file instead of the in-memory test database, so
+WAL and the busy timeout apply as they do in local use.
+"""
+
+import argparse
+import logging
+import random
+import threading
+import time
+from collections import defaultdict
+
+from benchmarks import benchmark_database, seed_users, setup_django
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=10)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db import close_old_connections, connection, connections, transaction
+    from django.test import Client
+    from django.test.utils import setup_test_environment
+    from ninja_jwt.tokens import AccessToken
+
+    from user.models import Contact, User
+
+    # Allows the test client's "testserver" host
+    setup_test_environment()
+    logging.disable(logging.WARNING)
+    samples = defaultdict(list)
+    errors = defaultdict(list)
+    stop = threading.Event()
+    start = threading.Barrier(args.readers + args.writers + 1)
+
+    def run(role: str, seed: int, operation) -> None:
+        rng = random.Random(seed)
+        start.wait()
+        try:
+            while not stop.is_set():
+                began = time.perf_counter()
+                try:
+                    operation(rng)
+                except Exception as e:  # noqa: BLE001 - counted and reported
+                    errors[role].append(f"{type(e).__name__}: {e}")
+                else:
+                    samples[role].append((time.perf_counter() - began) * 1000)
+                # What the request/task boundaries do in the server and workers
+                close_old_connections()
+        finally:
+            connections.close_all()
+
+    with benchmark_database(on_disk=True):
+        seed_users(args.users)
+        user_ids = list(User.objects.values_list("pk", flat=True))
+        admin = User.objects.create_user(username="bench-admin", is_staff=True)
+        token = f"Bearer {AccessToken.for_user(admin)}"
+        if connection.vendor == "sqlite":
+            print(
+                "journal_mode:",
+                connection.cursor().execute("PRAGMA journal_mode").fetchone()[0],
+            )
+        connection.close()
+
+        def api_request(rng) -> None:
+            client = Client(HTTP_AUTHORIZATION=token)
+            if rng.random() < 0.8:
+                response = client.get(f"/api2/users/{rng.choice(user_ids)}")
+            else:
+                response = client.get(f"/api2/users/?cursor={rng.choice(user_ids)}")
+            if response.status_code != 200:
+                raise RuntimeError(f"HTTP {response.status_code}")
+
+        def worker_task(rng) -> None:
+            user_id = rng.choice(user_ids)
+            with transaction.atomic():
+                user = User.objects.get(pk=user_id)
+                user.save_changes({"first_name": f"First{rng.random():.6f}"})
+                Contact.objects.create(
+                    user_id=user_id,
+                    type=Contact.ContactType.PHONE,
+                    value=f"{rng.randrange(10**10):011d}",
+                )
+
+        threads = [
+            threading.Thread(target=run, args=("api", i, api_request))
+            for i in range(args.readers)
+        ] + [
+            threading.Thread(target=run, args=("worker", 1000 + i, worker_task))
+            for i in range(args.writers)
+        ]
+        for thread in threads:
+            thread.start()
+        start.wait()
+        time.sleep(args.seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+    settings_dict = connection.settings_dict
+    pool = settings_dict["OPTIONS"].get("pool")
+    print(
+        f"{connection.vendor}: CONN_MAX_AGE={settings_dict['CONN_MAX_AGE']}"
+        f" pool={pool or False}, {args.readers} readers + {args.writers} writers"
+        f" for {args.seconds:g}s over {args.users} users"
+    )
+    print(f"{'role':<8} {'ops/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for role in ("api", "worker"):
+        latencies = sorted(samples[role])
+        ops = len(latencies) / args.seconds
+        p50 = latencies[len(latencies) // 2] if latencies else 0
+        p99 = (
+            latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+            if latencies
+            else 0
+        )
+        print(f"{role:<8} {ops:9.1f} {p50:8.2f} {p99:8.2f} {len(errors[role]):7d}")
+    for role, messages in errors.items():
+        for message in sorted(set(messages))[:3]:
+            print(f"  {role}: {message}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Query plans and timings for the hot lookup columns, before/after indexes.
+
+Seeds a throwaway database, drops the indexes and constraint on the hot lookup
+columns (CPF, ``birth_month_day``, active contacts by type), explains and times
+the hot queries, then recreates them and runs the same queries again.
+
+Usage (from ``core/``):
+    python -m benchmarks.bench_indexes --users 1000000
+"""
+
+import argparse
+
+from benchmarks import benchmark_database, seed_users, setup_django, timeit
+
+INDEX_NAMES = ("user_birth_month_day_idx", "contact_user_type_active_idx")
+CONSTRAINT_NAMES = ("user_cpf_unique",)
+
+
+def hot_queries(count: int):
+    from user.models import Contact, User
+
+    probe = count // 2
+    return {
+        "cpf lookup (admin clean_cpf)": lambda: User.objects.filter(
+            cpf=f"{probe:011d}",
+        ).exclude(pk=probe),
+        "birthday by month/day": lambda: User.objects.filter(
+            birth_month_day__in=[615],
+        ).values_list("pk"),
+        "active contact by type": lambda: Contact.objects.filter(
+            user_id=probe,
+            type=Contact.ContactType.EMAIL,
+            is_active=True,
+        ),
+    }
+
+
+def _schema_objects():
+    from user.models import Contact, User
+
+    for model in (User, Contact):
+        for index in model._meta.indexes:
+            if index.name in INDEX_NAMES:
+                yield model, "index", index
+        for constraint in model._meta.constraints:
+            if constraint.name in CONSTRAINT_NAMES:
+                yield model, "constraint", constraint
+
+
+def set_indexes(enabled: bool) -> None:
+    from django.db import connection
+
+    with connection.schema_editor() as editor:
+        for model, kind, obj in _schema_objects():
+            action = f"{'add' if enabled else 'remove'}_{kind}"
+            getattr(editor, action)(model, obj)
+
+
+def report(label: str, queries, repeat: int) -> None:
+    print(f"\n=== {label} ===")
+    for name, build in queries.items():
+        stats = timeit(lambda: list(build()), repeat=repeat)
+        print(f"\n-- {name}: mean {stats['mean_ms']:.2f} ms, p99 {stats['p99_ms']:.2f} ms")
+        print(build().explain())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    with benchmark_database():
+        print(f"Seeding {args.users} users...")
+        seed_users(args.users)
+        queries = hot_queries(args.users)
+
+        set_indexes(False)
+        report("before (no indexes)", queries, args.repeat)
+        set_indexes(True)
+        report("after (indexes + unique cpf)", queries, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Password hasher cost and login throughput.
+
+For each hasher configuration, measures the time of one hash and one
+verification, then the number of verifications per second (one per login)
+when ``--workers`` threads verify concurrently, as ``user.passwords`` does for
+async logins. Argon2 and bcrypt are included when ``argon2-cffi`` / ``bcrypt``
+are installed.
+
+Usage (from ``core/``):
+    python -m benchmarks.bench_password_hashers --workers 4
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks import setup_django, timeit
+
+PASSWORD = "correct horse battery staple"
+
+
+def hasher_configurations():
+    """Yield ``(label, hasher)`` pairs for every available configuration."""
+    from django.contrib.auth.hashers import (
+        Argon2PasswordHasher,
+        BCryptSHA256PasswordHasher,
+        PBKDF2PasswordHasher,
+    )
+
+    for iterations in (PBKDF2PasswordHasher.iterations, 600_000, 260_000):
+        hasher = type("PBKDF2", (PBKDF2PasswordHasher,), {"iterations": iterations})()
+        yield f"pbkdf2_sha256 ({iterations} it)", hasher
+
+    for label, hasher_class in (
+        ("argon2", Argon2PasswordHasher),
+        ("bcrypt_sha256", BCryptSHA256PasswordHasher),
+    ):
+        try:
+            hasher_class()._load_library()
+        except ValueError:
+            print(f"{label}: library not installed, skipped")
+            continue
+        yield label, hasher_class()
+
+
+def logins_per_second(hasher, encoded: str, workers: int, duration: float) -> float:
+    """Verify ``encoded`` from ``workers`` threads for ``duration`` seconds."""
+    deadline = time.perf_counter() + duration
+
+    def worker() -> int:
+        count = 0
+        while time.perf_counter() < deadline:
+            hasher.verify(PASSWORD, encoded)
+            count += 1
+        return count
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        total = sum(executor.map(lambda _: worker(), range(workers)))
+    return total / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--duration", type=float, default=3.0)
+    args = parser.parse_args()
+
+    setup_django()
+
+    print(
+        f"{'hasher':<28} {'hash ms':>9} {'verify ms':>10} "
+        f"{'logins/s (1)':>13} {f'logins/s ({args.workers})':>13}",
+    )
+    for label, hasher in hasher_configurations():
+        encoded = hasher.encode(PASSWORD, hasher.salt())
+        hash_stats = timeit(
+            lambda: hasher.encode(PASSWORD, hasher.salt()),
+            repeat=args.repeat,
+        )
+        verify_stats = timeit(
+            lambda: hasher.verify(PASSWORD, encoded),
+            repeat=args.repeat,
+        )
+        single = logins_per_second(hasher, encoded, 1, args.duration)
+        pooled = logins_per_second(hasher, encoded, args.workers, args.duration)
+        print(
+            f"{label:<28} {hash_stats['p50_ms']:9.1f} {verify_stats['p50_ms']:10.1f} "
+            f"{single:13.1f} {pooled:13.1f}",
+        )
+
+
+if __name__ == "__main__":
+    main()
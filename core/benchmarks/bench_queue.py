@@ -0,0 +1,134 @@
+"""Task throughput of the django-q2 ORM broker vs a Redis broker.
+
+For each broker, ``--producers`` threads enqueue ``--tasks`` tasks with
+``async_task``, then ``--consumers`` threads drain them the way cluster
+workers pull from the broker: dequeue (up to ``Q_CLUSTER["bulk"]`` tasks per
+round trip on the ORM broker, one on Redis) and acknowledge. Running the tasks
+is left out, so the numbers are the broker's cost per task.
+
+Redis runs against ``--redis-url`` or, by default, an in-process fakeredis
+``TcpFakeServer`` stand-in (needs ``fakeredis``), which is much slower than a
+real Redis or Valkey server: use it to compare query patterns, not absolutes.
+
+Usage (from ``core/``):
+    python -m benchmarks.bench_queue --tasks 5000 --producers 4 --consumers 4
+"""
+
+import argparse
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from typing import Iterator
+
+from benchmarks import benchmark_database, setup_django
+
+QUEUE = "bench"
+
+
+@contextmanager
+def fake_redis_server() -> Iterator[str]:
+    """Serve a fakeredis stand-in on a local port and yield its URL."""
+    from fakeredis import TcpFakeServer
+
+    server = TcpFakeServer(("127.0.0.1", 0))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        host, port = server.server_address
+        yield f"redis://{host}:{port}/0"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def use_broker(name: str, redis_url: str | None) -> None:
+    """Point django-q2 at the ``orm`` or ``redis`` broker."""
+    from django_q.conf import Conf
+
+    Conf.ORM = "default" if name == "orm" else None
+    Conf.REDIS = redis_url or {}
+
+
+def _in_threads(func, count: int, workers: int) -> float:
+    """Run ``func`` ``count`` times on ``workers`` threads; return elapsed seconds."""
+    from django.db import connections
+
+    def close_connections(_) -> None:
+        connections.close_all()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        start = time.perf_counter()
+        list(pool.map(func, range(count)))
+        elapsed = time.perf_counter() - start
+        list(pool.map(close_connections, range(workers)))
+    return elapsed
+
+
+def enqueue(tasks: int, producers: int) -> float:
+    from django_q.tasks import async_task
+
+    def produce(_) -> None:
+        async_task("math.copysign", 1, -1, cluster=QUEUE)
+
+    return _in_threads(produce, tasks, producers)
+
+
+def drain(tasks: int, consumers: int) -> float:
+    from django_q.brokers import get_broker
+
+    lock = threading.Lock()
+    drained = [0]
+
+    def consume(_) -> None:
+        broker = get_broker(QUEUE)
+        while True:
+            with lock:
+                if drained[0] >= tasks:
+                    return
+            for ack_id, _payload in broker.dequeue() or []:
+                broker.acknowledge(ack_id)
+                with lock:
+                    drained[0] += 1
+
+    return _in_threads(consume, consumers, consumers)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=5000)
+    parser.add_argument("--producers", type=int, default=4)
+    parser.add_argument("--consumers", type=int, default=4)
+    parser.add_argument("--redis-url", help="Redis-compatible server to use")
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db import connection
+    from django_q.brokers import get_broker
+    from django_q.conf import Conf
+
+    # django-q2 logs every enqueued task
+    logging.disable(logging.WARNING)
+
+    with benchmark_database(on_disk=True):
+        connection.close()
+        print(
+            f"{args.tasks} tasks, {args.producers} producers,"
+            f" {args.consumers} consumers, bulk {Conf.BULK}, {connection.vendor}"
+        )
+        print(f"{'broker':<7} {'enqueue/s':>10} {'dequeue/s':>10}")
+        for name in ("orm", "redis"):
+            with ExitStack() as stack:
+                redis_url = args.redis_url
+                if name == "redis" and not redis_url:
+                    redis_url = stack.enter_context(fake_redis_server())
+                use_broker(name, redis_url)
+                get_broker(QUEUE).purge_queue()
+                put = enqueue(args.tasks, args.producers)
+                got = drain(args.tasks, args.consumers)
+                print(f"{name:<7} {args.tasks / put:10.1f} {args.tasks / got:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Serialization cost of ``UserRetrieveSchema`` for many users.
+
+Compares the previous pattern (assigning ``user.name`` through the old
+``getattr``/lambda-based ``get_display_name`` before serializing) with the
+schema-level ``resolve_name`` resolver.
+
+Usage (from ``core/``):
+    python -m benchmarks.bench_serialization --users 10000
+"""
+
+import argparse
+
+from benchmarks import benchmark_database, seed_users, setup_django, timeit
+
+
+def legacy_display_name(user) -> str:
+    """``UserNameMixin.get_display_name`` as it was before the resolver."""
+    if full_name := getattr(user, "get_full_name", lambda: None)():
+        return full_name
+    first_name = getattr(user, "first_name", "")
+    last_name = getattr(user, "last_name", "")
+    return f"{first_name} {last_name}".strip()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+    from user.api.schemas import UserRetrieveSchema
+    from user.querysets import users_with_contacts
+
+    with benchmark_database():
+        seed_users(args.users)
+        users = list(users_with_contacts())
+
+        def legacy():
+            for user in users:
+                user.name = legacy_display_name(user) or user.username
+                UserRetrieveSchema.from_orm(user).model_dump()
+
+        def resolver():
+            for user in users:
+                UserRetrieveSchema.from_orm(user).model_dump()
+
+        def display_name_only():
+            for user in users:
+                user.get_display_name()
+
+        def legacy_display_name_only():
+            for user in users:
+                legacy_display_name(user)
+
+        print(f"{len(users)} users, median of {args.repeat} runs")
+        for label, func in (
+            ("legacy get_display_name", legacy_display_name_only),
+            ("get_display_name", display_name_only),
+            ("serialize (legacy user.name)", legacy),
+            ("serialize (resolve_name)", resolver),
+        ):
+            stats = timeit(func, repeat=args.repeat)
+            per_user_us = stats["p50_ms"] * 1000 / len(users)
+            print(f"{label:<32} {stats['p50_ms']:9.2f} ms  {per_user_us:7.2f} us/user")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Write amplification of single-user updates.
+
+Changes one field on ``--updates`` users with each strategy and reports the
+time per update and what each UPDATE statement writes:
+
+- ``save()``: the previous ``update_user`` behavior, rewriting every column.
+- ``save(update_fields=...)``: only the changed field plus ``updated_at``.
+- ``save_changes()``: one conditional UPDATE guarded by ``updated_at``.
+
+Usage (from ``core/``):
+    python -m benchmarks.bench_writes --users 10000 --updates 1000
+"""
+
+import argparse
+import re
+
+from benchmarks import benchmark_database, seed_users, setup_django, timeit
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--updates", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    from user.models import User
+
+    with benchmark_database():
+        seed_users(args.users, with_contacts=False)
+        users = list(User.objects.order_by("pk")[: args.updates])
+        runs = {"count": 0}
+
+        def full_save():
+            runs["count"] += 1
+            for user in users:
+                user.first_name = f"full {runs['count']}"
+                user.save()
+
+        def update_fields():
+            runs["count"] += 1
+            for user in users:
+                user.first_name = f"fields {runs['count']}"
+                user.save(update_fields=["first_name", "updated_at"])
+
+        def save_changes():
+            runs["count"] += 1
+            for user in users:
+                user.save_changes({"first_name": f"changes {runs['count']}"})
+
+        print(f"{len(users)} updates over {args.users} users, median of {args.repeat}")
+        print(f"{'strategy':<26} {'us/update':>10} {'columns':>8} {'sql bytes':>10}")
+        for label, func in (
+            ("save()", full_save),
+            ("save(update_fields=...)", update_fields),
+            ("save_changes()", save_changes),
+        ):
+            stats = timeit(func, repeat=args.repeat)
+            with CaptureQueriesContext(connection) as queries:
+                func()
+            updates = [q["sql"] for q in queries if q["sql"].startswith("UPDATE")]
+            set_clause = updates[0].split(" SET ", 1)[1].split(" WHERE ", 1)[0]
+            columns = len(re.findall(r'"\w+" =', set_clause))
+            sql_bytes = sum(map(len, updates)) / len(updates)
+            per_update_us = stats["p50_ms"] * 1000 / len(users)
+            print(f"{label:<26} {per_update_us:10.1f} {columns:8d} {sql_bytes:10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,3 +4,49 @@ import pytest
 @pytest.fixture(autouse=True)
 def enable_db_access_for_all_tests(db):
     """Enable database access for all tests."""
+
+
+@pytest.fixture(autouse=True)
+def clear_user_auth_cache():
+    """Start every test with an empty authentication cache."""
+    from user.authentication import user_cache
+
+    user_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_revocation_list():
+    """Start every test without previously loaded token revocations."""
+    from user.revocation import revocation_list
+
+    revocation_list.reset()
+
+
+@pytest.fixture(autouse=True)
+def clear_profile_cache():
+    """Start every test without cached user profiles."""
+    from user.profile_cache import profile_cache
+
+    profile_cache.cache.clear()
+
+
+@pytest.fixture
+def staff_user(django_user_model):
+    """A staff user, allowed through the admin-only routes."""
+    return django_user_model.objects.create_user(
+        username="admin",
+        password="x",
+        is_staff=True,
+    )
+
+
+@pytest.fixture
+def jwt_client(client, staff_user):
+    """Test client sending a bearer access token of ``staff_user``."""
+    from ninja_jwt.tokens import AccessToken
+    from user.revocation import revocation_list
+
+    client.defaults["HTTP_AUTHORIZATION"] = f"Bearer {AccessToken.for_user(staff_user)}"
+    # Revocations are synced periodically, not per request
+    revocation_list.sync()
+    return client
@@ -1,6 +1,5 @@
 from ninja_extra import NinjaExtraAPI
-from ninja_jwt.controller import NinjaJWTDefaultController
-from user.api import UserAuthController, UserCRUDController
+from user.api import TokenController, UserAuthController, UserCRUDController
 
 # Main API configuration
 api = NinjaExtraAPI(
@@ -10,8 +9,8 @@ api = NinjaExtraAPI(
     docs_url="/docs",
 )
 
-# Register JWT authentication controllers (default)
-api.register_controllers(NinjaJWTDefaultController)
+# Register JWT authentication controllers (pair, refresh, verify)
+api.register_controllers(TokenController)
 
 # Register custom controllers
 api.register_controllers(UserCRUDController)
@@ -0,0 +1,19 @@
+"""Named task queues.
+
+django-q2 serves one queue per cluster, so each queue has its own workers:
+
+- ``INTERACTIVE``: the default cluster (``Q_CLUSTER["name"]``), for jobs a user
+  is waiting on, such as password resets or a single notification.
+- ``BULK``: notification blasts, e.g. the daily birthday batches. Served by a
+  second cluster, sized by ``Q_CLUSTER["ALT_CLUSTERS"]["bulk"]`` and started
+  with ``Q_CLUSTER_NAME=bulk python manage.py qcluster``.
+
+A blast of thousands of bulk tasks therefore never delays interactive ones.
+Pass the queue explicitly (``async_task(..., cluster=BULK)``): without it a
+task goes to the queue of the cluster enqueueing it.
+"""
+
+from django.conf import settings
+
+INTERACTIVE = settings.Q_CLUSTER["name"]
+BULK = "bulk"
@@ -0,0 +1,120 @@
+"""Read replica routing.
+
+``ReplicaRouter`` sends reads to one of ``settings.DATABASE_REPLICAS`` and
+writes to ``default``. Replicas lag behind the primary, so after a write the
+current context is pinned to ``default`` and reads see the data just written:
+
+- for the rest of the request (or task), and
+- through ``ReplicaPinningMiddleware``, for the client's following requests
+  during ``settings.DATABASE_REPLICA_LAG`` seconds, using a cookie.
+
+Reads inside a transaction on ``default`` also stay there. Outside requests
+(management commands, queue workers) a write pins the rest of the process'
+context, which is the safe default for code that reads what it wrote.
+"""
+
+import random
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+PIN_COOKIE = "db_pinned_until"
+
+_pinned: ContextVar[bool] = ContextVar("db_pinned_to_primary", default=False)
+_wrote: ContextVar[bool] = ContextVar("db_wrote_to_primary", default=False)
+
+
+def pin_to_primary() -> None:
+    """Route the reads of the current context to ``default``.
+
+    Call it before reads that decide a write (read-modify-write), which must
+    not see a lagging replica.
+    """
+    _pinned.set(True)
+
+
+class ReplicaRouter:
+    """Route reads to a random replica unless pinned to ``default``."""
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        if (
+            not replicas
+            or _pinned.get()
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        _pinned.set(True)
+        _wrote.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+
+class ReplicaPinningMiddleware:
+    """Scope the primary pin to each request and carry it over replica lag.
+
+    Sync and async capable, so async views are not pushed to a thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        tokens = self._start(request)
+        try:
+            return self._finish(self.get_response(request))
+        finally:
+            self._reset(tokens)
+
+    async def __acall__(self, request):
+        tokens = self._start(request)
+        try:
+            return self._finish(await self.get_response(request))
+        finally:
+            self._reset(tokens)
+
+    @staticmethod
+    def _start(request):
+        try:
+            pinned_until = float(request.COOKIES.get(PIN_COOKIE, 0))
+        except ValueError:
+            pinned_until = 0
+        return _pinned.set(pinned_until > time.time()), _wrote.set(False)
+
+    @staticmethod
+    def _finish(response):
+        lag = settings.DATABASE_REPLICA_LAG
+        # Only a write starts a new window; inherited pins expire on time
+        if settings.DATABASE_REPLICAS and _wrote.get() and lag:
+            response.set_cookie(
+                PIN_COOKIE,
+                str(time.time() + lag),
+                max_age=lag,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+    @staticmethod
+    def _reset(tokens) -> None:
+        pinned, wrote = tokens
+        _pinned.reset(pinned)
+        _wrote.reset(wrote)
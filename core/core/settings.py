@@ -58,6 +58,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "core.routers.ReplicaPinningMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -92,10 +93,115 @@ WSGI_APPLICATION = "core.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
+# DB_ENGINE selects the profile: "sqlite" (default, local use) or "postgres".
+
+DB_ENGINE = os.getenv("DB_ENGINE", "sqlite")
+
+if DB_ENGINE == "postgres":
+    # Requires the "postgres" extra (psycopg with psycopg_pool).
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.getenv("DB_NAME", "politicsystem"),
+            "USER": os.getenv("DB_USER", "postgres"),
+            "PASSWORD": os.getenv("DB_PASSWORD", ""),
+            "HOST": os.getenv("DB_HOST", "localhost"),
+            "PORT": os.getenv("DB_PORT", "5432"),
+            "CONN_HEALTH_CHECKS": True,
+            "OPTIONS": {},
+        },
+    }
+    if os.getenv("DB_POOL", "true").lower() == "true":
+        # psycopg pool per process; Django requires CONN_MAX_AGE=0 with it
+        DATABASES["default"]["CONN_MAX_AGE"] = 0
+        DATABASES["default"]["OPTIONS"]["pool"] = {
+            "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+            "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+            "timeout": int(os.getenv("DB_POOL_TIMEOUT", "10")),
+        }
+    else:
+        # Persistent connections, e.g. behind PgBouncer
+        DATABASES["default"]["CONN_MAX_AGE"] = int(os.getenv("DB_CONN_MAX_AGE", "60"))
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.getenv("DB_NAME", BASE_DIR / "db.sqlite3"),
+            "OPTIONS": {
+                # Seconds a connection waits for a lock before "database is locked"
+                "timeout": int(os.getenv("DB_SQLITE_TIMEOUT", "20")),
+                # Take the write lock when the transaction starts, so concurrent
+                # writers wait on the busy timeout instead of failing to upgrade
+                "transaction_mode": "IMMEDIATE",
+                # WAL lets readers run alongside the single writer
+                "init_command": (
+                    "PRAGMA journal_mode=WAL;"
+                    "PRAGMA synchronous=NORMAL;"
+                    "PRAGMA foreign_keys=ON"
+                ),
+            },
+        },
+    }
+
+# Read replicas: comma-separated hosts (postgres) or database files (sqlite).
+# Each one becomes a "replica_<n>" alias that mirrors "default" in tests.
+
+DATABASE_REPLICAS = []
+for _number, _location in enumerate(
+    filter(None, os.getenv("DB_REPLICAS", "").split(",")),
+    start=1,
+):
+    _alias = f"replica_{_number}"
+    DATABASES[_alias] = {
+        **DATABASES["default"],
+        "OPTIONS": {**DATABASES["default"]["OPTIONS"]},
+        "HOST" if DB_ENGINE == "postgres" else "NAME": _location.strip(),
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(_alias)
+
+# Seconds reads stay on "default" after a client's write (replication lag)
+DATABASE_REPLICA_LAG = int(os.getenv("DB_REPLICA_LAG", "5"))
+
+DATABASE_ROUTERS = ["core.routers.ReplicaRouter"]
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+# CACHE_BACKEND selects the tier (backends in utils.cache_backends):
+# "locmem" (default, per process, LRU bounded by CACHE_MAX_ENTRIES), "file"
+# (shared by the processes of one host, under CACHE_LOCATION) or "redis"
+# (shared by every host, at CACHE_URL). Any Redis-compatible server works,
+# e.g. Valkey, or fakeredis' TcpFakeServer for local runs.
+
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "locmem")
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+
+if CACHE_BACKEND == "redis":
+    # Requires the "redis" extra. Size is bounded by the server's maxmemory.
+    _cache = {
+        "BACKEND": "utils.cache_backends.RedisCache",
+        "LOCATION": os.getenv("CACHE_URL", "redis://localhost:6379/0"),
+    }
+elif CACHE_BACKEND == "file":
+    _cache = {
+        "BACKEND": "utils.cache_backends.FileBasedCache",
+        "LOCATION": os.getenv("CACHE_LOCATION", str(BASE_DIR / "cache")),
+        "OPTIONS": {"MAX_ENTRIES": CACHE_MAX_ENTRIES},
+    }
+else:
+    _cache = {
+        "BACKEND": "utils.cache_backends.LRULocMemCache",
+        "LOCATION": "politicsystem",
+        "OPTIONS": {"MAX_ENTRIES": CACHE_MAX_ENTRIES},
+    }
+
+CACHES = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        **_cache,
+        "TIMEOUT": int(os.getenv("CACHE_TIMEOUT", "300")),
+        "KEY_PREFIX": os.getenv("CACHE_KEY_PREFIX", "politicsystem"),
     },
 }
 
@@ -145,7 +251,7 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "user.authentication.CachedJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
 }
@@ -154,6 +260,11 @@ SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=30),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
     "AUTH_HEADER_TYPES": ("Bearer",),
+    "TOKEN_REFRESH_SERIALIZER": "user.serializers.RevocableTokenRefreshSerializer",
+    # ninja_jwt reads SIMPLE_JWT in preference to NINJA_JWT when both exist
+    "TOKEN_OBTAIN_PAIR_REFRESH_INPUT_SCHEMA": (
+        "user.api.schemas.RevocableTokenRefreshInputSchema"
+    ),
 }
 
 DAISY_SETTINGS = {
@@ -183,17 +294,45 @@ DAISY_SETTINGS = {
 
 AUTH_USER_MODEL = "user.User"
 
+# Task queue (django-q2). Tasks mostly wait on notification APIs, so Q_WORKERS
+# (default: one per core) can be raised above the core count. core.queues
+# describes the "bulk" queue, served by its own cluster so notification blasts
+# do not starve interactive jobs. Q_BROKER is "orm" (default, the task table in
+# the database) or "redis" (requires the "redis" extra), which takes the
+# enqueue/dequeue traffic off the database.
+
+Q_WORKERS = int(os.getenv("Q_WORKERS", "0")) or os.cpu_count() or 4
+Q_BULK_WORKERS = int(os.getenv("Q_BULK_WORKERS", "0")) or Q_WORKERS
+# A bulk task sends a whole batch (BIRTHDAY_BATCH_SIZE notifications)
+Q_BULK_TIMEOUT = int(os.getenv("Q_BULK_TIMEOUT", "300"))
+
 Q_CLUSTER = {
     "name": "PoliticsSystem",
-    "workers": 1,
+    "workers": Q_WORKERS,
     "recycle": 500,
     "timeout": 60,
     "retry": 120,
-    "queue_limit": 50,
-    "bulk": 10,
-    "orm": "default",
+    # Tasks each worker pulls ahead, and tasks dequeued per broker round trip
+    "queue_limit": int(os.getenv("Q_QUEUE_LIMIT", str(Q_WORKERS * 4))),
+    "bulk": int(os.getenv("Q_BULK", "10")),
+    "ALT_CLUSTERS": {
+        "bulk": {
+            "workers": Q_BULK_WORKERS,
+            "timeout": Q_BULK_TIMEOUT,
+            # Must exceed the timeout, or running tasks are handed out again
+            "retry": Q_BULK_TIMEOUT + 60,
+            "queue_limit": Q_BULK_WORKERS * 4,
+        },
+    },
 }
 
+if os.getenv("Q_BROKER", "orm") == "redis":
+    Q_CLUSTER["redis"] = os.getenv("Q_REDIS_URL", "redis://localhost:6379/1")
+else:
+    Q_CLUSTER["orm"] = "default"
+    # Seconds between polls of the task table when it is empty
+    Q_CLUSTER["poll"] = float(os.getenv("Q_POLL", "0.2"))
+
 CORS_ALLOWED_ORIGINS = os.getenv("CORS_ALLOWED_ORIGINS", "http://localhost:3000").split(
     ",",
 )
@@ -204,7 +343,40 @@ NINJA_JWT = {
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
 }
 
+# Threads hashing/verifying passwords for async views (user.passwords).
+# Defaults to the number of CPUs.
+PASSWORD_HASHING_WORKERS = int(os.getenv("PASSWORD_HASHING_WORKERS", "0")) or None
+
+# Tokens revoked on logout (user.revocation). CAPACITY and ERROR_RATE size the
+# in-process Bloom filter; SYNC_INTERVAL, in seconds, bounds how long another
+# process may still accept a token revoked elsewhere. SYNC_OVERLAP, in seconds,
+# must exceed the time between a revocation row's creation and its commit.
+TOKEN_REVOCATION = {
+    "CAPACITY": int(os.getenv("TOKEN_REVOCATION_CAPACITY", "100000")),
+    "ERROR_RATE": float(os.getenv("TOKEN_REVOCATION_ERROR_RATE", "0.001")),
+    "SYNC_INTERVAL": int(os.getenv("TOKEN_REVOCATION_SYNC_INTERVAL", "5")),
+    "SYNC_OVERLAP": int(os.getenv("TOKEN_REVOCATION_SYNC_OVERLAP", "60")),
+}
+
+# Per-process cache of the user fields checked on every authenticated request
+# (user.authentication). TTL, in seconds, bounds staleness across processes.
+USER_AUTH_CACHE = {
+    "MAX_SIZE": int(os.getenv("USER_AUTH_CACHE_MAX_SIZE", "10000")),
+    "TTL": int(os.getenv("USER_AUTH_CACHE_TTL", "60")),
+}
+
+# Serialized user representations (ninja profile, DRF serializer), per user, in
+# the CACHES alias ALIAS (user.profile_cache). Entries are dropped when the user
+# changes; TIMEOUT, in seconds, only bounds how long unused ones are kept.
+USER_PROFILE_CACHE = {
+    "ALIAS": os.getenv("USER_PROFILE_CACHE_ALIAS", "default"),
+    "TIMEOUT": int(os.getenv("USER_PROFILE_CACHE_TIMEOUT", "3600")),
+}
+
 # Logging Configuration
+# logs/ is not versioned; create it so the file handler can open its log
+(BASE_DIR / "logs").mkdir(exist_ok=True)
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
@@ -0,0 +1,87 @@
+import time
+
+import pytest
+from django.db import transaction
+from django.http import HttpResponse
+from django.test import RequestFactory
+from user.models import User
+
+from core.routers import PIN_COOKIE, ReplicaPinningMiddleware, ReplicaRouter
+
+# Routing is decided outside the test transaction, as in production
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+@pytest.fixture(autouse=True)
+def replicas(settings):
+    settings.DATABASE_REPLICAS = ["replica"]
+    settings.DATABASE_REPLICA_LAG = 5
+
+
+def _request(view, cookies=None):
+    """Run ``view`` inside the middleware and return its routing and response."""
+    routed = []
+
+    def get_response(request):
+        view(routed)
+        return HttpResponse()
+
+    request = RequestFactory().get("/")
+    request.COOKIES.update(cookies or {})
+    response = ReplicaPinningMiddleware(get_response)(request)
+    return routed, response
+
+
+def _read(routed):
+    routed.append(ReplicaRouter().db_for_read(User))
+
+
+def test_reads_go_to_primary_after_a_write():
+    def view(routed):
+        _read(routed)
+        User.objects.create(username="ana")
+        _read(routed)
+
+    routed, response = _request(view)
+
+    assert routed == ["replica", "default"]
+    assert float(response.cookies[PIN_COOKIE].value) > time.time()
+
+
+def test_pin_cookie_keeps_following_reads_on_primary():
+    cookies = {PIN_COOKIE: str(time.time() + 5)}
+
+    routed, response = _request(_read, cookies)
+
+    assert routed == ["default"]
+    # Reads alone do not extend the window
+    assert PIN_COOKIE not in response.cookies
+
+
+def test_expired_pin_cookie_reads_from_replica():
+    routed, _ = _request(_read, {PIN_COOKIE: str(time.time() - 1)})
+
+    assert routed == ["replica"]
+
+
+def test_reads_in_transaction_stay_on_primary():
+    def view(routed):
+        with transaction.atomic():
+            _read(routed)
+
+    routed, _ = _request(view)
+
+    assert routed == ["default"]
+
+
+def test_without_replicas_everything_uses_primary(settings):
+    settings.DATABASE_REPLICAS = []
+
+    def view(routed):
+        _read(routed)
+        User.objects.create(username="ana")
+
+    routed, response = _request(view)
+
+    assert routed == ["default"]
+    assert PIN_COOKIE not in response.cookies
@@ -0,0 +1,146 @@
+import asyncio
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Sequence
+
+import httpx
+from notifications.mailgun_notifier import (
+    BaseMailgunNotifier,
+    MailgunEmailNotifierError,
+)
+from user.models import Contact
+
+# Status codes worth retrying: rate limiting and transient server errors.
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+class EmailMessage(NamedTuple):
+    """One email to deliver through ``AsyncMailgunEmailNotifier``."""
+
+    contact: Contact
+    subject: str
+    template_name: str
+    context: Dict[str, Any]
+
+
+class AsyncMailgunEmailNotifier(BaseMailgunNotifier):
+    """Asyncio Mailgun notifier delivering many emails concurrently.
+
+    At most ``max_concurrency`` requests are in flight at once, each bounded by
+    ``timeout`` seconds. Rate-limited (429) and 5xx responses, as well as
+    transport errors, are retried up to ``max_retries`` times with exponential
+    backoff (``backoff_base * 2 ** attempt`` seconds, or the server's
+    ``Retry-After`` when given), never waiting more than ``max_backoff``
+    seconds at once.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 20,
+        timeout: float = 10.0,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        max_backoff: float = 30.0,
+    ):
+        super().__init__()
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.max_backoff = max_backoff
+
+    def _backoff(self, attempt: int, response: httpx.Response | None) -> float:
+        retry_after = response.headers.get("Retry-After") if response else None
+        if retry_after and retry_after.isdigit():
+            delay = float(retry_after)
+        else:
+            delay = self.backoff_base * 2**attempt
+        return min(delay, self.max_backoff)
+
+    async def post(
+        self,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        payload: Dict[str, Any],
+    ) -> dict:
+        """POST ``payload`` to Mailgun, retrying transient failures."""
+        for attempt in range(self.max_retries + 1):
+            response = None
+            async with semaphore:
+                try:
+                    response = await client.post(self.messages_url, data=payload)
+                except httpx.TransportError as exc:
+                    if attempt == self.max_retries:
+                        raise MailgunEmailNotifierError(
+                            f"Mailgun API unreachable: {exc!r}",
+                        ) from exc
+            if response is not None:
+                if (
+                    response.status_code not in RETRYABLE_STATUS_CODES
+                    or attempt == self.max_retries
+                ):
+                    self.raise_for_status(response.status_code, response.text)
+                    return response.json()
+            await asyncio.sleep(self._backoff(attempt, response))
+        raise MailgunEmailNotifierError("Mailgun retries exhausted")
+
+    async def send_many(
+        self,
+        payloads: Sequence[Dict[str, Any]],
+    ) -> List[dict | BaseException]:
+        """Deliver prebuilt payloads concurrently over one pooled client.
+
+        Returns one entry per payload, in order: Mailgun's JSON response, or the
+        exception raised for that message. A failing message never cancels the
+        others.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with httpx.AsyncClient(
+            auth=("api", self.api_key),
+            timeout=httpx.Timeout(self.timeout),
+            limits=httpx.Limits(max_connections=self.max_concurrency),
+        ) as client:
+            return await asyncio.gather(
+                *(self.post(client, semaphore, payload) for payload in payloads),
+                return_exceptions=True,
+            )
+
+    def send_batch(
+        self,
+        contacts: Sequence[Contact],
+        subject: str,
+        template_name: str,
+        context: Dict[str, Any],
+        recipient_variables: Mapping[str, Mapping[str, Any]] | None = None,
+    ) -> List[dict]:
+        """Batch-send one email to many contacts from synchronous code.
+
+        Same arguments as ``MailgunEmailNotifier.send_batch``; the payloads of
+        ``build_batch_payloads`` are delivered concurrently, with the timeout
+        and retries above. Raises the first error once every request is done.
+        """
+        payloads = self.build_batch_payloads(
+            contacts,
+            subject,
+            template_name,
+            context,
+            recipient_variables,
+        )
+        results = asyncio.run(self.send_many(payloads))
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return results
+
+
+def send_emails_concurrently(
+    messages: Iterable[EmailMessage],
+    **options: Any,
+) -> List[dict | BaseException]:
+    """Render and deliver ``messages`` concurrently from synchronous code.
+
+    Entry point for django-q tasks. Templates (and any ORM access they need)
+    are rendered synchronously first, then every request runs in a single event
+    loop. From async code, build payloads and await ``send_many`` instead.
+    """
+    notifier = AsyncMailgunEmailNotifier(**options)
+    payloads = [notifier.build_payload(*message) for message in messages]
+    return asyncio.run(notifier.send_many(payloads))
@@ -0,0 +1,126 @@
+"""Notification channels keyed by ``Contact.ContactType``.
+
+Each channel delivers one notification to many contacts at once through
+``send_many``. The backend used for each contact type can be swapped with the
+``NOTIFICATION_CHANNELS`` setting, mapping a contact type to a dotted path:
+
+NOTIFICATION_CHANNELS = {"WHATSAPP": "myapp.channels.TwilioWhatsAppChannel"}
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, NamedTuple, Sequence
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+from notifications.async_mailgun_notifier import AsyncMailgunEmailNotifier
+from notifications.mailgun_notifier import MAILGUN_BATCH_LIMIT
+from notifications.rendering import template_cache
+from notifications.whatsapp_notifier import WHATSAPP_BATCH_LIMIT, WhatsAppNotifier
+from user.models import Contact
+
+DEFAULT_CHANNELS = {
+    Contact.ContactType.EMAIL: "notifications.channels.EmailChannel",
+    Contact.ContactType.WHATSAPP: "notifications.channels.WhatsAppChannel",
+    Contact.ContactType.PHONE: "notifications.channels.ConsoleChannel",
+}
+
+
+@dataclass(frozen=True)
+class Notification:
+    """Message sent to every recipient: subject and template prefix."""
+
+    subject: str
+    template_name: str
+
+
+class Recipient(NamedTuple):
+    """A contact plus the values personalizing its message."""
+
+    contact: Contact
+    variables: Dict[str, Any]
+
+
+class NotificationChannel:
+    """Base class for channel backends.
+
+    ``batch_size`` is how many recipients the provider takes per request, or
+    None without a limit. Callers sending chunks of at most ``batch_size``
+    know which recipients were delivered when a later request fails.
+    """
+
+    batch_size: int | None = None
+
+    def send_many(
+        self,
+        notification: Notification,
+        recipients: Sequence[Recipient],
+    ) -> int:
+        """Deliver ``notification`` to ``recipients``; return how many were sent."""
+        raise NotImplementedError
+
+    @staticmethod
+    def render_text(notification: Notification, recipient: Recipient) -> str:
+        """Render the plain-text template for a single recipient."""
+        return template_cache.render(
+            f"{notification.template_name}.txt",
+            recipient.variables,
+        )
+
+
+class EmailChannel(NotificationChannel):
+    """Email through Mailgun batch sending, personalized by recipient variables.
+
+    Requests go through ``AsyncMailgunEmailNotifier``, so a slow or rate-limited
+    API costs a bounded timeout and a few capped retries, not a blocked worker.
+    """
+
+    batch_size = MAILGUN_BATCH_LIMIT
+
+    def send_many(self, notification, recipients):
+        if not recipients:
+            return 0
+        placeholders = {
+            key: f"%recipient.{key}%"
+            for recipient in recipients
+            for key in recipient.variables
+        }
+        AsyncMailgunEmailNotifier().send_batch(
+            [recipient.contact for recipient in recipients],
+            notification.subject,
+            notification.template_name,
+            placeholders,
+            {r.contact.value: r.variables for r in recipients},
+        )
+        return len(recipients)
+
+
+class WhatsAppChannel(NotificationChannel):
+    """WhatsApp through the HTTP gateway batch endpoint."""
+
+    batch_size = WHATSAPP_BATCH_LIMIT
+
+    def send_many(self, notification, recipients):
+        if not recipients:
+            return 0
+        WhatsAppNotifier().send_many(
+            [(r.contact.value, self.render_text(notification, r)) for r in recipients],
+        )
+        return len(recipients)
+
+
+class ConsoleChannel(NotificationChannel):
+    """Prints messages; placeholder for channels without a provider yet."""
+
+    def send_many(self, notification, recipients):
+        for recipient in recipients:
+            contact = recipient.contact
+            print(f"[{contact.type}] {contact.value}: {notification.subject}")
+        return len(recipients)
+
+
+def get_channel(contact_type: str) -> NotificationChannel:
+    """Return the channel backend configured for ``contact_type``."""
+    channels = {**DEFAULT_CHANNELS, **getattr(settings, "NOTIFICATION_CHANNELS", {})}
+    if contact_type not in channels:
+        raise ValueError(f"No notification channel registered for {contact_type!r}")
+    return import_string(channels[contact_type])()
@@ -1,15 +1,39 @@
+import json
 import os
-from typing import Any, Dict
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, Sequence
 
 import requests
-from django.template.loader import render_to_string
+from notifications.rendering import render_to_string
+from requests.adapters import HTTPAdapter
 from user.models import Contact
 
+# Mailgun accepts at most 1000 recipients per batch message.
+MAILGUN_BATCH_LIMIT = 1000
 
-class MailgunEmailNotifier:
-    """Email notifier using Mailgun API.
+# Seconds before a Mailgun request is given up, so a slow API cannot hold a
+# worker for long
+REQUEST_TIMEOUT = 10
 
-    Loads credentials from environment and sends formatted emails via external API.
+
+@lru_cache(maxsize=1)
+def get_session() -> requests.Session:
+    """Return the process-wide HTTP session used by the notifiers.
+
+    Reusing one session keeps TCP/TLS connections alive between messages
+    instead of opening a new connection per request.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class BaseMailgunNotifier:
+    """Mailgun credentials and payload handling shared by the notifiers.
+
+    Loads credentials from environment; subclasses provide the HTTP transport.
     """
 
     def __init__(self):
@@ -24,26 +48,25 @@ class MailgunEmailNotifier:
         if not all([self.base_url, self.domain, self.api_key]):
             raise ValueError("Mailgun credentials missing in environment variables.")
 
-    def send(
+    @property
+    def messages_url(self) -> str:
+        """Mailgun API endpoint for sending messages."""
+        return f"{self.base_url}/{self.domain}/messages"
+
+    def build_payload(
         self,
         contact: Contact,
         subject: str,
         template_name: str,
         context: Dict[str, Any],
-    ) -> dict:
-        """Send an email using Mailgun.
-
-        - contact: Contact instance (must be EMAIL type)
-        - subject: email subject
-        - template_name: template prefix (without extension)
-        - context: context for template rendering
-        """
+    ) -> Dict[str, Any]:
+        """Render the templates and build the form payload for one contact."""
         # Render text and HTML templates
         text_body = render_to_string(f"{template_name}.txt", context)
         html_body = render_to_string(f"{template_name}.html", context)
 
         # Prepare payload according to Mailgun API
-        payload = {
+        return {
             "from": self.from_email,
             "to": [contact.value],
             "subject": subject,
@@ -51,26 +74,125 @@ class MailgunEmailNotifier:
             "html": html_body,
         }
 
-        # Mailgun API endpoint
-        url = f"{self.base_url}/{self.domain}/messages"
+    def build_batch_payloads(
+        self,
+        contacts: Sequence[Contact],
+        subject: str,
+        template_name: str,
+        context: Dict[str, Any],
+        recipient_variables: Mapping[str, Mapping[str, Any]] | None = None,
+    ) -> List[Dict[str, Any]]:
+        """Render the templates once and build one batch payload per chunk.
+
+        Contacts are split in chunks of ``MAILGUN_BATCH_LIMIT``. Every recipient
+        is listed in ``recipient-variables`` so Mailgun delivers an individual
+        message to each address instead of one message with all of them.
+        """
+        text_body = render_to_string(f"{template_name}.txt", context)
+        html_body = render_to_string(f"{template_name}.html", context)
+        recipient_variables = recipient_variables or {}
+
+        payloads = []
+        for start in range(0, len(contacts), MAILGUN_BATCH_LIMIT):
+            chunk = contacts[start : start + MAILGUN_BATCH_LIMIT]
+            addresses = [contact.value for contact in chunk]
+            payloads.append(
+                {
+                    "from": self.from_email,
+                    "to": addresses,
+                    "subject": subject,
+                    "text": text_body,
+                    "html": html_body,
+                    "recipient-variables": json.dumps(
+                        {
+                            address: dict(recipient_variables.get(address, {}))
+                            for address in addresses
+                        },
+                    ),
+                },
+            )
+        return payloads
+
+    @staticmethod
+    def raise_for_status(status_code: int, text: str) -> None:
+        """Raise ``MailgunEmailNotifierError`` for HTTP error responses."""
+        if status_code >= 400:
+            raise MailgunEmailNotifierError(
+                f"Mailgun API error: {status_code} - {text}",
+            )
+
+
+class MailgunEmailNotifier(BaseMailgunNotifier):
+    """Email notifier using Mailgun API.
+
+    Loads credentials from environment and sends formatted emails via external API.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.session = get_session()
 
+    def send(
+        self,
+        contact: Contact,
+        subject: str,
+        template_name: str,
+        context: Dict[str, Any],
+    ) -> dict:
+        """Send an email using Mailgun.
+
+        - contact: Contact instance (must be EMAIL type)
+        - subject: email subject
+        - template_name: template prefix (without extension)
+        - context: context for template rendering
+        """
+        payload = self.build_payload(contact, subject, template_name, context)
+        return self._post_message(payload)
+
+    def send_batch(
+        self,
+        contacts: Sequence[Contact],
+        subject: str,
+        template_name: str,
+        context: Dict[str, Any],
+        recipient_variables: Mapping[str, Mapping[str, Any]] | None = None,
+    ) -> List[dict]:
+        """Send one email to many contacts using Mailgun batch sending.
+
+        - contacts: Contact instances (must be EMAIL type)
+        - subject: email subject
+        - template_name: template prefix (without extension)
+        - context: context shared by every recipient
+        - recipient_variables: per-recipient values keyed by contact value,
+          referenced in templates as ``%recipient.<key>%``
+
+        One HTTP request is sent per payload of ``build_batch_payloads``.
+        """
+        payloads = self.build_batch_payloads(
+            contacts,
+            subject,
+            template_name,
+            context,
+            recipient_variables,
+        )
+        return [self._post_message(payload) for payload in payloads]
+
+    def _post_message(self, payload: Dict[str, Any]) -> dict:
+        """POST ``payload`` to the Mailgun messages endpoint."""
         # Ensure api_key is string (not None)
         if not self.api_key:
             raise ValueError("API_KEY_MAILGUN is required for MailgunEmailNotifier.")
 
         # Send authenticated POST request via HTTP Basic Auth
-        response = requests.post(
-            url,
+        response = self.session.post(
+            self.messages_url,
             auth=("api", self.api_key),
             data=payload,
-            timeout=100,
+            timeout=REQUEST_TIMEOUT,
         )
 
         # Handle HTTP errors
-        if response.status_code >= 400:
-            raise MailgunEmailNotifierError(
-                f"Mailgun API error: {response.status_code} - {response.text}",
-            )
+        self.raise_for_status(response.status_code, response.text)
         return response.json()
 
 
@@ -79,6 +201,7 @@ class MailgunEmailNotifier:
 # - The /messages endpoint expects fields as form-data
 # - Templates should be located in templates/emails/birthday.txt and .html
 # - The from address can be customized via DEFAULT_FROM_EMAIL env var
+# - Batch sending substitutes %recipient.<key>% placeholders from recipient-variables
 # - For static typing support, install requests-stubs: pip install requests-stubs
 
 #  =============================== EXCEPTIONS ===============================
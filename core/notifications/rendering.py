@@ -0,0 +1,62 @@
+"""Template rendering for notifiers.
+
+Each template is looked up and compiled once per process and then rendered from
+the shared compiled object, so bulk sends don't repeat loader lookups. The
+notification tasks log ``template_cache.stats()`` after each batch, so the
+worker logs show whether templates are reused.
+"""
+
+import threading
+from typing import Any, Dict, Mapping
+
+from django.template.loader import get_template
+
+
+class TemplateCache:
+    """Process-wide cache of compiled templates with hit/miss counters."""
+
+    def __init__(self):
+        self._templates: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, template_name: str):
+        """Return the compiled template for ``template_name``."""
+        template = self._templates.get(template_name)
+        with self._lock:
+            if template is not None:
+                self.hits += 1
+                return template
+            self.misses += 1
+        template = get_template(template_name)
+        self._templates[template_name] = template
+        return template
+
+    def render(self, template_name: str, context: Mapping[str, Any]) -> str:
+        """Render ``template_name`` with ``context``."""
+        return self.get(template_name).render(dict(context))
+
+    def stats(self) -> Dict[str, int]:
+        """Return the current counters and number of cached templates."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._templates),
+            }
+
+    def clear(self) -> None:
+        """Drop every cached template and reset the counters."""
+        with self._lock:
+            self._templates.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+template_cache = TemplateCache()
+
+
+def render_to_string(template_name: str, context: Mapping[str, Any]) -> str:
+    """Drop-in replacement for Django's ``render_to_string`` backed by the cache."""
+    return template_cache.render(template_name, context)
@@ -0,0 +1,127 @@
+import httpx
+import pytest
+from notifications import mailgun_notifier
+from notifications.async_mailgun_notifier import (
+    AsyncMailgunEmailNotifier,
+    EmailMessage,
+    send_emails_concurrently,
+)
+from notifications.mailgun_notifier import MailgunEmailNotifierError
+from notifications.testing import StubHTTPServer
+from user.models import Contact
+
+
+@pytest.fixture
+def mailgun_env(monkeypatch):
+    def configure(server):
+        monkeypatch.setenv("EMAIL_BASE_URL", server.url)
+        monkeypatch.setenv("SAND_BOX_DOMAIN", "sandbox123.mailgun.org")
+        monkeypatch.setenv("API_KEY_MAILGUN", "test-key")
+        monkeypatch.setenv("DEFAULT_FROM_EMAIL", "no-reply@sandbox123.mailgun.org")
+
+    monkeypatch.setattr(
+        mailgun_notifier,
+        "render_to_string",
+        lambda tpl, ctx: f"Hi {ctx['name']} ({tpl})",
+    )
+    return configure
+
+
+def _messages(django_user_model, count):
+    user = django_user_model.objects.create(username="async")
+    contacts = Contact.objects.bulk_create(
+        [
+            Contact(user=user, type=Contact.ContactType.EMAIL, value=f"u{i}@x.org")
+            for i in range(count)
+        ],
+    )
+    return [
+        EmailMessage(contact, "Subject", "emails/birthday", {"name": f"u{i}"})
+        for i, contact in enumerate(contacts)
+    ]
+
+
+def test_sends_concurrently_within_the_semaphore_bound(mailgun_env, django_user_model):
+    messages = _messages(django_user_model, 12)
+
+    with StubHTTPServer(delay=0.05) as server:
+        mailgun_env(server)
+        results = send_emails_concurrently(messages, max_concurrency=4)
+
+    assert len(server.requests) == 12
+    assert all(result == {"message": "Queued. Thank you."} for result in results)
+    assert 1 < server.max_in_flight <= 4
+    assert sorted(r.form()["to"][0] for r in server.requests) == sorted(
+        f"u{i}@x.org" for i in range(12)
+    )
+
+
+def test_retries_rate_limit_and_server_errors(mailgun_env, django_user_model):
+    messages = _messages(django_user_model, 1)
+
+    with StubHTTPServer(replies=[(429, {}), (503, {})]) as server:
+        mailgun_env(server)
+        results = send_emails_concurrently(messages, backoff_base=0)
+
+    assert results == [{"message": "Queued. Thank you."}]
+    assert len(server.requests) == 3
+
+
+def test_returns_errors_per_message(mailgun_env, django_user_model):
+    messages = _messages(django_user_model, 2)
+
+    with StubHTTPServer(replies=[(400, {"message": "bad"})]) as server:
+        server.default_reply = (200, {"id": "ok"})
+        mailgun_env(server)
+        results = send_emails_concurrently(
+            messages,
+            max_concurrency=1,
+            backoff_base=0,
+        )
+
+    assert isinstance(results[0], MailgunEmailNotifierError)
+    assert results[1] == {"id": "ok"}
+    assert len(server.requests) == 2
+
+
+def test_backoff_caps_retry_after(mailgun_env):
+    with StubHTTPServer() as server:
+        mailgun_env(server)
+        notifier = AsyncMailgunEmailNotifier(backoff_base=1, max_backoff=5)
+
+    rate_limited = httpx.Response(429, headers={"Retry-After": "3600"})
+    assert notifier._backoff(0, rate_limited) == 5
+    assert notifier._backoff(1, httpx.Response(429, headers={"Retry-After": "2"})) == 2
+    assert notifier._backoff(10, None) == 5
+
+
+def test_send_batch_delivers_batch_payloads(mailgun_env, django_user_model):
+    contacts = [message.contact for message in _messages(django_user_model, 2)]
+
+    with StubHTTPServer(replies=[(503, {})]) as server:
+        mailgun_env(server)
+        results = AsyncMailgunEmailNotifier(backoff_base=0).send_batch(
+            contacts,
+            "Subject",
+            "emails/birthday",
+            {"name": "%recipient.name%"},
+            {"u0@x.org": {"name": "Ana"}},
+        )
+
+    assert results == [{"message": "Queued. Thank you."}]
+    assert len(server.requests) == 2
+    assert server.requests[-1].form()["to"] == ["u0@x.org", "u1@x.org"]
+
+
+def test_send_batch_raises_when_a_request_fails(mailgun_env, django_user_model):
+    contacts = [message.contact for message in _messages(django_user_model, 1)]
+
+    with StubHTTPServer(replies=[(400, {"message": "bad"})]) as server:
+        mailgun_env(server)
+        with pytest.raises(MailgunEmailNotifierError):
+            AsyncMailgunEmailNotifier().send_batch(
+                contacts,
+                "Subject",
+                "emails/birthday",
+                {"name": "x"},
+            )
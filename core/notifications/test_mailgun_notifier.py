@@ -1,8 +1,12 @@
+import json
 import urllib.parse
 
 import pytest
 import responses
+from django.template.loader import render_to_string
+from notifications import mailgun_notifier
 from notifications.mailgun_notifier import MailgunEmailNotifier
+from notifications.testing import StubHTTPServer
 from user.models import Contact
 
 
@@ -65,4 +69,78 @@ def test_mailgun_send_success(mailgun_env, django_user_model):  # noqa: ARG001
     responses.reset()
 
 
+@pytest.fixture
+def mailgun_stub(monkeypatch):
+    with StubHTTPServer() as server:
+        monkeypatch.setenv("EMAIL_BASE_URL", server.url)
+        monkeypatch.setenv("SAND_BOX_DOMAIN", "sandbox123.mailgun.org")
+        monkeypatch.setenv("API_KEY_MAILGUN", "test-key")
+        monkeypatch.setenv("DEFAULT_FROM_EMAIL", "no-reply@sandbox123.mailgun.org")
+        monkeypatch.setattr(
+            mailgun_notifier,
+            "render_to_string",
+            lambda tpl, ctx: f"Hi {ctx['name']} ({tpl})",
+        )
+        yield server
+
+
+def _email_contacts(django_user_model, count):
+    user = django_user_model.objects.create(username="batch")
+    return Contact.objects.bulk_create(
+        [
+            Contact(user=user, type=Contact.ContactType.EMAIL, value=f"u{i}@x.org")
+            for i in range(count)
+        ],
+    )
+
+
+@pytest.mark.django_db
+def test_mailgun_send_batch_chunks_and_reuses_connection(
+    mailgun_stub,
+    django_user_model,
+    monkeypatch,
+):
+    monkeypatch.setattr(mailgun_notifier, "MAILGUN_BATCH_LIMIT", 2)
+    contacts = _email_contacts(django_user_model, 5)
+
+    results = MailgunEmailNotifier().send_batch(
+        contacts,
+        "Subject",
+        "emails/birthday",
+        {"name": "%recipient.name%"},
+        {"u0@x.org": {"name": "Ana"}},
+    )
+
+    assert len(results) == 3
+    requests_ = mailgun_stub.requests
+    assert [r.path for r in requests_] == ["/sandbox123.mailgun.org/messages"] * 3
+    forms = [r.form() for r in requests_]
+    assert [form["to"] for form in forms] == [
+        ["u0@x.org", "u1@x.org"],
+        ["u2@x.org", "u3@x.org"],
+        ["u4@x.org"],
+    ]
+    assert forms[0]["text"] == ["Hi %recipient.name% (emails/birthday.txt)"]
+    variables = json.loads(forms[0]["recipient-variables"][0])
+    assert variables == {"u0@x.org": {"name": "Ana"}, "u1@x.org": {}}
+    # One pooled keep-alive connection serves every chunk
+    assert len({r.client_port for r in requests_}) == 1
+
+
+def test_birthday_templates_render_recipient_placeholders():
+    context = {
+        "name": "%recipient.name%",
+        "name_html": "%recipient.name_html%",
+        "member_since": "%recipient.member_since%",
+    }
+
+    text = render_to_string("emails/birthday.txt", context)
+    html = render_to_string("emails/birthday.html", context)
+
+    assert "Olá %recipient.name%," in text
+    assert "há %recipient.member_since%!" in text
+    # Mailgun does not escape substituted values; the HTML uses the escaped one
+    assert "Feliz Aniversário, %recipient.name_html%!" in html
+
+
 # Para rodar: pytest notifications/test_mailgun_notifier.py
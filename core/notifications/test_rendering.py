@@ -0,0 +1,27 @@
+from notifications.rendering import TemplateCache
+
+
+def test_template_cache_compiles_each_template_once(monkeypatch):
+    from notifications import rendering
+
+    loaded = []
+    real_get_template = rendering.get_template
+    monkeypatch.setattr(
+        rendering,
+        "get_template",
+        lambda name: loaded.append(name) or real_get_template(name),
+    )
+    cache = TemplateCache()
+    context = {"name": "Ana", "member_since": "3 anos"}
+
+    for _ in range(3):
+        text = cache.render("emails/birthday.txt", context)
+        html = cache.render("emails/birthday.html", context)
+
+    assert "Olá Ana," in text
+    assert "Feliz Aniversário, Ana!" in html
+    assert loaded == ["emails/birthday.txt", "emails/birthday.html"]
+    assert cache.stats() == {"hits": 4, "misses": 2, "size": 2}
+
+    cache.clear()
+    assert cache.stats() == {"hits": 0, "misses": 0, "size": 0}
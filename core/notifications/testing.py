@@ -0,0 +1,120 @@
+"""Local HTTP stand-ins for notification providers.
+
+Used by the tests to exercise the real HTTP clients (sessions, pooling,
+retries) without reaching external services.
+"""
+
+import json
+import threading
+import time
+import urllib.parse
+from collections import deque
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Deque, Dict, List, Tuple
+
+
+@dataclass
+class RecordedRequest:
+    """A request received by ``StubHTTPServer``."""
+
+    method: str
+    path: str
+    headers: Dict[str, str]
+    body: bytes
+    client_port: int
+
+    def form(self) -> Dict[str, List[str]]:
+        """Decode a form-encoded body."""
+        return urllib.parse.parse_qs(self.body.decode())
+
+    def json(self) -> Any:
+        """Decode a JSON body."""
+        return json.loads(self.body)
+
+
+@dataclass
+class StubHTTPServer:
+    """Threaded HTTP/1.1 server that records requests and replays canned replies.
+
+    Replies queued in ``replies`` as ``(status, payload)`` are consumed in order;
+    once exhausted every request gets ``default_reply``. ``delay`` holds every
+    reply for that many seconds, and ``max_in_flight`` records the highest
+    number of requests served concurrently.
+
+    Usage:
+    with StubHTTPServer() as server:
+        requests.post(f"{server.url}/messages", data={...})
+        assert server.requests[0].form()["to"] == [...]
+    """
+
+    replies: Deque[Tuple[int, Any]] = field(default_factory=deque)
+    default_reply: Tuple[int, Any] = (200, {"message": "Queued. Thank you."})
+    delay: float = 0.0
+    requests: List[RecordedRequest] = field(default_factory=list)
+    max_in_flight: int = 0
+
+    def __post_init__(self):
+        self.replies = deque(self.replies)
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._server: ThreadingHTTPServer | None = None
+
+    @property
+    def url(self) -> str:
+        assert self._server is not None, "StubHTTPServer is not running"
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _next_reply(self) -> Tuple[int, Any]:
+        with self._lock:
+            return self.replies.popleft() if self.replies else self.default_reply
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _handle(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                with stub._lock:
+                    stub.requests.append(
+                        RecordedRequest(
+                            method=self.command,
+                            path=self.path,
+                            headers=dict(self.headers),
+                            body=self.rfile.read(length),
+                            client_port=self.client_address[1],
+                        ),
+                    )
+                    stub._in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub._in_flight)
+                time.sleep(stub.delay)
+                with stub._lock:
+                    stub._in_flight -= 1
+                status, payload = stub._next_reply()
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = do_POST = _handle
+
+            def log_message(self, format, *args):  # noqa: A002
+                pass
+
+        return Handler
+
+    def __enter__(self) -> "StubHTTPServer":
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        assert self._server is not None
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,53 @@
+import os
+from typing import List, Sequence, Tuple
+
+from notifications.mailgun_notifier import REQUEST_TIMEOUT, get_session
+
+# Messages sent per request to the WhatsApp gateway batch endpoint.
+WHATSAPP_BATCH_LIMIT = 100
+
+
+class WhatsAppNotifier:
+    """WhatsApp notifier using an HTTP gateway with a batch endpoint.
+
+    Loads the gateway URL and token from environment and posts messages in
+    batches of ``WHATSAPP_BATCH_LIMIT`` as JSON:
+    ``{"messages": [{"to": "<number>", "text": "<body>"}, ...]}``.
+    """
+
+    def __init__(self):
+        # Load environment variables
+        self.base_url: str = os.environ.get("WHATSAPP_API_URL", "")
+        self.api_token: str = os.environ.get("WHATSAPP_API_TOKEN", "")
+        if not all([self.base_url, self.api_token]):
+            raise ValueError("WhatsApp credentials missing in environment variables.")
+        self.session = get_session()
+
+    def send_many(self, messages: Sequence[Tuple[str, str]]) -> List[dict]:
+        """Send ``(number, text)`` messages, one HTTP request per batch."""
+        responses = []
+        for start in range(0, len(messages), WHATSAPP_BATCH_LIMIT):
+            chunk = messages[start : start + WHATSAPP_BATCH_LIMIT]
+            response = self.session.post(
+                f"{self.base_url}/messages/batch",
+                headers={"Authorization": f"Bearer {self.api_token}"},
+                json={"messages": [{"to": to, "text": text} for to, text in chunk]},
+                timeout=REQUEST_TIMEOUT,
+            )
+            if response.status_code >= 400:
+                raise WhatsAppNotifierError(
+                    f"WhatsApp API error: {response.status_code} - {response.text}",
+                )
+            responses.append(response.json())
+        return responses
+
+
+#  =============================== EXCEPTIONS ===============================
+
+
+class WhatsAppNotifierError(Exception):
+    """Exception raised when there is an error sending a WhatsApp message."""
+
+    def __init__(self, message: str):
+        self.message = message
+        super().__init__(self.message)
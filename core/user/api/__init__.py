@@ -1,17 +1,40 @@
-from .api import UserAuthController, UserCRUDController, user_router
+from .api import TokenController, UserAuthController, UserCRUDController, user_router
 from .schemas import (
+    BulkResultSchema,
+    BulkSummarySchema,
     ContactSchema,
+    ImportRowErrorSchema,
+    LogoutSchema,
+    ProfileCacheStatsSchema,
+    RevocableTokenRefreshInputSchema,
+    UserBulkUpdateSchema,
+    UserIdsSchema,
+    UserImportReportSchema,
     UserLoginSchema,
+    UserPageSchema,
+    UserPatchSchema,
     UserRetrieveSchema,
     UserSchema,
     UserUpdateSchema,
 )
 
 __all__ = [
+    "BulkResultSchema",
+    "BulkSummarySchema",
     "ContactSchema",
+    "ImportRowErrorSchema",
+    "LogoutSchema",
+    "ProfileCacheStatsSchema",
+    "RevocableTokenRefreshInputSchema",
+    "TokenController",
     "UserAuthController",
+    "UserBulkUpdateSchema",
     "UserCRUDController",
+    "UserIdsSchema",
+    "UserImportReportSchema",
     "UserLoginSchema",
+    "UserPageSchema",
+    "UserPatchSchema",
     "UserRetrieveSchema",
     "UserSchema",
     "UserUpdateSchema",
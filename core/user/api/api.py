@@ -1,90 +1,349 @@
-from typing import List
+import io
+import json
+from typing import Iterator, Literal
 
-from django.contrib.auth.hashers import make_password
-from ninja import Router
+from django.http import HttpRequest, HttpResponse, StreamingHttpResponse
+from django.utils.translation import gettext_lazy as _
+from ninja import File, Query, Router, UploadedFile
+from ninja.errors import HttpError
+from ninja.responses import NinjaJSONEncoder
 from ninja_extra import (
     ControllerBase,
     api_controller,
     http_delete,
     http_get,
+    http_patch,
     http_post,
     http_put,
     status,
 )
-from ninja_extra.permissions import IsAuthenticated
-from ninja_jwt.authentication import JWTAuth
+from ninja_extra.permissions import AllowAny
+from ninja_extra.shortcuts import aget_object_or_exception
+from ninja_jwt.controller import TokenObtainPairController, TokenVerificationController
+from ninja_jwt.exceptions import AuthenticationFailed, TokenError
+from ninja_jwt.schema import TokenObtainPairOutputSchema
+from ninja_jwt.settings import api_settings
+from ninja_jwt.tokens import RefreshToken
 
+from core.routers import pin_to_primary
+from user.authentication import AsyncCachedJWTAuth, CachedJWTAuth, user_cache
+from user.bulk import (
+    bulk_deactivate_users,
+    bulk_delete_users,
+    bulk_update_users,
+    summarize,
+)
+from user.conditional import (
+    aget_user_version,
+    not_modified,
+    set_version_headers,
+)
+from user.exporter import CONTENT_TYPES, ExportError, export_users
+from user.importer import detect_format, import_users
 from user.models import User
-from user.permissions import IsActiveUser, IsAdmin
+from user.passwords import aauthenticate, acheck_password, aset_password
+from user.permissions import IsActiveUser, IsAdmin, IsAuthenticated
+from user.profile_cache import profile_cache
+from user.querysets import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    akeyset_paginate,
+    iterate_in_chunks,
+    users_with_contacts,
+)
+from user.revocation import revocation_list
 
-from .schemas import UserRetrieveSchema, UserSchema, UserUpdateSchema
+from .schemas import (
+    AuthCacheStatsSchema,
+    BulkSummarySchema,
+    LogoutSchema,
+    ProfileCacheStatsSchema,
+    UserBulkUpdateSchema,
+    UserIdsSchema,
+    UserImportReportSchema,
+    UserLoginSchema,
+    UserPageSchema,
+    UserRetrieveSchema,
+    UserSchema,
+    UserUpdateSchema,
+)
 
 user_router = Router()
 
+# Related rows rendered by ``UserRetrieveSchema``
+RETRIEVE_RELATIONS = ("contacts",)
+
+
+def _users_as_ndjson(chunk_size: int) -> Iterator[str]:
+    """Serialize every user as one ``UserSchema`` JSON document per line."""
+    for user in iterate_in_chunks(users_with_contacts(), chunk_size=chunk_size):
+        yield UserSchema.from_orm(user).model_dump_json() + "\n"
+
+
+async def _retrieve_response(request: HttpRequest, user_id: int) -> HttpResponse:
+    """Render ``UserRetrieveSchema`` for ``user_id`` as a conditional response.
+
+    Costs one aggregate query when the client's copy is current (304) or the
+    profile of this version is in ``profile_cache``; the user is loaded
+    otherwise.
+    """
+    version = await aget_user_version(user_id, RETRIEVE_RELATIONS)
+    if version is None:
+        await aget_object_or_exception(User, id=user_id)  # raises NotFound
+    response = not_modified(request, version)
+    if response is None:
+        content = await profile_cache.aget(user_id, version.etag)
+        if content is None:
+            user = await users_with_contacts().aget(pk=user_id)
+            content = json.dumps(
+                UserRetrieveSchema.from_orm(user).model_dump(),
+                cls=NinjaJSONEncoder,
+            )
+            await profile_cache.aset(user_id, version.etag, content)
+        response = HttpResponse(content, content_type="application/json")
+    return set_version_headers(response, version)
+
 
 @api_controller(
     "/users",
-    auth=JWTAuth(),
+    auth=CachedJWTAuth(),
     permissions=[IsAuthenticated, IsActiveUser],
     tags=["Users"],
 )
 class UserCRUDController(ControllerBase):
     """Controller for CRUD operations on users.
 
-    All routes require JWT authentication and active user.
+    All routes require JWT authentication and active user. The single-user and
+    list routes are async, with ``AsyncCachedJWTAuth``, so an ASGI server runs
+    them on its event loop; the bulk, import and export routes stay sync.
     """
 
-    @http_get("/me", response=UserRetrieveSchema, summary="Get current user profile")
-    def get_me(self, request):
-        """Returns the authenticated user's profile."""
-        user = request.user
-        user.name = user.get_display_name() or user.username
-        return user
+    @http_get(
+        "/me",
+        response=UserRetrieveSchema,
+        summary="Get current user profile",
+        auth=AsyncCachedJWTAuth(),
+    )
+    async def get_me(self, request):
+        """Returns the authenticated user's profile.
+
+        Supports conditional requests (``If-None-Match``/``If-Modified-Since``).
+        """
+        return await _retrieve_response(request, request.user.pk)
 
     @http_get(
         "/",
-        response=List[UserSchema],
-        summary="List all users",
+        response=UserPageSchema,
+        summary="List users (cursor paginated)",
+        auth=AsyncCachedJWTAuth(),
+        permissions=[IsAdmin],
+    )
+    async def list_users(
+        self,
+        request,
+        cursor: int | None = None,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    ):
+        """List users after ``cursor`` (only for admins).
+
+        Pass the returned ``next_cursor`` to fetch the following page; it is
+        ``null`` on the last page.
+        """
+        users, next_cursor = await akeyset_paginate(
+            users_with_contacts(),
+            cursor=cursor,
+            limit=limit,
+        )
+        return {"items": users, "next_cursor": next_cursor}
+
+    @http_get(
+        "/stream",
+        summary="Stream all users as NDJSON",
         permissions=[IsAdmin],
     )
-    def list_users(self, request):
-        """List all users (only for admins)."""
-        return User.objects.all()
+    def stream_users(
+        self,
+        request,
+        chunk_size: int = Query(DEFAULT_CHUNK_SIZE, ge=1, le=10000),
+    ):
+        """Stream every user as newline-delimited JSON (only for admins).
+
+        Users are read ``chunk_size`` at a time, so memory stays flat regardless
+        of the table size.
+        """
+        return StreamingHttpResponse(
+            _users_as_ndjson(chunk_size),
+            content_type="application/x-ndjson",
+        )
+
+    @http_get(
+        "/export",
+        summary="Export users with contacts and addresses",
+        permissions=[IsAdmin],
+    )
+    def export(
+        self,
+        request,
+        format: Literal["csv", "jsonl", "parquet"] = "csv",
+        chunk_size: int = Query(DEFAULT_CHUNK_SIZE, ge=1, le=10000),
+    ):
+        """Streams every user as a CSV, JSONL or Parquet file (only for admins).
+
+        Users are read ``chunk_size`` at a time in primary key order. The CSV
+        columns are the ones accepted by ``/users/import``.
+        """
+        try:
+            content = export_users(format, chunk_size=chunk_size)
+        except ExportError as e:
+            raise HttpError(status.HTTP_400_BAD_REQUEST, str(e)) from e
+        response = StreamingHttpResponse(content, content_type=CONTENT_TYPES[format])
+        response["Content-Disposition"] = f'attachment; filename="users.{format}"'
+        return response
+
+    @http_post(
+        "/import",
+        response=UserImportReportSchema,
+        summary="Bulk import users from CSV or JSONL",
+        permissions=[IsAdmin],
+    )
+    def bulk_import(
+        self,
+        request,
+        file: UploadedFile = File(...),
+        format: Literal["csv", "jsonl"] | None = None,
+    ):
+        """Imports users with contacts and addresses from a file (only for admins).
+
+        The file is read row by row and written in chunks; invalid or duplicate
+        rows are skipped and listed in the report. See ``user.importer`` for the
+        accepted columns. Prefer the ``import_users`` command for very large files.
+        A file that is not UTF-8 is rejected with a 400 where decoding fails;
+        the chunks written before that point are kept.
+        """
+        stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+        try:
+            return import_users(stream, format or detect_format(file.name))
+        except UnicodeDecodeError as e:
+            raise HttpError(
+                status.HTTP_400_BAD_REQUEST,
+                f"The file must be UTF-8 encoded: {e}",
+            ) from e
+        finally:
+            stream.detach()
+
+    @http_patch(
+        "/bulk",
+        response=BulkSummarySchema,
+        summary="Update many users",
+        permissions=[IsAdmin],
+    )
+    def bulk_update(self, request, payload: UserBulkUpdateSchema):
+        """Applies a list of per-user patches in one request (only for admins).
+
+        Only the fields sent for each user are compared, and only the ones that
+        change are written, with a single ``bulk_update``.
+        """
+        patches = [item.dict(exclude_unset=True) for item in payload.items]
+        return summarize(bulk_update_users(patches))
+
+    @http_post(
+        "/bulk/deactivate",
+        response=BulkSummarySchema,
+        summary="Deactivate many users",
+        permissions=[IsAdmin],
+    )
+    def bulk_deactivate(self, request, payload: UserIdsSchema):
+        """Deactivates the given users with a single update (only for admins)."""
+        return summarize(bulk_deactivate_users(payload.ids))
+
+    @http_post(
+        "/bulk/delete",
+        response=BulkSummarySchema,
+        summary="Delete many users",
+        permissions=[IsAdmin],
+    )
+    def bulk_delete(self, request, payload: UserIdsSchema):
+        """Deletes the given users and their contacts/addresses (only for admins)."""
+        return summarize(bulk_delete_users(payload.ids))
+
+    @http_get(
+        "/cache/stats",
+        response=ProfileCacheStatsSchema,
+        summary="Profile cache statistics",
+        permissions=[IsAdmin],
+    )
+    def profile_cache_stats(self, request):
+        """Returns hits, misses and evictions of the profile cache (only for admins).
+
+        Hits and misses are counted by the serving process; evictions by the
+        cache backend.
+        """
+        return profile_cache.stats()
+
+    @http_get(
+        "/auth-cache/stats",
+        response=AuthCacheStatsSchema,
+        summary="Authentication cache statistics",
+        permissions=[IsAdmin],
+    )
+    def auth_cache_stats(self, request):
+        """Returns hits, misses and size of the user auth cache (only for admins).
+
+        The cache is per process, so the counters are the serving process' own.
+        """
+        return user_cache.stats()
 
     @http_get(
         "/{user_id}",
         response=UserRetrieveSchema,
         summary="Get user by ID",
+        auth=AsyncCachedJWTAuth(),
         permissions=[IsAdmin],
     )
-    def get_user(self, request, user_id: int):
-        """Returns a specific user by ID (own profile or admin)."""
-        user = self.get_object_or_exception(User, id=user_id)
-        user.name = user.get_display_name()
-        return user
+    async def get_user(self, request, user_id: int):
+        """Returns a specific user by ID (own profile or admin).
+
+        Supports conditional requests (``If-None-Match``/``If-Modified-Since``).
+        """
+        return await _retrieve_response(request, user_id)
 
     @http_put(
         "/{user_id}",
         response=UserRetrieveSchema,
         summary="Update user",
+        auth=AsyncCachedJWTAuth(),
         permissions=[IsAdmin],
     )
-    def update_user(self, request, user_id: int, payload: UserUpdateSchema):
-        """Updates user data (own profile or admin)."""
-        user = self.get_object_or_exception(User, id=user_id)
+    async def update_user(self, request, user_id: int, payload: UserUpdateSchema):
+        """Updates user data (own profile or admin).
 
-        for attr, value in payload.dict(exclude_unset=True).items():
-            setattr(user, attr, value)
-        user.save()
+        Only the sent fields that changed are written. When ``updated_at`` is
+        sent and the user was modified since, nothing is written and 409 is
+        returned.
+        """
+        pin_to_primary()
+        user = await self.aget_object_or_exception(users_with_contacts(), id=user_id)
 
-        user.name = user.get_display_name()
+        changes = payload.dict(exclude_unset=True)
+        expected_updated_at = changes.pop("updated_at", None)
+        if not await user.asave_changes(changes, expected_updated_at):
+            return self.create_response(
+                {"error": "User was modified by another request"},
+                status_code=status.HTTP_409_CONFLICT,
+            )
         return user
 
-    @http_delete("/{user_id}", summary="Delete user", permissions=[IsAdmin])
-    def delete_user(self, request, user_id: int):
+    @http_delete(
+        "/{user_id}",
+        summary="Delete user",
+        auth=AsyncCachedJWTAuth(),
+        permissions=[IsAdmin],
+    )
+    async def delete_user(self, request, user_id: int):
         """Deletes a user (only admins)."""
-        user = self.get_object_or_exception(User, id=user_id)
-        user.delete()
+        user = await self.aget_object_or_exception(User, id=user_id)
+        await user.adelete()
         return self.create_response(
             {"message": "User deleted successfully"},
             status_code=status.HTTP_204_NO_CONTENT,
@@ -95,45 +354,98 @@ class UserCRUDController(ControllerBase):
 class UserAuthController(ControllerBase):
     """Controller for custom authentication operations.
 
-    Complements the NinjaJWTDefaultController.
+    Complements the TokenController. Every route is async.
     """
 
     @http_post(
         "/change-password",
-        auth=JWTAuth(),
+        auth=AsyncCachedJWTAuth(),
         permissions=[IsAuthenticated, IsActiveUser],
     )
-    def change_password(self, request, old_password: str, new_password: str):
+    async def change_password(self, request, old_password: str, new_password: str):
         """Changes the authenticated user's password."""
-        user = request.user
+        user = await request.user.aget_user()
 
-        if not user.check_password(old_password):
+        if not await acheck_password(user, old_password):
             return self.create_response(
                 {"error": "Invalid old password"},
                 status_code=status.HTTP_400_BAD_REQUEST,
             )
 
-        user.set_password(make_password(new_password))
-        user.save()
+        await aset_password(user, new_password)
 
         return {"message": "Password changed successfully"}
 
-    @http_post("/logout", auth=JWTAuth(), permissions=[IsAuthenticated])
-    def logout(self, request):
-        """Logout of the user (in the frontend, the token should be removed).
+    @http_post("/logout", auth=AsyncCachedJWTAuth(), permissions=[IsAuthenticated])
+    async def logout(self, request, payload: LogoutSchema = None):
+        """Revokes the access token used for the request.
 
-        In the future, a token blacklist can be implemented.
+        The refresh token, when sent in the body, is revoked as well so it can
+        no longer be used to obtain new access tokens.
         """
+        if payload is not None and payload.refresh:
+            try:
+                refresh = RefreshToken(payload.refresh)
+            except TokenError:
+                refresh = None
+            if (
+                refresh is None
+                or refresh.get(api_settings.USER_ID_CLAIM) != request.user.pk
+            ):
+                return self.create_response(
+                    {"error": "Invalid refresh token"},
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                )
+            await revocation_list.arevoke(refresh)
+
+        await revocation_list.arevoke(request.jwt_token)
         return {"message": "Logged out successfully"}
 
     @http_get(
         "/profile",
-        auth=JWTAuth(),
+        auth=AsyncCachedJWTAuth(),
         permissions=[IsAuthenticated, IsActiveUser],
         response=UserRetrieveSchema,
     )
-    def get_profile(self, request):
+    async def get_profile(self, request):
         """Alias for /user/me - maintains compatibility."""
-        user = request.user
-        user.name = user.get_display_name()
-        return user
+        return await _retrieve_response(request, request.user.pk)
+
+
+@api_controller("/token", permissions=[AllowAny], tags=["token"], auth=None)
+class TokenController(
+    ControllerBase,
+    TokenVerificationController,
+    TokenObtainPairController,
+):
+    """Replaces the NinjaJWTDefaultController.
+
+    Obtaining a pair is async and checks the password in the password hashing
+    pool, so logins do not hold a worker while PBKDF2 runs.
+    """
+
+    auto_import = False
+
+    @http_post(
+        "/pair",
+        response=TokenObtainPairOutputSchema,
+        url_name="token_obtain_pair",
+        operation_id="token_obtain_pair",
+    )
+    async def obtain_token(self, credentials: UserLoginSchema):
+        """Returns an access/refresh token pair for valid credentials."""
+        user = await aauthenticate(
+            credentials.username,
+            credentials.password,
+            request=self.context.request,
+        )
+        if user is None:
+            raise AuthenticationFailed(
+                _("No active account found with the given credentials"),
+            )
+        refresh = RefreshToken.for_user(user)
+        return {
+            "username": user.username,
+            "refresh": str(refresh),
+            "access": str(refresh.access_token),
+        }
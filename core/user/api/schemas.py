@@ -1,9 +1,15 @@
-from datetime import datetime
-from typing import List
+from datetime import date, datetime
+from typing import Dict, List, Literal
 
 from ninja import ModelSchema, Schema
+from ninja_jwt.exceptions import InvalidToken, TokenError
+from ninja_jwt.schema import TokenRefreshInputSchema
+from ninja_jwt.tokens import RefreshToken
+from pydantic import Field, model_validator
 
+from user.bulk import MAX_BULK_SIZE
 from user.models import Contact, User
+from user.revocation import revocation_list
 
 
 class UserSchema(ModelSchema):
@@ -15,26 +21,115 @@ class UserSchema(ModelSchema):
 
 
 class UserUpdateSchema(ModelSchema):
+    # ``updated_at`` of the version being edited; the update fails with 409
+    # if the user changed since.
+    updated_at: datetime | None = None
+
     class Meta:
         model = User
         fields = ("first_name", "email")
 
 
+class UserPatchSchema(Schema):
+    """One user's changes in a bulk update; omitted fields are left untouched."""
+
+    id: int
+    first_name: str = None
+    last_name: str = None
+    email: str = None
+    gender: Literal["M", "F", "O"] | None = None
+    date_birth: date | None = None
+    is_active: bool = None
+
+
+class UserBulkUpdateSchema(Schema):
+    items: List[UserPatchSchema] = Field(..., min_length=1, max_length=MAX_BULK_SIZE)
+
+
+class UserIdsSchema(Schema):
+    ids: List[int] = Field(..., min_length=1, max_length=MAX_BULK_SIZE)
+
+
+class BulkResultSchema(Schema):
+    id: int
+    status: str
+
+
+class BulkSummarySchema(Schema):
+    results: List[BulkResultSchema]
+    counts: Dict[str, int]
+
+
 class ContactSchema(ModelSchema):
     class Meta:
         model = Contact
         fields = ("id", "value", "type")
 
 
+class UserPageSchema(Schema):
+    items: List[UserSchema]
+    next_cursor: int | None
+
+
+class ImportRowErrorSchema(Schema):
+    line: int
+    message: str
+
+
+class UserImportReportSchema(Schema):
+    total: int
+    created: int
+    error_count: int
+    errors: List[ImportRowErrorSchema]
+    elapsed: float
+    rows_per_second: float
+
+
+class ProfileCacheStatsSchema(Schema):
+    backend: str
+    hits: int
+    misses: int
+    evictions: int | None
+    hit_rate: float
+
+
+class AuthCacheStatsSchema(Schema):
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    size: int
+    hit_rate: float
+
+
 class UserLoginSchema(Schema):
     username: str
     password: str
 
 
+class LogoutSchema(Schema):
+    refresh: str | None = None
+
+
+class RevocableTokenRefreshInputSchema(TokenRefreshInputSchema):
+    """Token refresh input that rejects refresh tokens revoked on logout."""
+
+    @model_validator(mode="after")
+    def check_not_revoked(self):
+        try:
+            jti = RefreshToken(self.refresh).get("jti")
+        except TokenError:
+            # Invalid tokens are reported by the response schema
+            return self
+        if revocation_list.is_revoked(jti):
+            raise InvalidToken("Token has been revoked")
+        return self
+
+
 class UserRetrieveSchema(Schema):
     id: int
     username: str
-    cpf: str
+    cpf: str | None
     name: str
     email: str
     date_birth: datetime | None
@@ -43,3 +138,8 @@ class UserRetrieveSchema(Schema):
     created_at: datetime
     updated_at: datetime
     contacts: List[ContactSchema]
+
+    @staticmethod
+    def resolve_name(obj) -> str:
+        """Display name, computed once per serialized user."""
+        return obj.get_display_name() or obj.username
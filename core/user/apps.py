@@ -7,3 +7,7 @@ class UserConfig(AppConfig):
 
     default_auto_field = "django.db.models.BigAutoField"
     name = "user"
+
+    def ready(self):
+        """Connect the signal receivers."""
+        from user import signals  # noqa: F401
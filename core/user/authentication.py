@@ -0,0 +1,252 @@
+"""JWT authentication backed by a cached user snapshot.
+
+The stock ninja_jwt/simplejwt authenticators load the full ``User`` row on every
+request. Here the fields needed by the permission classes (id, flags and group
+names) are kept in a per-process LRU/TTL cache. ``request.user`` is a
+``CachedUser`` that answers those fields from the snapshot and loads the full
+``User`` only when something else is accessed (e.g. serializing a profile or
+changing a password).
+
+Entries are invalidated on ``User`` save/delete and group membership changes
+(see ``user.signals``). Other processes only see changes once their entry
+expires, so ``USER_AUTH_CACHE["TTL"]`` bounds how long a deactivated user may
+keep access there.
+
+Tokens revoked on logout (see ``user.revocation``) are rejected by every
+authenticator before the user is resolved.
+
+``AsyncCachedJWTAuth`` is the variant for async ninja routes: a request served
+from the cache never leaves the event loop.
+"""
+
+from dataclasses import dataclass
+from typing import Any, FrozenSet
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.utils.translation import gettext_lazy as _
+from ninja_extra.security import AsyncHttpBearer
+from ninja_jwt.authentication import JWTAuth
+from ninja_jwt.exceptions import AuthenticationFailed as NinjaAuthenticationFailed
+from ninja_jwt.exceptions import InvalidToken as NinjaInvalidToken
+from ninja_jwt.settings import api_settings as ninja_jwt_settings
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings as simplejwt_settings
+
+from user.models import User
+from user.revocation import revocation_list
+from utils.cache import LRUTTLCache
+
+
+@dataclass(frozen=True)
+class UserSnapshot:
+    """The user fields needed to authenticate and authorize a request."""
+
+    id: int
+    is_active: bool
+    is_staff: bool
+    is_superuser: bool
+    groups: FrozenSet[str]
+
+
+_cache_settings = getattr(settings, "USER_AUTH_CACHE", {})
+user_cache: LRUTTLCache[UserSnapshot] = LRUTTLCache(
+    max_size=_cache_settings.get("MAX_SIZE", 10_000),
+    ttl=_cache_settings.get("TTL", 60),
+)
+
+
+def get_user_snapshot(user_id: Any) -> UserSnapshot | None:
+    """Return the cached snapshot for ``user_id``, loading it on a miss."""
+    snapshot = user_cache.get(user_id)
+    if snapshot is not None:
+        return snapshot
+    return _load_user_snapshot(user_id)
+
+
+async def aget_user_snapshot(user_id: Any) -> UserSnapshot | None:
+    """Async ``get_user_snapshot``; only a cache miss leaves the event loop."""
+    snapshot = user_cache.get(user_id)
+    if snapshot is not None:
+        return snapshot
+    return await sync_to_async(_load_user_snapshot)(user_id)
+
+
+def _load_user_snapshot(user_id: Any) -> UserSnapshot | None:
+    # One row per group (a single row with a NULL name when there are none)
+    rows = list(
+        User.objects.filter(pk=user_id).values_list(
+            "id",
+            "is_active",
+            "is_staff",
+            "is_superuser",
+            "groups__name",
+        ),
+    )
+    if not rows:
+        return None
+    snapshot = UserSnapshot(
+        *rows[0][:4],
+        groups=frozenset(row[4] for row in rows if row[4] is not None),
+    )
+    user_cache.set(user_id, snapshot)
+    return snapshot
+
+
+class CachedUser:
+    """``request.user`` stand-in answering auth fields from a ``UserSnapshot``.
+
+    Any other attribute is read from the full ``User``, loaded on first use.
+    """
+
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, snapshot: UserSnapshot):
+        self.__dict__["_snapshot"] = snapshot
+        self.__dict__["_user"] = None
+
+    @property
+    def pk(self) -> int:
+        return self._snapshot.id
+
+    id = pk
+
+    @property
+    def is_active(self) -> bool:
+        return self._snapshot.is_active
+
+    @property
+    def is_staff(self) -> bool:
+        return self._snapshot.is_staff
+
+    @property
+    def is_superuser(self) -> bool:
+        return self._snapshot.is_superuser
+
+    @property
+    def group_names(self) -> FrozenSet[str]:
+        """Names of the groups the user belongs to."""
+        return self._snapshot.groups
+
+    def get_user(self) -> User:
+        """Return the full ``User`` instance, loading it once."""
+        if self._user is None:
+            self.__dict__["_user"] = User.objects.get(pk=self.pk)
+        return self._user
+
+    async def aget_user(self) -> User:
+        """Async ``get_user``."""
+        if self._user is None:
+            self.__dict__["_user"] = await User.objects.aget(pk=self.pk)
+        return self._user
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.get_user(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self.get_user(), name, value)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, CachedUser | User):
+            return self.pk == other.pk
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.pk)
+
+    def __str__(self) -> str:
+        return str(self.get_user())
+
+
+class CachedJWTAuth(JWTAuth):
+    """ninja_jwt ``JWTAuth`` resolving the user from the snapshot cache.
+
+    The validated token is kept on ``request.jwt_token`` so views can revoke it.
+    """
+
+    def jwt_authenticate(self, request, token: str) -> CachedUser:
+        request.user = AnonymousUser()
+        validated_token = self.get_validated_token(token)
+        user = self.get_user(validated_token)
+        request.user = user
+        request.jwt_token = validated_token
+        return user
+
+    def get_user(self, validated_token) -> CachedUser:
+        if revocation_list.is_revoked(
+            validated_token.get(ninja_jwt_settings.JTI_CLAIM)
+        ):
+            raise NinjaInvalidToken(_("Token has been revoked"))
+        snapshot = get_user_snapshot(self._user_id(validated_token))
+        return self._cached_user(snapshot)
+
+    @staticmethod
+    def _user_id(validated_token) -> Any:
+        try:
+            return validated_token[ninja_jwt_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise NinjaInvalidToken(
+                _("Token contained no recognizable user identification"),
+            ) from e
+
+    @staticmethod
+    def _cached_user(snapshot: UserSnapshot | None) -> CachedUser:
+        if snapshot is None:
+            raise NinjaAuthenticationFailed(_("User not found"))
+        if not snapshot.is_active:
+            raise NinjaAuthenticationFailed(_("User is inactive"))
+        return CachedUser(snapshot)
+
+
+class AsyncCachedJWTAuth(CachedJWTAuth, AsyncHttpBearer):
+    """``CachedJWTAuth`` for async routes.
+
+    Token validation and snapshot cache hits run on the event loop; only a
+    cache miss or a due revocation sync go to the database.
+    """
+
+    async def authenticate(self, request, token: str) -> CachedUser:
+        request.user = AnonymousUser()
+        validated_token = self.get_validated_token(token)
+        user = await self.aget_user(validated_token)
+        request.user = user
+        request.jwt_token = validated_token
+        return user
+
+    async def aget_user(self, validated_token) -> CachedUser:
+        if await revocation_list.ais_revoked(
+            validated_token.get(ninja_jwt_settings.JTI_CLAIM)
+        ):
+            raise NinjaInvalidToken(_("Token has been revoked"))
+        snapshot = await aget_user_snapshot(self._user_id(validated_token))
+        return self._cached_user(snapshot)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """simplejwt ``JWTAuthentication`` resolving the user from the snapshot cache.
+
+    ``CHECK_REVOKE_TOKEN`` is not supported, since it needs the password hash.
+    """
+
+    def get_user(self, validated_token) -> CachedUser:
+        if revocation_list.is_revoked(
+            validated_token.get(simplejwt_settings.JTI_CLAIM)
+        ):
+            raise InvalidToken(_("Token has been revoked"))
+        try:
+            user_id = validated_token[simplejwt_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification"),
+            ) from e
+
+        snapshot = get_user_snapshot(user_id)
+        if snapshot is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if simplejwt_settings.CHECK_USER_IS_ACTIVE and not snapshot.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return CachedUser(snapshot)
@@ -0,0 +1,141 @@
+"""Set-based updates, deactivation and deletion of many users at once.
+
+Each operation reads the targeted users in one query and writes them with one
+``bulk_update``/``update``/``delete``, returning one status per requested id.
+``bulk_update`` and ``update`` skip ``User.save()`` and the model signals, so
+the derived columns and the auth snapshot and profile caches are kept in sync
+here. Reads that decide the writes go to the primary database, never a
+replica.
+"""
+
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List
+
+from django.db import transaction
+from django.utils import timezone
+
+from core.routers import pin_to_primary
+from user.authentication import user_cache
+from user.models import User, month_day_key
+from user.profile_cache import profile_cache
+
+MAX_BULK_SIZE = 1000
+BULK_UPDATE_BATCH_SIZE = 500
+
+# Fields that can be changed through ``bulk_update_users``.
+BULK_UPDATE_FIELDS = (
+    "first_name",
+    "last_name",
+    "email",
+    "gender",
+    "date_birth",
+    "is_active",
+)
+
+
+@dataclass
+class BulkResult:
+    """Outcome for one requested user id."""
+
+    id: int
+    status: str
+
+
+def summarize(results: List[BulkResult]) -> Dict[str, Any]:
+    """Return the results with a count per status."""
+    return {"results": results, "counts": dict(Counter(r.status for r in results))}
+
+
+def _invalidate(user_ids: Iterable[int]) -> None:
+    user_ids = list(user_ids)
+    for user_id in user_ids:
+        user_cache.delete(user_id)
+    # QuerySet.update() and bulk_update() send no post_save
+    profile_cache.delete_many(user_ids)
+
+
+def bulk_update_users(patches: List[Dict[str, Any]]) -> List[BulkResult]:
+    """Apply ``{"id": ..., <field>: <value>}`` patches with one ``bulk_update``.
+
+    Only fields whose value actually changes are written. Statuses are
+    ``updated``, ``unchanged`` or ``not_found``.
+    """
+    fields = {name for patch in patches for name in patch if name != "id"}
+    unknown = fields.difference(BULK_UPDATE_FIELDS)
+    if unknown:
+        raise ValueError(f"Fields cannot be bulk updated: {sorted(unknown)}")
+
+    pin_to_primary()
+    users = User.objects.only("id", *fields).in_bulk([patch["id"] for patch in patches])
+    now = timezone.now()
+    results, changed_users, changed_fields = [], {}, set()
+    for patch in patches:
+        user = users.get(patch["id"])
+        if user is None:
+            results.append(BulkResult(patch["id"], "not_found"))
+            continue
+        changed = {
+            name
+            for name, value in patch.items()
+            if name != "id" and getattr(user, name) != value
+        }
+        for name in changed:
+            setattr(user, name, patch[name])
+        if "date_birth" in changed:
+            user.birth_month_day = month_day_key(user.date_birth)
+            changed.add("birth_month_day")
+        if changed:
+            user.updated_at = now
+            changed_users[user.pk] = user
+            changed_fields |= changed
+        results.append(BulkResult(patch["id"], "updated" if changed else "unchanged"))
+
+    if changed_users:
+        with transaction.atomic():
+            User.objects.bulk_update(
+                changed_users.values(),
+                fields=[*sorted(changed_fields), "updated_at"],
+                batch_size=BULK_UPDATE_BATCH_SIZE,
+            )
+        _invalidate(changed_users)
+    return results
+
+
+def bulk_deactivate_users(user_ids: List[int]) -> List[BulkResult]:
+    """Deactivate users with one ``UPDATE``.
+
+    Statuses are ``deactivated``, ``already_inactive`` or ``not_found``.
+    """
+    pin_to_primary()
+    active = dict(User.objects.filter(pk__in=user_ids).values_list("pk", "is_active"))
+    to_deactivate = [pk for pk, is_active in active.items() if is_active]
+    if to_deactivate:
+        User.objects.filter(pk__in=to_deactivate).update(
+            is_active=False,
+            updated_at=timezone.now(),
+        )
+        _invalidate(to_deactivate)
+
+    def status(pk: int) -> str:
+        if pk not in active:
+            return "not_found"
+        return "deactivated" if active[pk] else "already_inactive"
+
+    return [BulkResult(pk, status(pk)) for pk in user_ids]
+
+
+def bulk_delete_users(user_ids: List[int]) -> List[BulkResult]:
+    """Delete users, with their contacts and addresses, in one cascade.
+
+    Statuses are ``deleted`` or ``not_found``.
+    """
+    with transaction.atomic():
+        existing = set(
+            User.objects.filter(pk__in=user_ids).values_list("pk", flat=True)
+        )
+        if existing:
+            User.objects.filter(pk__in=existing).delete()
+    return [
+        BulkResult(pk, "deleted" if pk in existing else "not_found") for pk in user_ids
+    ]
@@ -0,0 +1,95 @@
+"""Conditional GET for single-user representations.
+
+A user's version is the latest ``updated_at`` of the user and of the related
+rows a representation includes, plus how many of those rows exist (so deleting
+one changes it too). It is computed with one aggregate query, and drives:
+
+- the ``ETag`` and ``Last-Modified`` headers, so a client revalidating an
+  unchanged user gets a 304 without the user being loaded or serialized;
+- the ETags stored with ``user.profile_cache`` entries, which are only served
+  for the version they were rendered from.
+
+Group and permission membership bump ``User.updated_at`` (see
+``user.signals``), so representations listing them are versioned as well.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable
+
+from django.db.models import Count, Max
+from django.http import HttpRequest, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from user.models import User
+
+
+@dataclass(frozen=True)
+class UserVersion:
+    """What a user's representation was last modified by."""
+
+    user_id: int
+    last_modified: datetime
+    related_count: int
+
+    @property
+    def etag(self) -> str:
+        stamp = int(self.last_modified.timestamp() * 1_000_000)
+        return f'"{self.user_id}-{stamp}-{self.related_count}"'
+
+
+def _aggregates(relations: Iterable[str]) -> Dict[str, Any]:
+    aggregates = {"updated_at": Max("updated_at")}
+    for relation in relations:
+        aggregates[f"{relation}_updated_at"] = Max(f"{relation}__updated_at")
+        aggregates[f"{relation}_count"] = Count(relation, distinct=True)
+    return aggregates
+
+
+def _version(user_id: int, row: Dict[str, Any]) -> UserVersion | None:
+    if row["updated_at"] is None:
+        return None
+    return UserVersion(
+        user_id=user_id,
+        last_modified=max(
+            value
+            for name, value in row.items()
+            if name.endswith("updated_at") and value is not None
+        ),
+        related_count=sum(
+            value for name, value in row.items() if name.endswith("_count")
+        ),
+    )
+
+
+def get_user_version(user_id: int, relations: Iterable[str]) -> UserVersion | None:
+    """Return the version of ``user_id`` with ``relations``, or None if missing."""
+    row = User.objects.filter(pk=user_id).aggregate(**_aggregates(relations))
+    return _version(user_id, row)
+
+
+async def aget_user_version(
+    user_id: int,
+    relations: Iterable[str],
+) -> UserVersion | None:
+    """Async ``get_user_version``."""
+    row = await User.objects.filter(pk=user_id).aaggregate(**_aggregates(relations))
+    return _version(user_id, row)
+
+
+def not_modified(request: HttpRequest, version: UserVersion) -> HttpResponse | None:
+    """Return a 304 response if the client's copy is ``version``, else None."""
+    return get_conditional_response(
+        request,
+        etag=version.etag,
+        last_modified=int(version.last_modified.timestamp()),
+    )
+
+
+def set_version_headers(response: HttpResponse, version: UserVersion) -> HttpResponse:
+    """Add the validators of ``version``; clients must revalidate before reuse."""
+    response["ETag"] = version.etag
+    response["Last-Modified"] = http_date(version.last_modified.timestamp())
+    response["Cache-Control"] = "private, no-cache"
+    return response
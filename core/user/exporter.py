@@ -0,0 +1,197 @@
+"""Streaming export of users, with their contacts and addresses.
+
+Users are read in primary key order, one chunk at a time, with their active
+contacts and addresses prefetched per chunk. Each exporter yields encoded
+output chunk by chunk, so memory stays constant whatever the table size.
+
+Formats:
+
+- ``csv``: one row per user with the columns accepted by ``user.importer``
+  (first active PHONE/WHATSAPP contact and first active address).
+- ``jsonl``: one object per user with every active contact and address.
+- ``parquet``: the ``csv`` columns, typed, one row group per chunk. Needs the
+  optional ``pyarrow`` dependency.
+"""
+
+import csv
+import io
+import json
+from typing import Any, Callable, Dict, Iterable, Iterator, List
+
+from django.db.models import Prefetch, QuerySet
+
+from user.importer import ADDRESS_FIELDS, CSV_CONTACT_COLUMNS
+from user.models import Address, Contact, User
+from user.querysets import DEFAULT_CHUNK_SIZE, iterate_pk_chunks
+
+EXPORT_USER_FIELDS = (
+    "id",
+    "username",
+    "email",
+    "first_name",
+    "last_name",
+    "cpf",
+    "date_birth",
+    "gender",
+    "is_active",
+    "date_joined",
+)
+COLUMNS = (*EXPORT_USER_FIELDS, *CSV_CONTACT_COLUMNS, *ADDRESS_FIELDS)
+
+CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "jsonl": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+class ExportError(Exception):
+    """Raised when a format cannot be produced."""
+
+
+def users_for_export(queryset: QuerySet | None = None) -> QuerySet:
+    """Return users with only the exported columns and active relations."""
+    if queryset is None:
+        queryset = User.objects.all()
+    return queryset.only(*EXPORT_USER_FIELDS).prefetch_related(
+        Prefetch(
+            "contacts",
+            queryset=Contact.objects.filter(is_active=True)
+            .only("user_id", "type", "value")
+            .order_by("pk"),
+        ),
+        Prefetch(
+            "addresses",
+            queryset=Address.objects.filter(is_active=True)
+            .only("user_id", *ADDRESS_FIELDS)
+            .order_by("pk"),
+        ),
+    )
+
+
+def flat_row(user: User) -> Dict[str, Any]:
+    """Return ``user`` as one value per column of ``COLUMNS``."""
+    row = {name: getattr(user, name) for name in EXPORT_USER_FIELDS}
+    contacts = {}
+    for contact in user.contacts.all():
+        contacts.setdefault(contact.type, contact.value)
+    for column, contact_type in CSV_CONTACT_COLUMNS.items():
+        row[column] = contacts.get(contact_type)
+    addresses = user.addresses.all()
+    address = addresses[0] if addresses else None
+    for name in ADDRESS_FIELDS:
+        row[name] = getattr(address, name, None)
+    return row
+
+
+def nested_row(user: User) -> Dict[str, Any]:
+    """Return ``user`` with every active contact and address."""
+    row = {name: getattr(user, name) for name in EXPORT_USER_FIELDS}
+    row["contacts"] = [
+        {"type": contact.type, "value": contact.value}
+        for contact in user.contacts.all()
+    ]
+    row["addresses"] = [
+        {name: getattr(address, name) for name in ADDRESS_FIELDS}
+        for address in user.addresses.all()
+    ]
+    return row
+
+
+def _csv(chunks: Iterable[List[User]]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=COLUMNS)
+    writer.writeheader()
+    for chunk in chunks:
+        writer.writerows(flat_row(user) for user in chunk)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+def _jsonl(chunks: Iterable[List[User]]) -> Iterator[str]:
+    for chunk in chunks:
+        yield "".join(
+            json.dumps(nested_row(user), default=str, ensure_ascii=False) + "\n"
+            for user in chunk
+        )
+
+
+class _StreamSink(io.RawIOBase):
+    """Write-only file that hands out what was written since the last drain.
+
+    Keeps its own position so Parquet footer offsets stay right after draining.
+    """
+
+    def __init__(self):
+        self._parts: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._parts.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+def _parquet(chunks: Iterable[List[User]]) -> Iterator[bytes]:
+    # Imported before the generator starts, so a missing pyarrow is reported
+    # before any response is streamed.
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ExportError("Parquet export requires pyarrow") from e
+
+    types = {
+        "id": pa.int64(),
+        "date_birth": pa.date32(),
+        "is_active": pa.bool_(),
+        "date_joined": pa.timestamp("us", tz="UTC"),
+    }
+    schema = pa.schema([(name, types.get(name, pa.string())) for name in COLUMNS])
+
+    def generate() -> Iterator[bytes]:
+        sink = _StreamSink()
+        with pq.ParquetWriter(sink, schema) as writer:
+            for chunk in chunks:
+                rows = [flat_row(user) for user in chunk]
+                writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+                yield sink.drain()
+        yield sink.drain()
+
+    return generate()
+
+
+EXPORTERS: Dict[str, Callable[[Iterable[List[User]]], Iterator[str | bytes]]] = {
+    "csv": _csv,
+    "jsonl": _jsonl,
+    "parquet": _parquet,
+}
+
+
+def export_users(
+    file_format: str,
+    queryset: QuerySet | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[str | bytes]:
+    """Yield the export of ``queryset`` (all users by default) in ``file_format``.
+
+    Parquet output is bytes; the other formats are text.
+    """
+    if file_format not in EXPORTERS:
+        raise ExportError(f"Unsupported format {file_format!r}")
+    chunks = iterate_pk_chunks(users_for_export(queryset), chunk_size=chunk_size)
+    return EXPORTERS[file_format](chunks)
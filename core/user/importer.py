@@ -0,0 +1,347 @@
+"""Bulk import of users, with their contacts and addresses, from CSV or JSONL.
+
+Files are read one row at a time and written in chunks. Each chunk is one
+transaction with one ``bulk_create`` per model, so memory does not depend on
+the file size. Only the usernames and CPFs seen so far are kept, to reject
+duplicates within the file.
+
+A JSONL line is an object with the ``User`` fields plus optional
+``contacts`` (``[{"type": "WHATSAPP", "value": "..."}]``) and ``addresses``
+(a list of ``Address`` field dicts, or a single ``address`` dict).
+
+A CSV file has a header row with the same ``User`` fields, the ``Address``
+fields for one address, and ``phone`` / ``whatsapp`` columns for contacts.
+Commas, semicolons and tabs are accepted as delimiters.
+
+In both formats a non-empty ``email`` also becomes an EMAIL contact.
+``username`` defaults to the CPF. Imported users get an unusable password.
+"""
+
+import csv
+import itertools
+import json
+import re
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterator, List, TextIO, Tuple
+
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from localflavor.br.br_states import STATE_CHOICES
+from localflavor.br.validators import BRCPFValidator
+
+from user.models import Address, Contact, User, month_day_key
+
+IMPORT_CHUNK_SIZE = 1000
+
+# Errors kept in the report; the rest are only counted.
+MAX_REPORTED_ERRORS = 1000
+
+USER_FIELDS = ("username", "email", "first_name", "last_name", "cpf", "gender")
+ADDRESS_FIELDS = (
+    "street",
+    "number",
+    "complement",
+    "neighborhood",
+    "city",
+    "state",
+    "zip_code",
+    "country",
+)
+CSV_CONTACT_COLUMNS = {
+    "phone": Contact.ContactType.PHONE,
+    "whatsapp": Contact.ContactType.WHATSAPP,
+}
+DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y")
+
+_validate_cpf = BRCPFValidator()
+_states = {code for code, _name in STATE_CHOICES}
+_genders = set(User.Gender.values)
+_contact_types = set(Contact.ContactType.values)
+
+
+@dataclass
+class RowError:
+    """A row that was not imported."""
+
+    line: int
+    message: str
+
+
+@dataclass
+class ImportReport:
+    """Outcome of an import, updated after every chunk."""
+
+    total: int = 0
+    created: int = 0
+    error_count: int = 0
+    errors: List[RowError] = field(default_factory=list)
+    started_at: float = field(default_factory=time.perf_counter)
+    elapsed: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.total / self.elapsed if self.elapsed else 0.0
+
+    def add_error(self, line: int, message: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(RowError(line, message))
+
+
+@dataclass
+class UserRecord:
+    """Unsaved rows for one imported user."""
+
+    line: int
+    user: User
+    contacts: List[Contact]
+    addresses: List[Address]
+
+
+def _text(value: Any) -> str:
+    return "" if value is None else str(value).strip()
+
+
+def _check_length(model, name: str, value: str | None) -> None:
+    """Reject values the database column of ``model.name`` would not take."""
+    max_length = model._meta.get_field(name).max_length
+    if value and max_length and len(value) > max_length:
+        raise ValidationError(f"{name} is longer than {max_length} characters")
+
+
+def _parse_date(value: str) -> date:
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    raise ValidationError(f"Invalid date_birth {value!r}")
+
+
+def _objects(data: Dict[str, Any], name: str) -> List[Dict[str, Any]]:
+    """Return ``data[name]``, which must be a list of objects."""
+    rows = data.get(name) or []
+    if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+        raise ValidationError(f"{name} must be a list of objects")
+    return rows
+
+
+def _parse_address(data: Dict[str, Any]) -> Address:
+    values = {name: _text(data.get(name)) or None for name in ADDRESS_FIELDS}
+    for name, value in values.items():
+        _check_length(Address, name, value)
+    if values["state"]:
+        values["state"] = values["state"].upper()
+        if values["state"] not in _states:
+            raise ValidationError(f"Invalid state {values['state']!r}")
+    if values["country"] is None:
+        values["country"] = "Brazil"
+    return Address(**values)
+
+
+def parse_record(line: int, data: Dict[str, Any]) -> UserRecord:
+    """Validate one input row and build its unsaved ``User``/``Contact``/``Address``.
+
+    Raises ``ValidationError`` describing the first invalid field.
+    """
+    values = {name: _text(data.get(name)) for name in USER_FIELDS}
+
+    if values["cpf"]:
+        _validate_cpf(values["cpf"])
+        values["cpf"] = re.sub(r"\D", "", values["cpf"])
+    values["username"] = values["username"] or values["cpf"]
+    if not values["username"]:
+        raise ValidationError("username or cpf is required")
+    if values["email"]:
+        validate_email(values["email"])
+    if values["gender"] and values["gender"] not in _genders:
+        raise ValidationError(f"Invalid gender {values['gender']!r}")
+    for name, value in values.items():
+        _check_length(User, name, value)
+
+    raw_date_birth = _text(data.get("date_birth"))
+    date_birth = _parse_date(raw_date_birth) if raw_date_birth else None
+
+    user = User(
+        username=values["username"],
+        email=values["email"],
+        first_name=values["first_name"],
+        last_name=values["last_name"],
+        cpf=values["cpf"] or None,
+        gender=values["gender"] or None,
+        date_birth=date_birth,
+        # bulk_create skips User.save(), which keeps this column in sync
+        birth_month_day=month_day_key(date_birth),
+        password=make_password(None),
+    )
+
+    contacts = []
+    if values["email"]:
+        contacts.append(Contact(type=Contact.ContactType.EMAIL, value=values["email"]))
+    for contact in _objects(data, "contacts"):
+        contact_type = _text(contact.get("type")).upper()
+        value = _text(contact.get("value"))
+        if contact_type not in _contact_types or not value:
+            raise ValidationError(f"Invalid contact {contact!r}")
+        _check_length(Contact, "value", value)
+        if contact_type == Contact.ContactType.EMAIL and value == values["email"]:
+            continue
+        contacts.append(Contact(type=contact_type, value=value))
+
+    address_rows = _objects(data, "addresses")
+    if data.get("address"):
+        if not isinstance(data["address"], dict):
+            raise ValidationError("address must be an object")
+        address_rows = [data["address"], *address_rows]
+    addresses = [_parse_address(address) for address in address_rows]
+
+    return UserRecord(line, user, contacts, addresses)
+
+
+def _csv_rows(stream: TextIO) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    header = stream.readline()
+    try:
+        dialect = csv.Sniffer().sniff(header, delimiters=",;\t")
+    except csv.Error:
+        dialect = csv.excel
+    reader = csv.DictReader(itertools.chain([header], stream), dialect=dialect)
+    for row in reader:
+        row = {(key or "").strip().lower(): value for key, value in row.items()}
+        row["contacts"] = [
+            {"type": contact_type, "value": row[column]}
+            for column, contact_type in CSV_CONTACT_COLUMNS.items()
+            if _text(row.get(column))
+        ]
+        if any(_text(row.get(name)) for name in ADDRESS_FIELDS):
+            row["address"] = {name: row.get(name) for name in ADDRESS_FIELDS}
+        yield reader.line_num, row
+
+
+def _jsonl_rows(stream: TextIO) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    for line, text in enumerate(stream, start=1):
+        if not text.strip():
+            continue
+        try:
+            row = json.loads(text)
+        except json.JSONDecodeError as e:
+            yield line, e
+            continue
+        yield line, row if isinstance(row, dict) else TypeError("Expected an object")
+
+
+def read_rows(stream: TextIO, file_format: str) -> Iterator[Tuple[int, Any]]:
+    """Yield ``(line, row)`` pairs; ``row`` is an exception for unparsable lines."""
+    if file_format == "csv":
+        return _csv_rows(stream)
+    if file_format == "jsonl":
+        return _jsonl_rows(stream)
+    raise ValueError(f"Unsupported format {file_format!r} (expected csv or jsonl)")
+
+
+def _existing_keys(records: List[UserRecord]) -> Tuple[set, set]:
+    """Usernames and CPFs of ``records`` that are already in the database."""
+    usernames = [record.user.username for record in records]
+    cpfs = [record.user.cpf for record in records if record.user.cpf]
+    rows = User.objects.filter(Q(username__in=usernames) | Q(cpf__in=cpfs))
+    existing_usernames, existing_cpfs = set(), set()
+    for username, cpf in rows.values_list("username", "cpf"):
+        existing_usernames.add(username)
+        existing_cpfs.add(cpf)
+    return existing_usernames, existing_cpfs
+
+
+def _write_chunk(records: List[UserRecord], report: ImportReport) -> None:
+    existing_usernames, existing_cpfs = _existing_keys(records)
+    new_records = []
+    for record in records:
+        if record.user.username in existing_usernames:
+            report.add_error(record.line, "username already exists")
+        elif record.user.cpf and record.user.cpf in existing_cpfs:
+            report.add_error(record.line, "cpf already exists")
+        else:
+            new_records.append(record)
+    if not new_records:
+        return
+
+    try:
+        with transaction.atomic():
+            users = User.objects.bulk_create([record.user for record in new_records])
+            contacts, addresses = [], []
+            for record, user in zip(new_records, users):
+                for row in record.contacts:
+                    row.user = user
+                    contacts.append(row)
+                for row in record.addresses:
+                    row.user = user
+                    addresses.append(row)
+            Contact.objects.bulk_create(contacts)
+            Address.objects.bulk_create(addresses)
+    except IntegrityError as e:
+        # Rows inserted concurrently by someone else; the whole chunk is skipped
+        for record in new_records:
+            report.add_error(record.line, f"chunk rolled back: {e}")
+        return
+    report.created += len(new_records)
+
+
+def import_users(
+    stream: TextIO,
+    file_format: str,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+    on_chunk: Callable[[ImportReport], None] | None = None,
+) -> ImportReport:
+    """Import every row of ``stream`` and return the report.
+
+    ``on_chunk`` is called with the report after each chunk is written.
+    """
+    report = ImportReport()
+    seen_usernames: set = set()
+    seen_cpfs: set = set()
+    chunk: List[UserRecord] = []
+
+    def flush() -> None:
+        _write_chunk(chunk, report)
+        chunk.clear()
+        report.elapsed = time.perf_counter() - report.started_at
+        if on_chunk is not None:
+            on_chunk(report)
+
+    for line, row in read_rows(stream, file_format):
+        report.total += 1
+        if isinstance(row, Exception):
+            report.add_error(line, f"Invalid JSON: {row}")
+            continue
+        try:
+            record = parse_record(line, row)
+        except ValidationError as e:
+            report.add_error(line, "; ".join(e.messages))
+            continue
+
+        if record.user.username in seen_usernames:
+            report.add_error(line, "duplicate username in file")
+            continue
+        if record.user.cpf and record.user.cpf in seen_cpfs:
+            report.add_error(line, "duplicate cpf in file")
+            continue
+        seen_usernames.add(record.user.username)
+        if record.user.cpf:
+            seen_cpfs.add(record.user.cpf)
+
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            flush()
+
+    if chunk:
+        flush()
+    report.elapsed = time.perf_counter() - report.started_at
+    return report
+
+
+def detect_format(filename: str) -> str:
+    """Guess the import format from a file name."""
+    return "jsonl" if filename.lower().endswith((".jsonl", ".ndjson")) else "csv"
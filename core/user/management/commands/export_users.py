@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from user.exporter import EXPORTERS, ExportError, export_users
+from user.querysets import DEFAULT_CHUNK_SIZE
+
+
+class Command(BaseCommand):
+    help = "Export users, contacts and addresses to a CSV, JSONL or Parquet file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Output file, or - for standard output.")
+        parser.add_argument(
+            "--format",
+            choices=sorted(EXPORTERS),
+            help="Output format (default: guessed from the extension, else csv).",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help="Users read per query.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        file_format = options["format"] or path.rsplit(".", 1)[-1].lower()
+        if file_format not in EXPORTERS:
+            file_format = "csv"
+
+        try:
+            content = export_users(file_format, chunk_size=options["chunk_size"])
+        except ExportError as e:
+            raise CommandError(e) from e
+
+        if path == "-":
+            if file_format == "parquet":
+                raise CommandError("Parquet output needs a file path")
+            for part in content:
+                self.stdout.write(part, ending="")
+            return
+
+        if file_format == "parquet":
+            out = open(path, "wb")
+        else:
+            out = open(path, "w", encoding="utf-8", newline="")
+        with out:
+            for part in content:
+                out.write(part)
+        self.stderr.write(self.style.SUCCESS(f"Exported users to {path}"))
@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from user.importer import IMPORT_CHUNK_SIZE, detect_format, import_users
+
+
+class Command(BaseCommand):
+    help = "Import users, contacts and addresses from a CSV or JSONL file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV or JSONL file to import.")
+        parser.add_argument(
+            "--format",
+            choices=["csv", "jsonl"],
+            help="File format (default: guessed from the extension).",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=IMPORT_CHUNK_SIZE,
+            help="Rows written per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        file_format = options["format"] or detect_format(options["path"])
+
+        def progress(report):
+            self.stdout.write(
+                f"{report.total} rows read, {report.created} created, "
+                f"{report.error_count} errors ({report.rows_per_second:.0f} rows/s)",
+            )
+
+        try:
+            with open(options["path"], encoding="utf-8-sig", newline="") as stream:
+                report = import_users(
+                    stream,
+                    file_format,
+                    chunk_size=options["chunk_size"],
+                    on_chunk=progress,
+                )
+        except (OSError, UnicodeDecodeError) as e:
+            raise CommandError(e) from e
+
+        for error in report.errors:
+            self.stderr.write(f"line {error.line}: {error.message}")
+        if report.error_count > len(report.errors):
+            self.stderr.write(
+                f"... {report.error_count - len(report.errors)} more errors",
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {report.created} of {report.total} rows in "
+                f"{report.elapsed:.1f}s ({report.rows_per_second:.0f} rows/s)",
+            ),
+        )
@@ -0,0 +1,77 @@
+# Generated by Django 5.2.1 on 2026-10-17 12:21
+
+import django.db.models.functions.datetime
+from django.db import migrations, models
+
+
+def blank_cpf_to_null(apps, schema_editor):
+    """Blank CPFs become NULL so the partial unique constraint ignores them."""
+    User = apps.get_model("user", "User")
+    User.objects.filter(cpf="").update(cpf=None)
+
+
+def check_duplicate_cpfs(apps, schema_editor):
+    """Stop with the offending users instead of a bare IntegrityError.
+
+    CPF uniqueness was not enforced before this constraint, so existing rows
+    may share a CPF. They must be merged or corrected by hand first.
+    """
+    User = apps.get_model("user", "User")
+    duplicated = (
+        User.objects.filter(cpf__isnull=False)
+        .values("cpf")
+        .annotate(count=models.Count("pk"))
+        .filter(count__gt=1)
+        .values("cpf")
+    )
+    users = {}
+    for pk, cpf in (
+        User.objects.filter(cpf__in=duplicated)
+        .order_by("cpf", "pk")
+        .values_list("pk", "cpf")
+    ):
+        users.setdefault(cpf, []).append(str(pk))
+    if users:
+        listed = "\n".join(
+            f"  {cpf}: users {', '.join(pks)}" for cpf, pks in users.items()
+        )
+        raise RuntimeError(
+            "Cannot add the unique CPF constraint: these CPFs are shared by more than "
+            f"one user. Correct them and run the migration again.\n{listed}",
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("user", "0002_someotherclass_user_gender"),
+    ]
+
+    operations = [
+        migrations.RunPython(blank_cpf_to_null, migrations.RunPython.noop),
+        migrations.RunPython(check_duplicate_cpfs, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="contact",
+            index=models.Index(
+                fields=["user", "type", "is_active"],
+                name="contact_user_type_active_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                django.db.models.functions.datetime.ExtractMonth("date_birth"),
+                django.db.models.functions.datetime.ExtractDay("date_birth"),
+                name="user_birth_month_day_idx",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="user",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("cpf__isnull", False)),
+                fields=("cpf",),
+                name="user_cpf_unique",
+                violation_error_message="Já existe um usuário com este CPF.",
+            ),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.1 on 2026-10-17 12:22
+
+from django.db import migrations, models
+from django.db.models.functions import ExtractDay, ExtractMonth
+
+
+def backfill_birth_month_day(apps, schema_editor):
+    """Compute MMDD for every existing birth date in a single UPDATE."""
+    User = apps.get_model("user", "User")
+    User.objects.exclude(date_birth=None).update(
+        birth_month_day=ExtractMonth("date_birth") * 100 + ExtractDay("date_birth"),
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("user", "0003_indexes_and_cpf_constraint"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="user",
+            name="user_birth_month_day_idx",
+        ),
+        migrations.AddField(
+            model_name="user",
+            name="birth_month_day",
+            field=models.PositiveSmallIntegerField(
+                blank=True,
+                editable=False,
+                help_text="Mês e dia de nascimento como MMDD, mantido a partir de date_birth.",
+                null=True,
+                verbose_name="Dia do aniversário",
+            ),
+        ),
+        migrations.RunPython(backfill_birth_month_day, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                fields=["birth_month_day"], name="user_birth_month_day_idx"
+            ),
+        ),
+    ]
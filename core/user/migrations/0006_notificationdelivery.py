@@ -0,0 +1,32 @@
+# Generated by Django 5.2.1 on 2026-10-17 13:20
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0005_revokedtoken'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationDelivery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('channel', models.CharField(choices=[('EMAIL', 'Email'), ('PHONE', 'Telefone'), ('WHATSAPP', 'WhatsApp')], help_text='Tipo de contato pelo qual a notificação foi enviada.', max_length=16, verbose_name='Canal')),
+                ('campaign', models.CharField(help_text='Identificador da notificação, por exemplo birthday.', max_length=64, verbose_name='Campanha')),
+                ('date', models.DateField(help_text='Dia ao qual o envio se refere.', verbose_name='Data')),
+                ('user', models.ForeignKey(help_text='Usuário notificado.', on_delete=django.db.models.deletion.CASCADE, related_name='notification_deliveries', to=settings.AUTH_USER_MODEL, verbose_name='Usuário')),
+            ],
+            options={
+                'verbose_name': 'Envio de notificação',
+                'verbose_name_plural': 'Envios de notificação',
+                'constraints': [models.UniqueConstraint(fields=('campaign', 'date', 'channel', 'user'), name='unique_notification_delivery')],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.1 on 2026-10-17 13:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0006_notificationdelivery'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='revokedtoken',
+            index=models.Index(fields=['created_at'], name='revokedtoken_created_at_idx'),
+        ),
+    ]
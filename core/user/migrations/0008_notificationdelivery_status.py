@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-17 13:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0007_revokedtoken_created_at_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notificationdelivery',
+            name='claim',
+            field=models.UUIDField(blank=True, editable=False, help_text='Execução que reservou o envio.', null=True, verbose_name='Reserva'),
+        ),
+        migrations.AddField(
+            model_name='notificationdelivery',
+            name='status',
+            field=models.CharField(choices=[('PENDING', 'Pendente'), ('SENT', 'Enviado')], default='SENT', help_text='Pendente enquanto o envio está reservado por uma execução.', max_length=16, verbose_name='Status'),
+        ),
+    ]
@@ -1,5 +1,11 @@
+import calendar
+from datetime import date, timedelta
+
+from asgiref.sync import sync_to_async
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models.signals import post_save
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from localflavor.br.models import BRStateField
 
@@ -7,6 +13,25 @@ from user.utils.base_models import BaseModel
 from user.utils.models_mixins import UserMixin
 
 
+def month_day_key(value: date | None) -> int | None:
+    """Encode the month and day of ``value`` as ``MMDD`` (e.g. June 15 -> 615)."""
+    if value is None:
+        return None
+    return value.month * 100 + value.day
+
+
+def birthday_keys(day: date) -> list[int]:
+    """Return the ``birth_month_day`` keys celebrating a birthday on ``day``.
+
+    People born on February 29 are congratulated on February 28 in non-leap
+    years.
+    """
+    keys = [month_day_key(day)]
+    if (day.month, day.day) == (2, 28) and not calendar.isleap(day.year):
+        keys.append(229)
+    return keys
+
+
 class Contact(BaseModel):
     """Model for user contacts (email, phone, WhatsApp)."""
 
@@ -44,6 +69,13 @@ class Contact(BaseModel):
     class Meta:
         verbose_name = "Contato"
         verbose_name_plural = "Contatos"
+        indexes = [
+            # Active contacts of a given type per user (notification fan-out)
+            models.Index(
+                fields=["user", "type", "is_active"],
+                name="contact_user_type_active_idx",
+            ),
+        ]
 
     def __str__(self):
         """String representation for Contact."""
@@ -162,15 +194,209 @@ class User(UserMixin, AbstractUser, BaseModel):
         verbose_name="Gênero",
         help_text="Gênero do usuário.",
     )
+    birth_month_day = models.PositiveSmallIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name="Dia do aniversário",
+        help_text="Mês e dia de nascimento como MMDD, mantido a partir de date_birth.",
+    )
 
     class Meta:
         verbose_name = "Usuário"
         verbose_name_plural = "Usuários"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["cpf"],
+                condition=models.Q(cpf__isnull=False),
+                name="user_cpf_unique",
+                violation_error_message="Já existe um usuário com este CPF.",
+            ),
+        ]
+        indexes = [
+            # Daily birthday lookup across years
+            models.Index(fields=["birth_month_day"], name="user_birth_month_day_idx"),
+        ]
 
     def __str__(self):
         """String representation for User."""
         return self.get_display_name()
 
+    def save(self, *args, **kwargs):
+        """Normalize derived columns before saving.
+
+        A blank CPF is stored as NULL so it stays out of the unique index, and
+        ``birth_month_day`` is kept in sync with ``date_birth``.
+        """
+        if not self.cpf:
+            self.cpf = None
+        self.birth_month_day = month_day_key(self.date_birth)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "date_birth" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "birth_month_day"}
+        super().save(*args, **kwargs)
+
+    def save_changes(self, changes: dict, expected_updated_at=None) -> bool:
+        """Write the fields of ``changes`` that differ with one conditional UPDATE.
+
+        The row is only written if its ``updated_at`` still equals
+        ``expected_updated_at`` (by default, the value loaded on this instance),
+        so concurrent edits are detected instead of overwritten. Returns
+        ``False`` on such a conflict, leaving the instance untouched.
+        ``post_save`` is sent as ``save(update_fields=...)`` would.
+        """
+        if "cpf" in changes and not changes["cpf"]:
+            changes = {**changes, "cpf": None}
+        if "date_birth" in changes:
+            changes = {
+                **changes,
+                "birth_month_day": month_day_key(changes["date_birth"]),
+            }
+        changes = {
+            name: value
+            for name, value in changes.items()
+            if getattr(self, name) != value
+        }
+        if expected_updated_at is None:
+            expected_updated_at = self.updated_at
+        # Versions round-trip through JSON, which keeps only milliseconds
+        version = expected_updated_at.replace(
+            microsecond=expected_updated_at.microsecond // 1000 * 1000,
+        )
+        next_version = version + timedelta(milliseconds=1)
+        if not changes:
+            return version <= self.updated_at < next_version
+
+        now = timezone.now()
+        updated = User.objects.filter(
+            pk=self.pk,
+            updated_at__gte=version,
+            updated_at__lt=next_version,
+        ).update(**changes, updated_at=now)
+        if not updated:
+            return False
+        for name, value in changes.items():
+            setattr(self, name, value)
+        self.updated_at = now
+        post_save.send(
+            sender=User,
+            instance=self,
+            created=False,
+            update_fields=frozenset([*changes, "updated_at"]),
+            raw=False,
+            using=self._state.db,
+        )
+        return True
+
+    async def asave_changes(self, changes: dict, expected_updated_at=None) -> bool:
+        """Async ``save_changes``."""
+        return await sync_to_async(self.save_changes)(changes, expected_updated_at)
+
+
+class RevokedToken(BaseModel):
+    """JWT revoked before its expiry (logout), identified by its ``jti`` claim."""
+
+    jti = models.CharField(
+        max_length=255,
+        unique=True,
+        verbose_name="JTI",
+        help_text="Identificador único do token revogado.",
+    )
+    user = models.ForeignKey(
+        "User",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="revoked_tokens",
+        verbose_name="Usuário",
+        help_text="Usuário dono do token.",
+    )
+    expires_at = models.DateTimeField(
+        db_index=True,
+        verbose_name="Expira em",
+        help_text="Expiração do token; depois disso o registro pode ser removido.",
+    )
+
+    class Meta:
+        verbose_name = "Token revogado"
+        verbose_name_plural = "Tokens revogados"
+        indexes = [
+            # Incremental syncs of user.revocation read recently created rows
+            models.Index(fields=["created_at"], name="revokedtoken_created_at_idx"),
+        ]
+
+    def __str__(self):
+        """String representation for RevokedToken."""
+        return self.jti
+
+
+class NotificationDelivery(BaseModel):
+    """Notification of a campaign sent to a user through a channel on a date.
+
+    One row per (campaign, date, channel, user): jobs check the ledger before
+    enqueueing, and claim rows (``PENDING``, with their ``claim`` token) before
+    sending, so reruns, retries and concurrent copies of a job skip what was
+    sent or is being sent.
+    """
+
+    class Status(models.TextChoices):
+        """Estados de um envio."""
+
+        PENDING = "PENDING", _("Pendente")
+        SENT = "SENT", _("Enviado")
+
+    user = models.ForeignKey(
+        "User",
+        on_delete=models.CASCADE,
+        related_name="notification_deliveries",
+        verbose_name="Usuário",
+        help_text="Usuário notificado.",
+    )
+    channel = models.CharField(
+        max_length=16,
+        choices=Contact.ContactType.choices,
+        verbose_name="Canal",
+        help_text="Tipo de contato pelo qual a notificação foi enviada.",
+    )
+    campaign = models.CharField(
+        max_length=64,
+        verbose_name="Campanha",
+        help_text="Identificador da notificação, por exemplo birthday.",
+    )
+    date = models.DateField(
+        verbose_name="Data",
+        help_text="Dia ao qual o envio se refere.",
+    )
+    status = models.CharField(
+        max_length=16,
+        choices=Status.choices,
+        default=Status.SENT,
+        verbose_name="Status",
+        help_text="Pendente enquanto o envio está reservado por uma execução.",
+    )
+    claim = models.UUIDField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name="Reserva",
+        help_text="Execução que reservou o envio.",
+    )
+
+    class Meta:
+        verbose_name = "Envio de notificação"
+        verbose_name_plural = "Envios de notificação"
+        constraints = [
+            # Leading columns match the ledger lookups of a campaign's day
+            models.UniqueConstraint(
+                fields=["campaign", "date", "channel", "user"],
+                name="unique_notification_delivery",
+            ),
+        ]
+
+    def __str__(self):
+        """String representation for NotificationDelivery."""
+        return f"{self.campaign} {self.date} {self.channel} {self.user_id}"
+
 
 class SomeOtherClass(models.Model):
     """Classe auxiliar para o modelo de usuário."""
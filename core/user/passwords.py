@@ -0,0 +1,81 @@
+"""Password hashing and verification.
+
+Hashing is deliberately slow (PBKDF2 runs hundreds of thousands of
+iterations), so every helper here hashes at most once per call, in a dedicated
+thread pool sized by ``PASSWORD_HASHING_WORKERS``, so async views do not block
+the event loop. Django's own ``acheck_password`` still hashes on the calling
+thread. Sync code (DRF, admin) uses Django's ``User.set_password`` and
+``User.check_password`` directly.
+"""
+
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.hashers import make_password, verify_password
+from django.contrib.auth.signals import user_login_failed
+from django.http import HttpRequest
+
+from user.models import User
+
+executor = ThreadPoolExecutor(
+    max_workers=getattr(settings, "PASSWORD_HASHING_WORKERS", None) or os.cpu_count(),
+    thread_name_prefix="password-hasher",
+)
+
+
+async def ahash_password(raw_password: str) -> str:
+    """``make_password`` run in the password hashing pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, make_password, raw_password)
+
+
+async def aset_password(user: User, raw_password: str) -> None:
+    """``User.set_password`` and save, hashing in the password hashing pool."""
+    user.password = await ahash_password(raw_password)
+    # Picked up by AbstractBaseUser.save() to notify the password validators
+    user._password = raw_password
+    await sync_to_async(user.save)(update_fields=["password"])
+
+
+async def acheck_password(user: User, raw_password: str) -> bool:
+    """``User.check_password``, verifying in the password hashing pool."""
+    loop = asyncio.get_running_loop()
+    is_correct, must_update = await loop.run_in_executor(
+        executor,
+        verify_password,
+        raw_password,
+        user.password,
+    )
+    if is_correct and must_update:
+        await aset_password(user, raw_password)
+    return is_correct
+
+
+async def aauthenticate(
+    username: str,
+    password: str,
+    request: HttpRequest | None = None,
+) -> User | None:
+    """Return the active user matching the credentials, or ``None``.
+
+    Stands in for ``authenticate()`` with the ``ModelBackend`` only: other
+    ``AUTHENTICATION_BACKENDS`` are not consulted. Like ``authenticate()``, a
+    failure sends ``user_login_failed``, and like ``ModelBackend``, an unknown
+    username still costs one hash so response times do not reveal which
+    usernames exist.
+    """
+    user = await User.objects.filter(username=username).afirst()
+    if user is None:
+        await ahash_password(password)
+    elif user.is_active and await acheck_password(user, password):
+        return user
+    # The password is left out, as authenticate() masks it
+    await user_login_failed.asend(
+        sender=__name__,
+        credentials={"username": username},
+        request=request,
+    )
+    return None
@@ -1,9 +1,53 @@
+"""Permission classes for the ninja controllers.
+
+They subclass ``AsyncBasePermission`` so async routes check them on the event
+loop; plain ``BasePermission`` classes are run through ``sync_to_async``, one
+thread round trip per permission and request.
+"""
+
+from typing import Any, FrozenSet
+
+from asgiref.sync import sync_to_async
 from django.http import HttpRequest
 from ninja_extra import ControllerBase
-from ninja_extra.permissions import BasePermission
+from ninja_extra.permissions import AsyncBasePermission
 
 
-class IsActiveUser(BasePermission):
+class RequestUserPermission(AsyncBasePermission):
+    """Base for permissions answered by ``has_permission`` alone.
+
+    Subclasses implement the sync ``has_permission``; the async check calls it
+    directly, so it must not query the database.
+    """
+
+    def has_object_permission(
+        self,
+        request: HttpRequest,
+        controller: ControllerBase,
+        obj: Any,
+    ) -> bool:
+        return True
+
+    async def has_permission_async(
+        self,
+        request: HttpRequest,
+        controller: ControllerBase,
+    ) -> bool:
+        return self.has_permission(request, controller)
+
+
+class IsAuthenticated(RequestUserPermission):
+    """Permission that checks if the request is authenticated.
+
+    Same check as ``ninja_extra.permissions.IsAuthenticated``, async-capable.
+    """
+
+    def has_permission(self, request: HttpRequest, controller: ControllerBase) -> bool:
+        user = request.user or request.auth  # type: ignore
+        return bool(user and user.is_authenticated)
+
+
+class IsActiveUser(RequestUserPermission):
     """Permission that checks if the user is active.
 
     Usage:
@@ -14,7 +58,7 @@ class IsActiveUser(BasePermission):
         return request.user.is_active
 
 
-class IsAdmin(BasePermission):
+class IsAdmin(RequestUserPermission):
     """Permission that checks if the user is an admin.
 
     Usage:
@@ -25,15 +69,50 @@ class IsAdmin(BasePermission):
         return request.user.is_staff or request.user.is_superuser  # type: ignore
 
 
-class HasRole(BasePermission):
+def get_role_names(user) -> FrozenSet[str]:
+    """Return the names of the groups ``user`` belongs to.
+
+    Users authenticated through ``user.authentication`` carry their group names
+    in the cached snapshot. For any other user the names are loaded with one
+    query and memoized on the user object, which lives for a single request.
+    """
+    if hasattr(type(user), "group_names"):
+        return user.group_names
+    role_names = getattr(user, "_role_names", None)
+    if role_names is None:
+        role_names = frozenset(user.groups.values_list("name", flat=True))
+        user._role_names = role_names
+    return role_names
+
+
+class HasRole(RequestUserPermission):
     """Dynamic permission based on Django's roles/groups.
 
+    Grants access when the user has any of the given roles, or all of them with
+    ``require_all=True``. Role membership is resolved once per request.
+
     Usage:
     @http_get("/admin-only", permissions=[HasRole("admin")])
+    @http_get("/staff", permissions=[HasRole("admin", "editor")])
+    @http_get("/audit", permissions=[HasRole("admin", "auditor", require_all=True)])
     """
 
-    def __init__(self, required_role: str):
-        self.required_role = required_role
+    def __init__(self, *required_roles: str, require_all: bool = False):
+        self.required_roles = frozenset(required_roles)
+        self.require_all = require_all
 
     def has_permission(self, request: HttpRequest, controller: ControllerBase) -> bool:
-        return request.user.groups.filter(name=self.required_role).exists()  # type: ignore
+        role_names = get_role_names(request.user)
+        if self.require_all:
+            return self.required_roles <= role_names
+        return not self.required_roles.isdisjoint(role_names)
+
+    async def has_permission_async(
+        self,
+        request: HttpRequest,
+        controller: ControllerBase,
+    ) -> bool:
+        if hasattr(type(request.user), "group_names"):
+            return self.has_permission(request, controller)
+        # Loading the groups of other users queries
+        return await sync_to_async(self.has_permission)(request, controller)
@@ -0,0 +1,124 @@
+"""Per-user cache of serialized user representations.
+
+Each user has one entry per representation: ``PROFILE``, the
+``UserRetrieveSchema`` JSON of the ninja routes, and ``SERIALIZER``, the
+``UserSerializer`` data of the DRF ``UserView``. Entries live in the Django
+cache named by ``settings.USER_PROFILE_CACHE``, so processes share them when
+that cache is file or Redis based. They are dropped when the user, or one of
+their contacts or addresses, is saved or deleted (``user.signals``), and share
+one set of hit and miss counters.
+
+Each entry also keeps the ETag of the version it was rendered from
+(``user.conditional``) and is only served for that version, so writes that
+skip signals (``QuerySet.update``, ``bulk_update``) never serve stale data.
+"""
+
+import threading
+from typing import Any, Dict, Iterable, Tuple
+
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+
+_cache_settings = getattr(settings, "USER_PROFILE_CACHE", {})
+
+PROFILE = "profile"
+SERIALIZER = "serializer"
+REPRESENTATIONS = (PROFILE, SERIALIZER)
+
+
+class ProfileCache:
+    """Serialized profiles per user id, with hit and miss counters."""
+
+    def __init__(self, alias: str = "default", timeout: int | None = 300):
+        self.alias = alias
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def cache(self) -> BaseCache:
+        return caches[self.alias]
+
+    @staticmethod
+    def key(user_id: int, representation: str = PROFILE) -> str:
+        return f"user-{representation}:{user_id}"
+
+    def _count(self, entry: Tuple[str, Any] | None, etag: str) -> Any:
+        hit = entry is not None and entry[0] == etag
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return entry[1] if hit else None
+
+    def get(self, user_id: int, etag: str, representation: str = PROFILE) -> Any:
+        """Return ``representation`` of ``user_id`` rendered at ``etag``, if cached."""
+        return self._count(self.cache.get(self.key(user_id, representation)), etag)
+
+    async def aget(
+        self,
+        user_id: int,
+        etag: str,
+        representation: str = PROFILE,
+    ) -> Any:
+        """Async ``get``."""
+        entry = await self.cache.aget(self.key(user_id, representation))
+        return self._count(entry, etag)
+
+    def set(
+        self,
+        user_id: int,
+        etag: str,
+        content: Any,
+        representation: str = PROFILE,
+    ) -> None:
+        """Store ``content``, ``representation`` of ``user_id`` rendered at ``etag``."""
+        key = self.key(user_id, representation)
+        self.cache.set(key, (etag, content), self.timeout)
+
+    async def aset(
+        self,
+        user_id: int,
+        etag: str,
+        content: Any,
+        representation: str = PROFILE,
+    ) -> None:
+        """Async ``set``."""
+        key = self.key(user_id, representation)
+        await self.cache.aset(key, (etag, content), self.timeout)
+
+    def delete(self, user_id: int) -> None:
+        """Drop every representation of ``user_id``."""
+        self.delete_many([user_id])
+
+    def delete_many(self, user_ids: Iterable[int]) -> None:
+        """Drop every representation of ``user_ids``."""
+        self.cache.delete_many(
+            [
+                self.key(user_id, representation)
+                for user_id in user_ids
+                for representation in REPRESENTATIONS
+            ]
+        )
+
+    def stats(self) -> Dict[str, float | str | None]:
+        """Return this process' counters, the backend's evictions and hit rate."""
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            "backend": type(self.cache).__name__,
+            "hits": hits,
+            "misses": misses,
+            # Only the backends of utils.cache_backends count evictions
+            "evictions": getattr(self.cache, "evictions", None),
+            "hit_rate": hits / lookups if lookups else 0.0,
+        }
+
+
+profile_cache = ProfileCache(
+    alias=_cache_settings.get("ALIAS", "default"),
+    timeout=_cache_settings.get("TIMEOUT", 300),
+)
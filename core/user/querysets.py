@@ -0,0 +1,117 @@
+"""Queryset helpers for reading users in bulk.
+
+Centralizes the prefetching and keyset pagination used by the list endpoints so
+nested relations (contacts, addresses, groups, permissions) never trigger one
+query per user.
+"""
+
+from typing import Iterator, List, Tuple
+
+from django.db.models import QuerySet
+
+from user.models import User
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+DEFAULT_CHUNK_SIZE = 2000
+
+# Concrete columns read by ``UserSerializer``; everything else stays deferred.
+SERIALIZED_USER_FIELDS = (
+    "id",
+    "email",
+    "username",
+    "first_name",
+    "last_name",
+    "cpf",
+    "date_birth",
+    "gender",
+    "is_superuser",
+    "is_staff",
+    "is_active",
+)
+
+
+def users_with_contacts(queryset: QuerySet | None = None) -> QuerySet:
+    """Return users ordered by primary key with their contacts prefetched."""
+    if queryset is None:
+        queryset = User.objects.all()
+    return queryset.prefetch_related("contacts").order_by("pk")
+
+
+def users_for_serializer(queryset: QuerySet | None = None) -> QuerySet:
+    """Return users loaded with everything ``UserSerializer`` renders.
+
+    Only the serialized columns are selected and every nested relation is
+    prefetched, so a page of users costs a constant number of queries.
+    """
+    if queryset is None:
+        queryset = User.objects.all()
+    return (
+        queryset.only(*SERIALIZED_USER_FIELDS)
+        .prefetch_related("contacts", "addresses", "groups", "user_permissions")
+        .order_by("pk")
+    )
+
+
+def keyset_paginate(
+    queryset: QuerySet,
+    cursor: int | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> Tuple[List, int | None]:
+    """Return one page of ``queryset`` after ``cursor`` and the next cursor.
+
+    The cursor is the primary key of the last row of the previous page, so each
+    page is a single ``pk > cursor`` range scan instead of an ``OFFSET``.
+    ``next_cursor`` is ``None`` once the last page has been reached.
+    """
+    if cursor is not None:
+        queryset = queryset.filter(pk__gt=cursor)
+    rows = list(queryset.order_by("pk")[: limit + 1])
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    return page, page[-1].pk
+
+
+async def akeyset_paginate(
+    queryset: QuerySet,
+    cursor: int | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> Tuple[List, int | None]:
+    """Async ``keyset_paginate``."""
+    if cursor is not None:
+        queryset = queryset.filter(pk__gt=cursor)
+    rows = [row async for row in queryset.order_by("pk")[: limit + 1]]
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    return page, page[-1].pk
+
+
+def iterate_in_chunks(
+    queryset: QuerySet,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator:
+    """Yield every row of ``queryset`` holding at most one chunk in memory.
+
+    Prefetches declared on ``queryset`` are resolved per chunk.
+    """
+    yield from queryset.order_by("pk").iterator(chunk_size=chunk_size)
+
+
+def iterate_pk_chunks(
+    queryset: QuerySet,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[List]:
+    """Yield ``queryset`` as lists of at most ``chunk_size`` rows, walking the pk.
+
+    Each chunk is an independent ``pk > last`` query (with its own prefetches),
+    so no database cursor stays open between chunks.
+    """
+    cursor = None
+    while True:
+        rows, cursor = keyset_paginate(queryset, cursor=cursor, limit=chunk_size)
+        if rows:
+            yield rows
+        if cursor is None:
+            return
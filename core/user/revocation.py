@@ -0,0 +1,151 @@
+"""Server-side JWT revocation by ``jti``.
+
+Revoked tokens are stored in ``RevokedToken`` and mirrored in-process as a
+Bloom filter plus a ``jti -> expiry`` map. Checking a token is a Bloom filter
+lookup (no query) for the common case of a token that was never revoked.
+
+Each process pulls revocations made elsewhere at most every
+``TOKEN_REVOCATION["SYNC_INTERVAL"]`` seconds, reading only rows created since
+the newest one it has seen, minus ``TOKEN_REVOCATION["SYNC_OVERLAP"]`` seconds.
+Rows can commit out of creation (and primary key) order, e.g. two concurrent
+logouts on PostgreSQL; the overlap re-reads recent rows so a row committed
+late is still picked up. Expired entries are dropped from memory, and the filter
+rebuilt, so memory stays bounded by the tokens that are still live. Expired
+rows are deleted from the table by
+``user.tasks.task_tokens.prune_revoked_tokens``.
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from ninja_jwt.settings import api_settings
+
+from user.models import RevokedToken
+from utils.bloom import BloomFilter
+
+
+class RevocationList:
+    """In-process view of the revoked token ids."""
+
+    def __init__(
+        self,
+        capacity: int = 100_000,
+        error_rate: float = 0.001,
+        sync_interval: float = 5.0,
+        prune_interval: float = 60.0,
+        sync_overlap: float = 60.0,
+    ):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self.prune_interval = prune_interval
+        self.sync_overlap = timedelta(seconds=sync_overlap)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget everything loaded so far; the next check resyncs from scratch."""
+        with self._lock:
+            self._expiry: Dict[str, float] = {}
+            self._bloom = BloomFilter(self.capacity, self.error_rate)
+            self._last_created_at: datetime | None = None
+            self._next_sync = 0.0
+            self._next_prune = time.monotonic() + self.prune_interval
+
+    def __len__(self) -> int:
+        return len(self._expiry)
+
+    def _add(self, jti: str, expires_at: float) -> None:
+        self._expiry[jti] = expires_at
+        self._bloom.add(jti)
+
+    def _prune(self) -> None:
+        """Drop expired ids and rebuild the filter from the live ones."""
+        now = time.time()
+        self._expiry = {jti: exp for jti, exp in self._expiry.items() if exp > now}
+        capacity = max(self.capacity, 2 * len(self._expiry))
+        self._bloom = BloomFilter(capacity, self.error_rate)
+        for jti in self._expiry:
+            self._bloom.add(jti)
+        self._next_prune = time.monotonic() + self.prune_interval
+
+    def sync(self) -> None:
+        """Load revocations recorded since the last sync."""
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            rows = RevokedToken.objects.all()
+            if self._last_created_at is not None:
+                rows = rows.filter(
+                    created_at__gte=self._last_created_at - self.sync_overlap,
+                )
+            for jti, expires_at, created_at in rows.values_list(
+                "jti",
+                "expires_at",
+                "created_at",
+            ):
+                if self._last_created_at is None or created_at > self._last_created_at:
+                    self._last_created_at = created_at
+                if expires_at > now:
+                    self._add(jti, expires_at.timestamp())
+            monotonic_now = time.monotonic()
+            if monotonic_now >= self._next_prune or len(self._expiry) > self.capacity:
+                self._prune()
+            self._next_sync = monotonic_now + self.sync_interval
+
+    def _contains(self, jti: str) -> bool:
+        if jti not in self._bloom:
+            return False
+        expires_at = self._expiry.get(jti)
+        return expires_at is not None and expires_at > time.time()
+
+    def is_revoked(self, jti: str | None) -> bool:
+        """Return whether the token identified by ``jti`` has been revoked."""
+        if not jti:
+            return False
+        if time.monotonic() >= self._next_sync:
+            self.sync()
+        return self._contains(jti)
+
+    async def ais_revoked(self, jti: str | None) -> bool:
+        """Async ``is_revoked``; only a due sync leaves the event loop."""
+        if not jti:
+            return False
+        if time.monotonic() >= self._next_sync:
+            await sync_to_async(self.sync)()
+        return self._contains(jti)
+
+    @staticmethod
+    def _row(token) -> Dict[str, Any]:
+        return {
+            "jti": token["jti"],
+            "defaults": {
+                "expires_at": datetime.fromtimestamp(token["exp"], tz=timezone.utc),
+                "user_id": token.get(api_settings.USER_ID_CLAIM),
+            },
+        }
+
+    def revoke(self, token) -> None:
+        """Revoke a validated ninja_jwt/simplejwt token until it expires."""
+        RevokedToken.objects.get_or_create(**self._row(token))
+        with self._lock:
+            self._add(token["jti"], token["exp"])
+
+    async def arevoke(self, token) -> None:
+        """Async ``revoke``."""
+        await RevokedToken.objects.aget_or_create(**self._row(token))
+        with self._lock:
+            self._add(token["jti"], token["exp"])
+
+
+_revocation_settings = getattr(settings, "TOKEN_REVOCATION", {})
+revocation_list = RevocationList(
+    capacity=_revocation_settings.get("CAPACITY", 100_000),
+    error_rate=_revocation_settings.get("ERROR_RATE", 0.001),
+    sync_interval=_revocation_settings.get("SYNC_INTERVAL", 5),
+    prune_interval=_revocation_settings.get("PRUNE_INTERVAL", 60),
+    sync_overlap=_revocation_settings.get("SYNC_OVERLAP", 60),
+)
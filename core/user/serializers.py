@@ -1,6 +1,9 @@
 from rest_framework import serializers
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
 
 from user.models import Address, Contact, User
+from user.revocation import revocation_list
 
 
 class ContactSerializer(serializers.ModelSerializer):
@@ -49,3 +52,13 @@ class UserSerializer(serializers.ModelSerializer):
             "is_active",
             "addresses",
         )
+
+
+class RevocableTokenRefreshSerializer(TokenRefreshSerializer):
+    """Token refresh that rejects refresh tokens revoked on logout."""
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        if revocation_list.is_revoked(refresh.get("jti")):
+            raise InvalidToken("Token has been revoked")
+        return super().validate(attrs)
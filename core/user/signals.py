@@ -0,0 +1,67 @@
+from django.contrib.auth.models import Group
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from user.authentication import user_cache
+from user.models import Address, Contact, User
+from user.profile_cache import profile_cache
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    """Drop the cached auth snapshot of a saved or deleted user."""
+    user_cache.delete(instance.pk)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_profile(sender, instance, **kwargs):
+    """Drop the cached profile of a saved or deleted user."""
+    profile_cache.delete(instance.pk)
+
+
+@receiver(post_save, sender=Contact)
+@receiver(post_delete, sender=Contact)
+@receiver(post_save, sender=Address)
+@receiver(post_delete, sender=Address)
+def invalidate_cached_profile_of_owner(sender, instance, **kwargs):
+    """Drop the cached profile of the user owning a contact or address."""
+    profile_cache.delete(instance.user_id)
+
+
+def _touch_users(user_pks) -> None:
+    """Bump ``updated_at`` so versioned representations (user.conditional) change."""
+    User.objects.filter(pk__in=user_pks).update(updated_at=timezone.now())
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.user_permissions.through)
+def invalidate_cached_user_groups(sender, instance, action, reverse, pk_set, **kwargs):
+    """Drop cached snapshots and bump users whose groups or permissions changed."""
+    if action == "pre_clear" and reverse:
+        # group.user_set.clear() does not report which users are affected
+        instance._cleared_user_pks = list(
+            instance.user_set.values_list("pk", flat=True),
+        )
+        return
+    if not action.startswith("post_"):
+        return
+    if not reverse:
+        user_pks = [instance.pk]
+    elif action == "post_clear":
+        user_pks = getattr(instance, "_cleared_user_pks", [])
+    else:
+        user_pks = pk_set or []
+    _touch_users(user_pks)
+    if sender is User.groups.through:
+        for user_pk in user_pks:
+            user_cache.delete(user_pk)
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_cached_users_for_group(sender, instance, **kwargs):
+    """Group renames and deletions affect every member; drop all snapshots."""
+    user_cache.clear()
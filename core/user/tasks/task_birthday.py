@@ -1,53 +1,257 @@
+import logging
+import uuid
+from datetime import timedelta
+from typing import Tuple
+
+from django.conf import settings
+from django.db.models import Exists, OuterRef, Prefetch
 from django.utils import timezone
+from django.utils.html import escape
+from django.utils.timesince import timesince
 from django_q.tasks import async_task
 
-from notifications.mailgun_notifier import MailgunEmailNotifier
-from user.models import Contact, User
+from core import queues
+from notifications.channels import Notification, Recipient, get_channel
+from notifications.rendering import template_cache
+from user.models import Contact, NotificationDelivery, User, birthday_keys
 
+logger = logging.getLogger(__name__)
 
-def send_birthday_email(user_id):
-    """Send birthday congratulations email to the specified user using Mailgun API."""
-    user = User.objects.get(id=user_id)
-    contact = user.contacts.filter(
-        type=Contact.ContactType.EMAIL,
-        is_active=True,
-    ).first()
-    if not contact:
-        print(f"[EMAIL] No active email contact for user {user_id}")
-        return f"No active email contact for user {user_id}"
+BIRTHDAY_NOTIFICATION = Notification(
+    subject="Happy Birthday! 🎉",
+    template_name="emails/birthday",
+)
 
-    subject = "Happy Birthday! 🎉"
-    template_name = "emails/birthday"
-    context = {"user": user}
+# Channels used for birthday congratulations, in dispatch order.
+BIRTHDAY_CHANNELS = (Contact.ContactType.EMAIL, Contact.ContactType.WHATSAPP)
 
-    notifier = MailgunEmailNotifier()
-    notifier.send(contact, subject, template_name, context)
-    return f"Birthday email sent to user {user_id}"
+# Number of users handed to each batch task enqueued by the daily fan-out.
+BIRTHDAY_BATCH_SIZE = 500
 
+# ``NotificationDelivery.campaign`` of birthday congratulations.
+BIRTHDAY_CAMPAIGN = "birthday"
 
-def send_birthday_whatsapp(user_id):
-    """Send birthday congratulations via WhatsApp to the specified user.
+# Pending ledger rows older than this belong to a batch whose worker was
+# killed at the bulk queue's timeout, and may be claimed again.
+CLAIM_TIMEOUT = timedelta(
+    seconds=settings.Q_CLUSTER["ALT_CLUSTERS"][queues.BULK]["timeout"],
+)
+
+
+def _has_active_contact(contact_type: str) -> Exists:
+    """Subquery flagging users that own an active contact of ``contact_type``."""
+    return Exists(
+        Contact.objects.filter(
+            user=OuterRef("pk"),
+            type=contact_type,
+            is_active=True,
+        ),
+    )
+
+
+def _ledger(contact_type: str, day):
+    """``NotificationDelivery`` rows of birthday congratulations."""
+    return NotificationDelivery.objects.filter(
+        campaign=BIRTHDAY_CAMPAIGN,
+        date=day,
+        channel=contact_type,
+    )
+
+
+def _delivered(contact_type: str, day) -> Exists:
+    """Subquery flagging users congratulated through ``contact_type`` on ``day``.
 
-    Currently just prints a message, but can be integrated with a real WhatsApp API.
+    Users claimed by a batch still running count as congratulated.
     """
-    print(f"[WHATSAPP] Sending birthday WhatsApp to user {user_id}")
-    return f"Birthday WhatsApp sent to user {user_id}"
+    return Exists(
+        _ledger(contact_type, day)
+        .filter(user=OuterRef("pk"))
+        .exclude(
+            status=NotificationDelivery.Status.PENDING,
+            updated_at__lt=timezone.now() - CLAIM_TIMEOUT,
+        ),
+    )
+
+
+def _claim(contact_type: str, day, user_ids) -> Tuple[uuid.UUID, set]:
+    """Claim the ledger rows of ``user_ids``; return the claim and claimed users.
+
+    Rows are inserted as pending, and stale pending rows taken over, under a
+    new claim token. The unique constraint and the conditional update let one
+    batch at most claim each row, so concurrent copies of a batch never send
+    to the same user.
+    """
+    claim = uuid.uuid4()
+    NotificationDelivery.objects.bulk_create(
+        [
+            NotificationDelivery(
+                user_id=user_id,
+                channel=contact_type,
+                campaign=BIRTHDAY_CAMPAIGN,
+                date=day,
+                status=NotificationDelivery.Status.PENDING,
+                claim=claim,
+            )
+            for user_id in user_ids
+        ],
+        # Rows claimed or sent by another batch are left to it
+        ignore_conflicts=True,
+    )
+    rows = _ledger(contact_type, day).filter(user_id__in=user_ids)
+    now = timezone.now()
+    rows.filter(
+        status=NotificationDelivery.Status.PENDING,
+        updated_at__lt=now - CLAIM_TIMEOUT,
+    ).update(claim=claim, updated_at=now)
+    return claim, set(rows.filter(claim=claim).values_list("user_id", flat=True))
+
+
+def _active_contacts(contact_type: str) -> Prefetch:
+    """Prefetch active contacts of ``contact_type`` into ``active_contacts``."""
+    return Prefetch(
+        "contacts",
+        queryset=Contact.objects.filter(type=contact_type, is_active=True).order_by(
+            "pk",
+        ),
+        to_attr="active_contacts",
+    )
+
+
+def send_birthday_batch(contact_type, user_ids, day=None):
+    """Send birthday congratulations to a batch of users through one channel.
+
+    Users not yet congratulated through ``contact_type`` on ``day`` (default:
+    today) and their active contacts are loaded in two queries, then claimed in
+    ``NotificationDelivery`` (see ``_claim``); only the users this batch claimed
+    are sent to. Recipients are handed to the channel's ``send_many`` in chunks
+    of its ``batch_size`` and each delivered chunk is marked sent right away. If
+    a chunk fails, the claims of the chunks not sent are released, so a retry
+    only sends to the users still missing.
+    """
+    day = day or timezone.localdate()
+    users = (
+        User.objects.filter(pk__in=user_ids)
+        .exclude(_delivered(contact_type, day))
+        .prefetch_related(_active_contacts(contact_type))
+    )
+    recipients = {}
+    recipient_users = {}
+    for user in users:
+        if not user.active_contacts:
+            logger.info("[%s] No active contact for user %s", contact_type, user.pk)
+            continue
+        contact = user.active_contacts[0]
+        name = user.get_display_name() or user.username
+        recipients.setdefault(
+            contact.value,
+            Recipient(
+                contact,
+                {
+                    "name": name,
+                    # Mailgun substitutes recipient variables unescaped
+                    "name_html": escape(name),
+                    "member_since": timesince(user.date_joined),
+                },
+            ),
+        )
+        recipient_users.setdefault(contact.value, []).append(user.pk)
+
+    claim, claimed = _claim(
+        contact_type,
+        day,
+        [user_id for user_ids in recipient_users.values() for user_id in user_ids],
+    )
+    claimed_rows = NotificationDelivery.objects.filter(
+        claim=claim,
+        status=NotificationDelivery.Status.PENDING,
+    )
+    pending = [
+        recipient
+        for value, recipient in recipients.items()
+        if claimed.intersection(recipient_users[value])
+    ]
+
+    channel = get_channel(contact_type)
+    chunk_size = channel.batch_size or len(pending) or 1
+    sent = 0
+    try:
+        for start in range(0, len(pending), chunk_size):
+            chunk = pending[start : start + chunk_size]
+            sent += channel.send_many(BIRTHDAY_NOTIFICATION, chunk)
+            claimed_rows.filter(
+                user_id__in=[
+                    user_id
+                    for recipient in chunk
+                    for user_id in recipient_users[recipient.contact.value]
+                ],
+            ).update(status=NotificationDelivery.Status.SENT)
+    except Exception:
+        claimed_rows.delete()
+        raise
+    logger.info("Notification template cache: %s", template_cache.stats())
+    return f"Birthday {contact_type} sent to {sent} of {len(user_ids)} users"
+
+
+def send_birthday_email(user_id):
+    """Send birthday congratulations email to the specified user."""
+    return send_birthday_batch(Contact.ContactType.EMAIL, [user_id])
+
+
+def send_birthday_whatsapp(user_id):
+    """Send birthday congratulations via WhatsApp to the specified user."""
+    return send_birthday_batch(Contact.ContactType.WHATSAPP, [user_id])
 
 
 def send_birthday_congratulations():
     """Search for users with birthday today and trigger congratulation tasks.
 
-    Sends congratulation messages via email and/or WhatsApp according to user's active contacts.
+    Birthdays match on month and day across years through the indexed
+    ``birth_month_day`` column (February 29 birthdays fall on February 28 in
+    non-leap years). A single annotated query yields each birthday user with one
+    flag per channel in ``BIRTHDAY_CHANNELS``, set when the user has an active
+    contact of that type and was not congratulated through it today (see
+    ``NotificationDelivery``), so a rerun enqueues nothing already sent. User
+    ids are then grouped by channel and enqueued in batches of
+    ``BIRTHDAY_BATCH_SIZE`` instead of one task per user, on the ``bulk``
+    queue (``core.queues``).
     """
-    today = timezone.now().today()
-    users = User.objects.filter(date_birth=today)
-    for user in users:
-        contacts = user.contacts.filter(is_active=True)  # type: ignore
-        email_contacts = contacts.filter(type=Contact.ContactType.EMAIL)
-        whatsapp_contacts = contacts.filter(type=Contact.ContactType.WHATSAPP)
-
-        if email_contacts.exists():
-            async_task("user.tasks.task_birthday.send_birthday_email", user.id)
-        if whatsapp_contacts.exists():
-            async_task("user.tasks.task_birthday.send_birthday_whatsapp", user.id)
-    return f"Processed {users.count()} users with birthday today"
+    today = timezone.localdate()
+    rows = (
+        User.objects.filter(birth_month_day__in=birthday_keys(today))
+        .annotate(
+            **{
+                f"to_{contact_type}": (
+                    _has_active_contact(contact_type) & ~_delivered(contact_type, today)
+                )
+                for contact_type in BIRTHDAY_CHANNELS
+            },
+        )
+        .order_by("pk")
+        .values_list("pk", *(f"to_{t}" for t in BIRTHDAY_CHANNELS))
+    )
+
+    pending = {contact_type: [] for contact_type in BIRTHDAY_CHANNELS}
+
+    def enqueue(contact_type):
+        async_task(
+            "user.tasks.task_birthday.send_birthday_batch",
+            contact_type,
+            pending[contact_type],
+            today,
+            cluster=queues.BULK,
+        )
+        pending[contact_type] = []
+
+    processed = 0
+    for user_id, *flags in rows.iterator():
+        processed += 1
+        for contact_type, to_send in zip(BIRTHDAY_CHANNELS, flags):
+            if to_send:
+                pending[contact_type].append(user_id)
+                if len(pending[contact_type]) >= BIRTHDAY_BATCH_SIZE:
+                    enqueue(contact_type)
+
+    for contact_type in BIRTHDAY_CHANNELS:
+        if pending[contact_type]:
+            enqueue(contact_type)
+    return f"Processed {processed} users with birthday today"
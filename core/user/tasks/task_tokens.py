@@ -0,0 +1,13 @@
+from django.utils import timezone
+
+from user.models import RevokedToken
+
+
+def prune_revoked_tokens():
+    """Delete revocation rows whose tokens have already expired.
+
+    Meant to be scheduled periodically; expired tokens are rejected by their
+    ``exp`` claim anyway, so their rows are no longer needed.
+    """
+    deleted, _ = RevokedToken.objects.filter(expires_at__lte=timezone.now()).delete()
+    return f"Pruned {deleted} expired revoked tokens"
@@ -0,0 +1,330 @@
+from datetime import date, timedelta
+
+import pytest
+from django.template.loader import render_to_string
+from django.utils import timezone
+from notifications import channels
+from notifications.testing import StubHTTPServer
+from user.models import Contact, NotificationDelivery, User
+from user.tasks import task_birthday
+
+from core import queues
+
+
+@pytest.fixture
+def enqueued(monkeypatch):
+    calls = []
+
+    def async_task(func, *args, cluster=None):
+        calls.append((func.rsplit(".", 1)[-1], *args))
+
+    monkeypatch.setattr(task_birthday, "async_task", async_task)
+    return calls
+
+
+def _birthday_user(username, *contact_types, is_active=True):
+    today = timezone.localdate()
+    user = User.objects.create(
+        username=username,
+        date_birth=today.replace(year=2000),
+    )
+    for contact_type in contact_types:
+        Contact.objects.create(
+            user=user,
+            type=contact_type,
+            value=f"{username}-{contact_type}",
+            is_active=is_active,
+        )
+    return user
+
+
+def test_fan_out_enqueues_one_batch_per_channel(
+    enqueued,
+    django_assert_num_queries,
+):
+    email_only = _birthday_user("a", Contact.ContactType.EMAIL)
+    both = _birthday_user(
+        "b",
+        Contact.ContactType.EMAIL,
+        Contact.ContactType.WHATSAPP,
+    )
+    _birthday_user("c", Contact.ContactType.EMAIL, is_active=False)
+    User.objects.create(username="not-today")
+    User.objects.create(
+        username="tomorrow",
+        date_birth=timezone.localdate() + timedelta(days=1),
+    )
+
+    with django_assert_num_queries(1):
+        result = task_birthday.send_birthday_congratulations()
+
+    assert result == "Processed 3 users with birthday today"
+    today = timezone.localdate()
+    assert enqueued == [
+        ("send_birthday_batch", "EMAIL", [email_only.pk, both.pk], today),
+        ("send_birthday_batch", "WHATSAPP", [both.pk], today),
+    ]
+
+
+def test_fan_out_congratulates_leap_day_birthdays_on_feb_28(enqueued, monkeypatch):
+    monkeypatch.setattr(task_birthday.timezone, "localdate", lambda: date(2025, 2, 28))
+    leap = User.objects.create(username="leap", date_birth=date(2000, 2, 29))
+    Contact.objects.create(user=leap, type=Contact.ContactType.EMAIL, value="x@y.z")
+
+    task_birthday.send_birthday_congratulations()
+
+    assert enqueued == [("send_birthday_batch", "EMAIL", [leap.pk], date(2025, 2, 28))]
+
+
+def test_fan_out_splits_batches(enqueued, monkeypatch):
+    monkeypatch.setattr(task_birthday, "BIRTHDAY_BATCH_SIZE", 2)
+    users = [_birthday_user(f"u{i}", Contact.ContactType.EMAIL) for i in range(5)]
+
+    task_birthday.send_birthday_congratulations()
+
+    assert [len(call[2]) for call in enqueued] == [2, 2, 1]
+    assert [pk for call in enqueued for pk in call[2]] == [u.pk for u in users]
+
+
+def test_fan_out_enqueues_on_the_bulk_queue(monkeypatch):
+    clusters = []
+    monkeypatch.setattr(
+        task_birthday,
+        "async_task",
+        lambda func, *args, cluster=None: clusters.append(cluster),
+    )
+    _birthday_user("a", Contact.ContactType.EMAIL, Contact.ContactType.WHATSAPP)
+
+    task_birthday.send_birthday_congratulations()
+
+    assert clusters == [queues.BULK, queues.BULK]
+
+
+def test_fan_out_skips_users_already_congratulated(enqueued):
+    user = _birthday_user("a", Contact.ContactType.EMAIL, Contact.ContactType.WHATSAPP)
+    NotificationDelivery.objects.create(
+        user=user,
+        channel=Contact.ContactType.EMAIL,
+        campaign=task_birthday.BIRTHDAY_CAMPAIGN,
+        date=timezone.localdate(),
+    )
+
+    task_birthday.send_birthday_congratulations()
+
+    assert [call[:3] for call in enqueued] == [
+        ("send_birthday_batch", "WHATSAPP", [user.pk]),
+    ]
+
+
+class FlakyChannel(channels.ConsoleChannel):
+    """Console channel sending two recipients per request, failing on demand."""
+
+    batch_size = 2
+    fail_after = None
+    sent = []
+
+    def send_many(self, notification, recipients):
+        if FlakyChannel.fail_after is not None and (
+            len(FlakyChannel.sent) >= FlakyChannel.fail_after
+        ):
+            raise ConnectionError("provider down")
+        FlakyChannel.sent.extend(r.contact.value for r in recipients)
+        return len(recipients)
+
+
+@pytest.fixture
+def flaky_channel(settings):
+    settings.NOTIFICATION_CHANNELS = {
+        Contact.ContactType.EMAIL: "user.tasks.test_task_birthday.FlakyChannel",
+    }
+    FlakyChannel.fail_after = None
+    FlakyChannel.sent = []
+    return FlakyChannel
+
+
+def test_batch_retry_only_sends_to_users_missing(flaky_channel):
+    users = [_birthday_user(f"u{i}", Contact.ContactType.EMAIL) for i in range(3)]
+    user_ids = [u.pk for u in users]
+
+    # The second request fails after the first chunk was delivered
+    flaky_channel.fail_after = 2
+    with pytest.raises(ConnectionError):
+        task_birthday.send_birthday_batch(Contact.ContactType.EMAIL, user_ids)
+    assert NotificationDelivery.objects.count() == 2
+
+    flaky_channel.fail_after = None
+    result = task_birthday.send_birthday_batch(Contact.ContactType.EMAIL, user_ids)
+
+    assert result == "Birthday EMAIL sent to 1 of 3 users"
+    assert flaky_channel.sent == ["u0-EMAIL", "u1-EMAIL", "u2-EMAIL"]
+
+
+def test_rerun_of_a_delivered_batch_sends_nothing(flaky_channel):
+    user = _birthday_user("u", Contact.ContactType.EMAIL)
+    task_birthday.send_birthday_batch(Contact.ContactType.EMAIL, [user.pk])
+
+    result = task_birthday.send_birthday_batch(Contact.ContactType.EMAIL, [user.pk])
+
+    assert result == "Birthday EMAIL sent to 0 of 1 users"
+    assert flaky_channel.sent == ["u-EMAIL"]
+    assert NotificationDelivery.objects.count() == 1
+
+
+def test_concurrent_copies_of_a_batch_send_once(flaky_channel, monkeypatch):
+    users = [_birthday_user(f"u{i}", Contact.ContactType.EMAIL) for i in range(3)]
+    user_ids = [u.pk for u in users]
+    claim = task_birthday._claim
+    results = []
+
+    def claim_after_other_copy(*args):
+        # Both copies have read the users before either claimed them
+        monkeypatch.setattr(task_birthday, "_claim", claim)
+        results.append(
+            task_birthday.send_birthday_batch(Contact.ContactType.EMAIL, user_ids),
+        )
+        return claim(*args)
+
+    monkeypatch.setattr(task_birthday, "_claim", claim_after_other_copy)
+    results.append(
+        task_birthday.send_birthday_batch(Contact.ContactType.EMAIL, user_ids),
+    )
+
+    assert results == [
+        "Birthday EMAIL sent to 3 of 3 users",
+        "Birthday EMAIL sent to 0 of 3 users",
+    ]
+    assert sorted(flaky_channel.sent) == ["u0-EMAIL", "u1-EMAIL", "u2-EMAIL"]
+    assert set(NotificationDelivery.objects.values_list("status", flat=True)) == {
+        NotificationDelivery.Status.SENT,
+    }
+
+
+def test_batch_takes_over_stale_claims_only(flaky_channel):
+    fresh, stale = [
+        _birthday_user(name, Contact.ContactType.EMAIL) for name in ("fresh", "stale")
+    ]
+    for user in (fresh, stale):
+        NotificationDelivery.objects.create(
+            user=user,
+            channel=Contact.ContactType.EMAIL,
+            campaign=task_birthday.BIRTHDAY_CAMPAIGN,
+            date=timezone.localdate(),
+            status=NotificationDelivery.Status.PENDING,
+        )
+    NotificationDelivery.objects.filter(user=stale).update(
+        updated_at=timezone.now() - task_birthday.CLAIM_TIMEOUT * 2,
+    )
+
+    task_birthday.send_birthday_batch(
+        Contact.ContactType.EMAIL,
+        [fresh.pk, stale.pk],
+    )
+
+    assert flaky_channel.sent == ["stale-EMAIL"]
+    assert NotificationDelivery.objects.get(user=stale).status == "SENT"
+    assert NotificationDelivery.objects.get(user=fresh).status == "PENDING"
+
+
+def test_email_batch_sends_one_mailgun_batch(monkeypatch, django_assert_num_queries):
+    batches = []
+
+    class FakeNotifier:
+        def send_batch(self, contacts, subject, template_name, context, variables):
+            batches.append(([c.value for c in contacts], context, variables))
+
+    monkeypatch.setattr(channels, "AsyncMailgunEmailNotifier", FakeNotifier)
+    users = [_birthday_user(f"u{i}", Contact.ContactType.EMAIL) for i in range(3)]
+    no_contact = User.objects.create(username="none")
+
+    # users, contacts, claiming in the delivery ledger (insert, stale claims,
+    # claimed users) and marking the chunk sent
+    with django_assert_num_queries(6):
+        result = task_birthday.send_birthday_batch(
+            Contact.ContactType.EMAIL,
+            [u.pk for u in users] + [no_contact.pk],
+        )
+
+    assert len(batches) == 1
+    addresses, context, variables = batches[0]
+    assert sorted(addresses) == [f"u{i}-EMAIL" for i in range(3)]
+    assert context["name"] == "%recipient.name%"
+    assert variables["u0-EMAIL"]["name"] == "u0"
+    assert result == "Birthday EMAIL sent to 3 of 4 users"
+
+
+def test_email_batch_escapes_names_for_the_html_body(monkeypatch):
+    batches = []
+
+    class FakeNotifier:
+        def send_batch(self, contacts, subject, template_name, context, variables):
+            html = render_to_string(f"{template_name}.html", context)
+            batches.append((html, variables))
+
+    monkeypatch.setattr(channels, "AsyncMailgunEmailNotifier", FakeNotifier)
+    user = _birthday_user("u", Contact.ContactType.EMAIL)
+    User.objects.filter(pk=user.pk).update(first_name="<b>Ana", last_name="& Bia")
+
+    task_birthday.send_birthday_batch(Contact.ContactType.EMAIL, [user.pk])
+
+    html, variables = batches[0]
+    assert "%recipient.name_html%" in html
+    assert "%recipient.name%" not in html
+    assert variables["u-EMAIL"]["name"] == "<b>Ana & Bia"
+    assert variables["u-EMAIL"]["name_html"] == "&lt;b&gt;Ana &amp; Bia"
+
+
+def test_whatsapp_batch_posts_one_request_to_the_gateway(monkeypatch):
+    users = [_birthday_user(f"u{i}", Contact.ContactType.WHATSAPP) for i in range(3)]
+
+    with StubHTTPServer() as gateway:
+        monkeypatch.setenv("WHATSAPP_API_URL", gateway.url)
+        monkeypatch.setenv("WHATSAPP_API_TOKEN", "token")
+        result = task_birthday.send_birthday_batch(
+            Contact.ContactType.WHATSAPP,
+            [u.pk for u in users],
+        )
+
+    assert result == "Birthday WHATSAPP sent to 3 of 3 users"
+    assert len(gateway.requests) == 1
+    request = gateway.requests[0]
+    assert request.path == "/messages/batch"
+    assert request.headers["Authorization"] == "Bearer token"
+    messages = request.json()["messages"]
+    assert [m["to"] for m in messages] == [f"u{i}-WHATSAPP" for i in range(3)]
+    assert "Olá u0," in messages[0]["text"]
+
+
+def test_whatsapp_text_is_not_html_escaped(monkeypatch):
+    user = _birthday_user("ana", Contact.ContactType.WHATSAPP)
+    User.objects.filter(pk=user.pk).update(first_name="Ana", last_name="D'Ávila & Co")
+
+    with StubHTTPServer() as gateway:
+        monkeypatch.setenv("WHATSAPP_API_URL", gateway.url)
+        monkeypatch.setenv("WHATSAPP_API_TOKEN", "token")
+        task_birthday.send_birthday_batch(Contact.ContactType.WHATSAPP, [user.pk])
+
+    [message] = gateway.requests[0].json()["messages"]
+    assert message["text"].startswith("Olá Ana D'Ávila & Co,\n")
+
+
+def test_batch_logs_template_cache_stats(settings, caplog):
+    settings.NOTIFICATION_CHANNELS = {
+        Contact.ContactType.EMAIL: "notifications.channels.ConsoleChannel",
+    }
+    user = _birthday_user("u", Contact.ContactType.EMAIL)
+
+    with caplog.at_level("INFO", logger="user.tasks.task_birthday"):
+        task_birthday.send_birthday_email(user.pk)
+
+    assert "Notification template cache: {'hits'" in caplog.text
+
+
+def test_channels_can_be_overridden_in_settings(settings, capsys):
+    settings.NOTIFICATION_CHANNELS = {
+        Contact.ContactType.EMAIL: "notifications.channels.ConsoleChannel",
+    }
+    user = _birthday_user("u", Contact.ContactType.EMAIL)
+
+    task_birthday.send_birthday_email(user.pk)
+
+    assert "[EMAIL] u-EMAIL: Happy Birthday!" in capsys.readouterr().out
@@ -0,0 +1,93 @@
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import Group
+from user.authentication import (
+    CachedUser,
+    aget_user_snapshot,
+    get_user_snapshot,
+    user_cache,
+)
+
+
+def test_repeated_requests_authenticate_from_cache(
+    jwt_client,
+    django_assert_num_queries,
+):
+    assert jwt_client.get("/api2/users/?limit=1").status_code == 200
+
+    # users page + contacts prefetch; no user lookup for authentication
+    with django_assert_num_queries(2):
+        assert jwt_client.get("/api2/users/?limit=1").status_code == 200
+    assert user_cache.stats()["hits"] >= 1
+
+
+def test_stats_route_reports_auth_cache_counters(jwt_client):
+    jwt_client.get("/api2/users/?limit=1")
+    before = user_cache.stats()
+
+    stats = jwt_client.get("/api2/users/auth-cache/stats").json()
+
+    assert stats["hits"] - before["hits"] == 1
+    assert stats["misses"] == before["misses"]
+    assert stats["size"] >= 1
+    assert 0 < stats["hit_rate"] <= 1
+
+
+def test_saving_user_invalidates_snapshot(jwt_client, staff_user):
+    assert jwt_client.get("/api2/users/?limit=1").status_code == 200
+
+    staff_user.is_staff = False
+    staff_user.save()
+
+    assert jwt_client.get("/api2/users/?limit=1").status_code == 403
+
+
+def test_deactivated_user_is_rejected(jwt_client, staff_user):
+    assert jwt_client.get("/api2/users/me").status_code == 200
+
+    staff_user.is_active = False
+    staff_user.save()
+
+    assert jwt_client.get("/api2/users/me").status_code == 401
+
+
+def test_group_membership_changes_invalidate_snapshot(staff_user):
+    group = Group.objects.create(name="editors")
+    assert get_user_snapshot(staff_user.pk).groups == frozenset()
+
+    staff_user.groups.add(group)
+    assert get_user_snapshot(staff_user.pk).groups == {"editors"}
+
+    group.user_set.remove(staff_user)
+    assert get_user_snapshot(staff_user.pk).groups == frozenset()
+
+
+def test_cached_user_loads_full_user_lazily(staff_user, django_assert_num_queries):
+    user = CachedUser(get_user_snapshot(staff_user.pk))
+
+    with django_assert_num_queries(0):
+        assert (user.pk, user.is_staff, user.is_active) == (staff_user.pk, True, True)
+    with django_assert_num_queries(1):
+        assert user.username == "admin"
+        assert user.check_password("x")
+    assert user == staff_user
+
+
+def test_drf_endpoints_use_cached_authentication(client, staff_user):
+    from rest_framework_simplejwt.tokens import AccessToken as DRFAccessToken
+
+    client.defaults["HTTP_AUTHORIZATION"] = (
+        f"Bearer {DRFAccessToken.for_user(staff_user)}"
+    )
+    misses = user_cache.stats()["misses"]
+
+    assert client.get("/api/users").status_code == 200
+    assert client.get("/api/users").status_code == 200
+    assert user_cache.stats()["misses"] == misses + 1
+
+
+def test_async_snapshot_lookup_uses_cache(staff_user, django_assert_num_queries):
+    with django_assert_num_queries(1):
+        snapshot = async_to_sync(aget_user_snapshot)(staff_user.pk)
+    with django_assert_num_queries(0):
+        assert async_to_sync(aget_user_snapshot)(staff_user.pk) is snapshot
+    assert snapshot.is_staff
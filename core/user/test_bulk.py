@@ -0,0 +1,110 @@
+from datetime import date
+
+import pytest
+from ninja_jwt.tokens import AccessToken
+from user.authentication import get_user_snapshot
+from user.models import Contact, User
+
+
+@pytest.fixture
+def users():
+    users = User.objects.bulk_create(
+        [User(username=f"user{i}", first_name=f"User {i}") for i in range(3)],
+    )
+    Contact.objects.create(user=users[0], type=Contact.ContactType.EMAIL, value="a@b.c")
+    return users
+
+
+def test_bulk_update_writes_only_changed_fields(
+    jwt_client,
+    users,
+    django_assert_num_queries,
+):
+    payload = {
+        "items": [
+            {"id": users[0].pk, "first_name": "Ana", "date_birth": "1990-06-15"},
+            {"id": users[1].pk, "first_name": "User 1"},
+            {"id": 999_999, "first_name": "Ghost"},
+        ],
+    }
+
+    # auth snapshot + select + savepoint + one UPDATE + release
+    with django_assert_num_queries(5):
+        response = jwt_client.patch(
+            "/api2/users/bulk",
+            payload,
+            content_type="application/json",
+        )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [r["status"] for r in body["results"]] == [
+        "updated",
+        "unchanged",
+        "not_found",
+    ]
+    assert body["counts"] == {"updated": 1, "unchanged": 1, "not_found": 1}
+    users[0].refresh_from_db()
+    assert users[0].first_name == "Ana"
+    assert users[0].date_birth == date(1990, 6, 15)
+    assert users[0].birth_month_day == 615
+
+
+def test_bulk_update_ignores_fields_it_cannot_change(jwt_client, users):
+    response = jwt_client.patch(
+        "/api2/users/bulk",
+        {"items": [{"id": users[0].pk, "is_superuser": True}]},
+        content_type="application/json",
+    )
+
+    assert response.status_code == 200
+    assert response.json()["counts"] == {"unchanged": 1}
+    users[0].refresh_from_db()
+    assert not users[0].is_superuser
+
+
+def test_bulk_deactivate_invalidates_auth_cache(jwt_client, users):
+    users[1].is_active = False
+    users[1].save()
+    assert get_user_snapshot(users[0].pk).is_active
+
+    response = jwt_client.post(
+        "/api2/users/bulk/deactivate",
+        {"ids": [users[0].pk, users[1].pk, 999_999]},
+        content_type="application/json",
+    )
+
+    assert response.status_code == 200
+    assert [r["status"] for r in response.json()["results"]] == [
+        "deactivated",
+        "already_inactive",
+        "not_found",
+    ]
+    assert not get_user_snapshot(users[0].pk).is_active
+    assert User.objects.filter(is_active=True).count() == 2  # admin + user2
+
+
+def test_bulk_delete_cascades(jwt_client, users):
+    response = jwt_client.post(
+        "/api2/users/bulk/delete",
+        {"ids": [users[0].pk, users[1].pk, 999_999]},
+        content_type="application/json",
+    )
+
+    assert response.status_code == 200
+    assert response.json()["counts"] == {"deleted": 2, "not_found": 1}
+    assert list(User.objects.exclude(username="admin")) == [users[2]]
+    assert not Contact.objects.exists()
+
+
+def test_bulk_endpoints_require_admin(client, users):
+    client.defaults["HTTP_AUTHORIZATION"] = f"Bearer {AccessToken.for_user(users[0])}"
+
+    response = client.post(
+        "/api2/users/bulk/delete",
+        {"ids": [users[1].pk]},
+        content_type="application/json",
+    )
+
+    assert response.status_code == 403
+    assert User.objects.filter(pk=users[1].pk).exists()
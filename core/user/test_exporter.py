@@ -0,0 +1,104 @@
+import csv
+import io
+import json
+from datetime import date
+
+import pytest
+from django.core.management import call_command
+from ninja_jwt.tokens import AccessToken
+from user.exporter import COLUMNS, export_users
+from user.importer import import_users
+from user.models import Address, Contact, User
+
+
+@pytest.fixture
+def users():
+    users = User.objects.bulk_create(
+        [User(username=f"user{i}", email=f"user{i}@example.com") for i in range(5)],
+    )
+    users[0].date_birth = date(1990, 6, 15)
+    users[0].save()
+    Contact.objects.bulk_create(
+        [
+            Contact(user=users[0], type=Contact.ContactType.WHATSAPP, value="81999"),
+            Contact(
+                user=users[0],
+                type=Contact.ContactType.PHONE,
+                value="old",
+                is_active=False,
+            ),
+            Contact(user=users[1], type=Contact.ContactType.PHONE, value="81333"),
+        ],
+    )
+    Address.objects.create(user=users[0], city="Recife", state="PE")
+    return users
+
+
+def test_export_csv_streams_chunks(users, django_assert_num_queries):
+    # per chunk: users + contacts + addresses; 5 users in chunks of 2
+    with django_assert_num_queries(3 * 3):
+        parts = list(export_users("csv", chunk_size=2))
+
+    assert len(parts) == 4
+    rows = list(csv.DictReader(io.StringIO("".join(parts))))
+    assert tuple(rows[0]) == COLUMNS
+    assert [row["username"] for row in rows] == [f"user{i}" for i in range(5)]
+    assert rows[0]["whatsapp"] == "81999"
+    assert rows[0]["phone"] == ""
+    assert rows[0]["city"] == "Recife"
+    assert rows[0]["date_birth"] == "1990-06-15"
+    assert rows[1]["phone"] == "81333"
+
+
+def test_export_csv_can_be_imported_again(users):
+    content = "".join(export_users("csv"))
+    User.objects.all().delete()
+
+    report = import_users(io.StringIO(content), "csv")
+
+    assert (report.created, report.error_count) == (5, 0)
+    assert User.objects.get(username="user0").addresses.get().city == "Recife"
+
+
+def test_export_jsonl(users):
+    lines = "".join(export_users("jsonl")).splitlines()
+
+    first = json.loads(lines[0])
+    assert len(lines) == 5
+    assert first["contacts"] == [{"type": "WHATSAPP", "value": "81999"}]
+    assert first["addresses"][0]["state"] == "PE"
+
+
+def test_export_parquet(users):
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    content = b"".join(export_users("parquet", chunk_size=2))
+
+    table = pq.read_table(io.BytesIO(content))
+    assert table.num_rows == 5
+    assert table.column("username").to_pylist() == [f"user{i}" for i in range(5)]
+    assert table.column("date_birth").to_pylist()[0] == date(1990, 6, 15)
+
+
+def test_export_users_command(users, tmp_path):
+    path = tmp_path / "users.jsonl"
+
+    call_command("export_users", str(path))
+
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 5
+
+
+def test_export_endpoint(client, users):
+    users[0].is_staff = True
+    users[0].save()
+
+    response = client.get(
+        "/api2/users/export?format=jsonl&chunk_size=2",
+        HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(users[0])}",
+    )
+
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/x-ndjson"
+    assert "users.jsonl" in response["Content-Disposition"]
+    body = b"".join(response.streaming_content).decode()
+    assert len(body.splitlines()) == 5
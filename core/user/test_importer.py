@@ -0,0 +1,194 @@
+import io
+import json
+from datetime import date
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from ninja_jwt.tokens import AccessToken
+from user.importer import import_users
+from user.models import Address, Contact, User
+
+
+def _cpf(base: str) -> str:
+    """Append the two CPF check digits to nine ``base`` digits."""
+    digits = [int(d) for d in base]
+    for weight in (10, 11):
+        total = sum(d * w for d, w in zip(digits, range(weight, 1, -1)))
+        digits.append(0 if total % 11 < 2 else 11 - total % 11)
+    return "".join(map(str, digits))
+
+
+CSV = f"""username;email;first_name;cpf;date_birth;whatsapp;street;city;state
+ana;ana@example.com;Ana;{_cpf("123456789")};15/06/1990;5581999990000;Rua A;Recife;pe
+bia;bia@example.com;Bia;{_cpf("987654321")};1985-02-28;;;;
+bad-cpf;;;12345678900;;;;;
+ana;dup@example.com;;;;;;;
+;;;;;;;;
+"""
+
+
+def test_import_csv():
+    report = import_users(io.StringIO(CSV), "csv")
+
+    assert (report.total, report.created, report.error_count) == (5, 2, 3)
+    assert [(e.line, e.message) for e in report.errors] == [
+        (4, "Invalid CPF number."),
+        (5, "duplicate username in file"),
+        (6, "username or cpf is required"),
+    ]
+    ana = User.objects.get(username="ana")
+    assert ana.cpf == _cpf("123456789")
+    assert ana.date_birth == date(1990, 6, 15)
+    assert ana.birth_month_day == 615
+    assert not ana.has_usable_password()
+    assert set(ana.contacts.values_list("type", "value")) == {
+        ("EMAIL", "ana@example.com"),
+        ("WHATSAPP", "5581999990000"),
+    }
+    assert ana.addresses.get().state == "PE"
+    assert not Address.objects.filter(user__username="bia").exists()
+
+
+def test_import_jsonl():
+    rows = [
+        {
+            "cpf": _cpf("111444777"),
+            "first_name": "Caio",
+            "contacts": [{"type": "phone", "value": "558133330000"}],
+            "addresses": [{"street": "Rua B", "city": "Olinda", "state": "PE"}],
+        },
+        {"username": "x", "contacts": [{"type": "FAX", "value": "1"}]},
+    ]
+    stream = io.StringIO("\n".join(map(json.dumps, rows)) + "\nnot json\n")
+
+    report = import_users(stream, "jsonl")
+
+    assert (report.total, report.created, report.error_count) == (3, 1, 2)
+    assert [e.line for e in report.errors] == [2, 3]
+    user = User.objects.get(username=_cpf("111444777"))
+    assert user.contacts.get().type == Contact.ContactType.PHONE
+    assert user.addresses.get().country == "Brazil"
+
+
+def test_import_jsonl_rejects_malformed_nested_values():
+    rows = [
+        {"username": "a", "contacts": ["x"]},
+        {"username": "b", "addresses": "rua"},
+        {"username": "c", "address": ["Rua C"]},
+        {"username": "d", "contacts": [{"type": "phone", "value": "558133330000"}]},
+    ]
+    stream = io.StringIO("\n".join(map(json.dumps, rows)))
+
+    report = import_users(stream, "jsonl")
+
+    assert (report.total, report.created, report.error_count) == (4, 1, 3)
+    assert [(e.line, e.message) for e in report.errors] == [
+        (1, "contacts must be a list of objects"),
+        (2, "addresses must be a list of objects"),
+        (3, "address must be an object"),
+    ]
+    assert User.objects.filter(username="d").exists()
+
+
+def test_import_reports_values_too_long_for_their_column():
+    rows = [
+        {"username": "u" * 151},
+        {"username": "a", "last_name": "x" * 151},
+        {"username": "b", "contacts": [{"type": "phone", "value": "9" * 256}]},
+        {"username": "c", "address": {"city": "Recife", "zip_code": "5" * 11}},
+    ]
+    stream = io.StringIO("\n".join(map(json.dumps, rows)))
+
+    report = import_users(stream, "jsonl")
+
+    assert (report.created, report.error_count) == (0, 4)
+    assert [e.message for e in report.errors] == [
+        "username is longer than 150 characters",
+        "last_name is longer than 150 characters",
+        "value is longer than 255 characters",
+        "zip_code is longer than 10 characters",
+    ]
+
+
+def test_import_skips_users_already_in_database():
+    User.objects.create(username="ana")
+    User.objects.create(username="other", cpf=_cpf("987654321"))
+
+    report = import_users(io.StringIO(CSV), "csv")
+
+    assert report.created == 0
+    assert {e.message for e in report.errors} >= {
+        "username already exists",
+        "cpf already exists",
+    }
+
+
+def test_import_writes_in_chunks(django_assert_max_num_queries):
+    rows = [
+        json.dumps({"username": f"user{i}", "email": f"u{i}@x.io"}) for i in range(10)
+    ]
+    chunks = []
+
+    # per chunk: existing keys, savepoint + release, users, contacts
+    with django_assert_max_num_queries(5 * 5):
+        report = import_users(
+            io.StringIO("\n".join(rows)),
+            "jsonl",
+            chunk_size=2,
+            on_chunk=lambda r: chunks.append(r.created),
+        )
+
+    assert chunks == [2, 4, 6, 8, 10]
+    assert report.created == User.objects.count() == 10
+    assert Contact.objects.count() == 10
+
+
+def test_import_users_command(tmp_path, capsys):
+    path = tmp_path / "users.csv"
+    path.write_text(CSV, encoding="utf-8")
+
+    call_command("import_users", str(path), "--chunk-size", "1")
+
+    out, err = capsys.readouterr()
+    assert "Imported 2 of 5 rows" in out
+    assert "line 4: Invalid CPF number." in err
+
+
+@pytest.mark.parametrize("filename", ["users.csv", "users.txt"])
+def test_import_endpoint(client, django_user_model, filename):
+    admin = django_user_model.objects.create_user(
+        username="admin",
+        password="x",
+        is_staff=True,
+    )
+    upload = SimpleUploadedFile(filename, CSV.encode())
+
+    response = client.post(
+        "/api2/users/import",
+        {"file": upload},
+        HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(admin)}",
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["total"], body["created"], body["error_count"]) == (5, 2, 3)
+    assert body["errors"][0] == {"line": 4, "message": "Invalid CPF number."}
+
+
+def test_import_endpoint_rejects_files_not_in_utf8(client, django_user_model):
+    admin = django_user_model.objects.create_user(
+        username="admin",
+        password="x",
+        is_staff=True,
+    )
+    upload = SimpleUploadedFile("users.csv", "username\nJoão\n".encode("latin-1"))
+
+    response = client.post(
+        "/api2/users/import",
+        {"file": upload},
+        HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(admin)}",
+    )
+
+    assert response.status_code == 400
+    assert "UTF-8" in response.json()["detail"]
@@ -0,0 +1,67 @@
+from datetime import date
+
+import pytest
+from django.db import IntegrityError
+from django.utils import timezone
+from user.models import User, birthday_keys
+
+
+def test_cpf_is_unique():
+    User.objects.create(username="a", cpf="12345678909")
+
+    with pytest.raises(IntegrityError):
+        User.objects.create(username="b", cpf="12345678909")
+
+
+def test_blank_cpf_is_stored_as_null_and_may_repeat():
+    first = User.objects.create(username="a", cpf="")
+    User.objects.create(username="b", cpf="")
+
+    first.refresh_from_db()
+    assert first.cpf is None
+
+
+def test_birth_month_day_follows_date_birth():
+    user = User.objects.create(username="a", date_birth=date(1990, 6, 15))
+    assert user.birth_month_day == 615
+
+    user.date_birth = date(1990, 12, 1)
+    user.save(update_fields=["date_birth"])
+    user.refresh_from_db()
+    assert user.birth_month_day == 1201
+
+
+@pytest.mark.parametrize(
+    ("today", "expected"),
+    [
+        (date(2025, 6, 15), [615]),
+        (date(2025, 2, 28), [228, 229]),
+        (date(2024, 2, 28), [228]),
+        (date(2024, 2, 29), [229]),
+    ],
+)
+def test_birthday_keys(today, expected):
+    assert birthday_keys(today) == expected
+
+
+def test_save_changes_detects_concurrent_edits():
+    user = User.objects.create(username="a")
+    stale = User.objects.get(pk=user.pk)
+
+    assert user.save_changes({"first_name": "Ana", "date_birth": date(1990, 6, 15)})
+    assert not stale.save_changes({"first_name": "Bia"})
+
+    user.refresh_from_db()
+    assert (user.first_name, user.birth_month_day) == ("Ana", 615)
+    assert stale.first_name == ""
+
+
+def test_partial_saves_bump_updated_at():
+    user = User.objects.create(username="ana")
+    updated_at = user.updated_at
+
+    user.last_login = timezone.now()
+    user.save(update_fields=["last_login"])
+
+    user.refresh_from_db()
+    assert user.updated_at > updated_at
@@ -0,0 +1,102 @@
+import threading
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth.hashers import verify_password
+from django.contrib.auth.signals import user_login_failed
+from ninja_jwt.tokens import AccessToken
+from user import passwords
+
+
+@pytest.fixture
+def user(django_user_model):
+    return django_user_model.objects.create_user(username="member", password="old")
+
+
+def test_change_password_hashes_new_password_once(client, user):
+    response = client.post(
+        "/api2/auth/change-password?old_password=old&new_password=new-secret",
+        HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}",
+    )
+
+    assert response.status_code == 200
+    user.refresh_from_db()
+    assert user.check_password("new-secret")
+
+
+def test_change_password_rejects_wrong_old_password(client, user):
+    response = client.post(
+        "/api2/auth/change-password?old_password=wrong&new_password=new-secret",
+        HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}",
+    )
+
+    assert response.status_code == 400
+    user.refresh_from_db()
+    assert user.check_password("old")
+
+
+def test_obtain_token_pair(client, user):
+    response = client.post(
+        "/api2/token/pair",
+        {"username": "member", "password": "old"},
+        content_type="application/json",
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["username"] == "member"
+    assert AccessToken(body["access"])["user_id"] == user.pk
+
+
+@pytest.mark.parametrize(
+    ("username", "password", "is_active"),
+    [("member", "wrong", True), ("unknown", "old", True), ("member", "old", False)],
+)
+def test_obtain_token_pair_rejects_invalid_credentials(
+    client,
+    user,
+    username,
+    password,
+    is_active,
+):
+    user.is_active = is_active
+    user.save()
+    failures = []
+
+    def receiver(sender, credentials, request, **kwargs):
+        failures.append((credentials, request))
+
+    user_login_failed.connect(receiver)
+    try:
+        response = client.post(
+            "/api2/token/pair",
+            {"username": username, "password": password},
+            content_type="application/json",
+        )
+    finally:
+        user_login_failed.disconnect(receiver)
+
+    assert response.status_code == 401
+    [(credentials, request)] = failures
+    assert credentials == {"username": username}
+    assert request.path == "/api2/token/pair"
+
+
+def test_password_is_verified_in_hashing_pool(monkeypatch, user):
+    threads = []
+
+    def recording_verify_password(*args, **kwargs):
+        threads.append(threading.current_thread().name)
+        return verify_password(*args, **kwargs)
+
+    monkeypatch.setattr(passwords, "verify_password", recording_verify_password)
+
+    assert async_to_sync(passwords.aauthenticate)("member", "old") == user
+    assert threads and threads[0].startswith("password-hasher")
+
+
+def test_aset_password_saves_single_hash(user):
+    async_to_sync(passwords.aset_password)(user, "new-secret")
+
+    user.refresh_from_db()
+    assert user.check_password("new-secret")
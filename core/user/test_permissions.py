@@ -0,0 +1,69 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import AnonymousUser, Group
+from django.test import RequestFactory
+from user.authentication import CachedUser, get_user_snapshot
+from user.permissions import HasRole, IsActiveUser, IsAdmin
+
+
+@pytest.fixture
+def member(django_user_model):
+    user = django_user_model.objects.create(username="member")
+    for name in ("admin", "editor"):
+        user.groups.add(Group.objects.create(name=name))
+    return user
+
+
+def _request(user):
+    request = RequestFactory().get("/")
+    request.user = user
+    return request
+
+
+@pytest.mark.parametrize(
+    ("permission", "allowed"),
+    [
+        (HasRole("admin"), True),
+        (HasRole("auditor"), False),
+        (HasRole("auditor", "editor"), True),
+        (HasRole("admin", "editor", require_all=True), True),
+        (HasRole("admin", "auditor", require_all=True), False),
+    ],
+)
+def test_has_role_any_and_all(member, permission, allowed):
+    assert permission.has_permission(_request(member), None) is allowed
+
+
+def test_stacked_roles_cost_one_query_per_request(member, django_assert_num_queries):
+    request = _request(member)
+
+    with django_assert_num_queries(1):
+        assert HasRole("admin").has_permission(request, None)
+        assert HasRole("editor").has_permission(request, None)
+        assert not HasRole("auditor").has_permission(request, None)
+
+
+def test_cached_user_roles_come_from_snapshot(member, django_assert_num_queries):
+    request = _request(CachedUser(get_user_snapshot(member.pk)))
+
+    with django_assert_num_queries(0):
+        assert HasRole("admin", "editor", require_all=True).has_permission(
+            request,
+            None,
+        )
+
+
+def test_anonymous_user_has_no_roles():
+    assert not HasRole("admin").has_permission(_request(AnonymousUser()), None)
+
+
+def test_async_checks_of_cached_user_stay_on_event_loop(
+    member,
+    django_assert_num_queries,
+):
+    request = _request(CachedUser(get_user_snapshot(member.pk)))
+
+    with django_assert_num_queries(0):
+        assert async_to_sync(HasRole("editor").has_permission_async)(request, None)
+        assert async_to_sync(IsActiveUser().has_permission_async)(request, None)
+        assert not async_to_sync(IsAdmin().has_permission_async)(request, None)
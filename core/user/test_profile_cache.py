@@ -0,0 +1,134 @@
+import pytest
+from django.utils import timezone
+from ninja_jwt.tokens import AccessToken
+from user.bulk import bulk_deactivate_users
+from user.models import Address, Contact, User
+from user.profile_cache import ProfileCache, profile_cache
+
+from utils.cache_backends import LRULocMemCache
+
+
+@pytest.fixture
+def user():
+    return User.objects.create_user(username="ana", email="ana@example.com")
+
+
+def _cached(user):
+    return profile_cache.cache.get(profile_cache.key(user.pk))
+
+
+def test_get_user_caches_the_serialized_profile(jwt_client, user):
+    response = jwt_client.get(f"/api2/users/{user.pk}")
+
+    etag, content = _cached(user)
+    assert etag == response["ETag"]
+    assert content == response.content.decode()
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        lambda user: user.save(),
+        lambda user: Contact.objects.create(user=user, type="phone", value="81999"),
+        lambda user: Address.objects.create(user=user, street="Rua A", city="Recife"),
+        lambda user: user.delete(),
+    ],
+    ids=["user-saved", "contact-created", "address-created", "user-deleted"],
+)
+def test_changes_drop_the_cached_profile(jwt_client, user, change):
+    jwt_client.get(f"/api2/users/{user.pk}")
+
+    change(user)
+
+    assert _cached(user) is None
+
+
+def test_profile_of_another_version_is_not_served(jwt_client, user):
+    url = f"/api2/users/{user.pk}"
+    jwt_client.get(url)
+    # QuerySet.update() sends no signal, so the entry stays, at the old version
+    User.objects.filter(pk=user.pk).update(first_name="Ana", updated_at=timezone.now())
+    assert _cached(user) is not None
+
+    assert jwt_client.get(url).json()["name"] == "Ana"
+
+
+def test_bulk_operations_drop_cached_profiles(jwt_client, user):
+    jwt_client.get(f"/api2/users/{user.pk}")
+
+    bulk_deactivate_users([user.pk])
+
+    assert _cached(user) is None
+
+
+def test_stats_count_hits_and_misses(jwt_client, user):
+    before = profile_cache.stats()
+    for _ in range(3):
+        jwt_client.get(f"/api2/users/{user.pk}")
+
+    stats = jwt_client.get("/api2/users/cache/stats").json()
+
+    assert stats["backend"] == "LRULocMemCache"
+    assert stats["hits"] - before["hits"] == 2
+    assert stats["misses"] - before["misses"] == 1
+    assert stats["evictions"] is not None
+
+
+def test_stats_require_admin(client, user):
+    client.defaults["HTTP_AUTHORIZATION"] = f"Bearer {AccessToken.for_user(user)}"
+
+    assert client.get("/api2/users/cache/stats").status_code == 403
+
+
+def test_locmem_evicts_least_recently_used_entry():
+    cache = LRULocMemCache("test-lru", {"OPTIONS": {"MAX_ENTRIES": 2}})
+    cache.clear()
+    before = cache.evictions
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert cache.evictions - before == 1
+
+
+@pytest.fixture(params=["locmem", "file", "redis"])
+def backend(request, settings, tmp_path):
+    """A ``profiles`` cache alias on each supported backend."""
+    if request.param == "locmem":
+        config = {
+            "BACKEND": "utils.cache_backends.LRULocMemCache",
+            "LOCATION": "test-profiles",
+        }
+    elif request.param == "file":
+        config = {
+            "BACKEND": "utils.cache_backends.FileBasedCache",
+            "LOCATION": str(tmp_path),
+        }
+    else:
+        fakeredis = pytest.importorskip("fakeredis")
+        config = {
+            "BACKEND": "utils.cache_backends.RedisCache",
+            "LOCATION": "redis://localhost:6379/15",
+            "OPTIONS": {"connection_class": fakeredis.FakeConnection},
+        }
+    settings.CACHES = {**settings.CACHES, "profiles": config}
+    cache = ProfileCache(alias="profiles", timeout=60)
+    cache.cache.clear()
+    return cache
+
+
+def test_profile_cache_on_each_backend(backend):
+    backend.set(1, '"1-1-0"', "{}")
+
+    assert backend.get(1, '"1-1-0"') == "{}"
+    assert backend.get(1, '"1-2-0"') is None
+
+    backend.delete_many([1])
+    assert backend.get(1, '"1-1-0"') is None
+    assert backend.stats()["hits"] == 1
+    assert backend.stats()["misses"] == 2
@@ -0,0 +1,168 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from ninja_jwt.tokens import AccessToken, RefreshToken
+from rest_framework_simplejwt.tokens import AccessToken as DRFAccessToken
+from rest_framework_simplejwt.tokens import RefreshToken as DRFRefreshToken
+from user.models import RevokedToken
+from user.revocation import RevocationList, revocation_list
+from user.tasks.task_tokens import prune_revoked_tokens
+from utils.bloom import BloomFilter
+
+
+@pytest.fixture
+def user(django_user_model):
+    return django_user_model.objects.create_user(username="member", password="x")
+
+
+def _bearer(token) -> dict:
+    return {"HTTP_AUTHORIZATION": f"Bearer {token}"}
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    keys = [f"jti-{i}" for i in range(1000)]
+    for key in keys:
+        bloom.add(key)
+
+    assert all(key in bloom for key in keys)
+    false_positives = sum(f"other-{i}" in bloom for i in range(10_000))
+    assert false_positives < 300
+
+
+def test_logout_revokes_access_token(client, user):
+    access = AccessToken.for_user(user)
+    assert client.get("/api2/users/me", **_bearer(access)).status_code == 200
+
+    response = client.post(
+        "/api2/auth/logout",
+        content_type="application/json",
+        **_bearer(access),
+    )
+
+    assert response.status_code == 200
+    assert RevokedToken.objects.filter(jti=access["jti"], user=user).exists()
+    assert client.get("/api2/users/me", **_bearer(access)).status_code == 401
+    # Other tokens of the same user keep working
+    other = AccessToken.for_user(user)
+    assert client.get("/api2/users/me", **_bearer(other)).status_code == 200
+
+
+def test_logout_revokes_refresh_token(client, user):
+    refresh = RefreshToken.for_user(user)
+    assert (
+        client.post(
+            "/api2/token/refresh",
+            {"refresh": str(refresh)},
+            content_type="application/json",
+        ).status_code
+        == 200
+    )
+
+    response = client.post(
+        "/api2/auth/logout",
+        {"refresh": str(refresh)},
+        content_type="application/json",
+        **_bearer(refresh.access_token),
+    )
+
+    assert response.status_code == 200
+    response = client.post(
+        "/api2/token/refresh",
+        {"refresh": str(refresh)},
+        content_type="application/json",
+    )
+    assert response.status_code == 401
+
+
+def test_logout_rejects_refresh_token_of_another_user(client, user, django_user_model):
+    other = django_user_model.objects.create_user(username="other", password="x")
+
+    response = client.post(
+        "/api2/auth/logout",
+        {"refresh": str(RefreshToken.for_user(other))},
+        content_type="application/json",
+        **_bearer(AccessToken.for_user(user)),
+    )
+
+    assert response.status_code == 400
+    assert not RevokedToken.objects.exists()
+
+
+def test_drf_rejects_revoked_tokens(client, user):
+    user.is_staff = True
+    user.save()
+    refresh = DRFRefreshToken.for_user(user)
+    access = DRFAccessToken.for_user(user)
+    revocation_list.revoke(refresh)
+    revocation_list.revoke(access)
+
+    assert client.get("/api/users", **_bearer(access)).status_code == 401
+    response = client.post("/api/auth/token/refresh/", {"refresh": str(refresh)})
+    assert response.status_code == 401
+
+
+def test_revocations_from_other_processes_are_synced(user):
+    access = AccessToken.for_user(user)
+    assert not revocation_list.is_revoked(access["jti"])
+
+    RevokedToken.objects.create(
+        jti=access["jti"],
+        user=user,
+        expires_at=timezone.now() + timedelta(minutes=5),
+    )
+    # Not visible until the next sync
+    assert not revocation_list.is_revoked(access["jti"])
+    revocation_list.sync()
+    assert revocation_list.is_revoked(access["jti"])
+
+
+def test_rows_committed_out_of_order_are_synced(user):
+    expires_at = timezone.now() + timedelta(minutes=5)
+    RevokedToken.objects.create(pk=100, jti="committed-first", expires_at=expires_at)
+    revocation_list.sync()
+
+    # A concurrent logout with a lower pk and an earlier creation time commits
+    # after the sync above
+    late = RevokedToken.objects.create(
+        pk=50,
+        jti="committed-late",
+        expires_at=expires_at,
+    )
+    RevokedToken.objects.filter(pk=late.pk).update(
+        created_at=timezone.now() - timedelta(seconds=1),
+    )
+    revocation_list.sync()
+
+    assert revocation_list.is_revoked("committed-first")
+    assert revocation_list.is_revoked("committed-late")
+
+
+def test_checks_between_syncs_do_not_query(user, django_assert_num_queries):
+    revocation_list.sync()
+
+    with django_assert_num_queries(0):
+        for i in range(100):
+            assert not revocation_list.is_revoked(f"jti-{i}")
+
+
+def test_expired_revocations_are_pruned(user):
+    revocations = RevocationList(capacity=10, sync_interval=0, prune_interval=0)
+    RevokedToken.objects.create(
+        jti="expired",
+        user=user,
+        expires_at=timezone.now() - timedelta(seconds=1),
+    )
+    RevokedToken.objects.create(
+        jti="live",
+        user=user,
+        expires_at=timezone.now() + timedelta(minutes=5),
+    )
+
+    assert not revocations.is_revoked("expired")
+    assert revocations.is_revoked("live")
+    assert len(revocations) == 1
+
+    assert prune_revoked_tokens() == "Pruned 1 expired revoked tokens"
+    assert list(RevokedToken.objects.values_list("jti", flat=True)) == ["live"]
@@ -0,0 +1,185 @@
+import json
+from datetime import date
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from user.models import Contact, User
+
+
+def _create_users(count):
+    users = User.objects.bulk_create(
+        [User(username=f"user{i}", email=f"user{i}@example.com") for i in range(count)],
+    )
+    Contact.objects.bulk_create(
+        [
+            Contact(user=user, type=Contact.ContactType.EMAIL, value=user.email)
+            for user in users
+        ],
+    )
+    return users
+
+
+def test_list_users_walks_pages_with_cursor(jwt_client, django_assert_max_num_queries):
+    _create_users(5)
+    expected = list(User.objects.order_by("pk").values_list("pk", flat=True))
+
+    seen = []
+    cursor = None
+    while True:
+        url = "/api2/users/?limit=2" + (f"&cursor={cursor}" if cursor else "")
+        with django_assert_max_num_queries(4):
+            response = jwt_client.get(url)
+        assert response.status_code == 200
+        data = response.json()
+        seen.extend(item["id"] for item in data["items"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == expected
+
+
+def test_list_users_page_query_count_does_not_grow(
+    jwt_client,
+    django_assert_max_num_queries,
+):
+    _create_users(50)
+    # auth user lookup + users + prefetched contacts
+    with django_assert_max_num_queries(4):
+        response = jwt_client.get("/api2/users/?limit=50")
+    assert len(response.json()["items"]) == 50
+    assert all(item["contacts"] for item in response.json()["items"][1:])
+
+
+def test_stream_users_yields_one_json_document_per_line(jwt_client):
+    _create_users(3)
+
+    response = jwt_client.get("/api2/users/stream?chunk_size=2")
+
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/x-ndjson"
+    lines = b"".join(response.streaming_content).decode().splitlines()
+    rows = [json.loads(line) for line in lines]
+    assert [row["email"] for row in rows] == [
+        "",
+        "user0@example.com",
+        "user1@example.com",
+        "user2@example.com",
+    ]
+    assert rows[1]["contacts"][0]["value"] == "user0@example.com"
+
+
+def test_get_me_resolves_display_name(jwt_client, staff_user):
+    admin = staff_user
+    admin.first_name, admin.last_name = "Ana", "Souza"
+    admin.date_birth = date(1990, 6, 15)
+    admin.save()
+
+    data = jwt_client.get("/api2/users/me").json()
+
+    assert data["name"] == "Ana Souza"
+    assert data["cpf"] is None
+
+
+def test_get_user_falls_back_to_username(jwt_client):
+    user = _create_users(1)[0]
+
+    data = jwt_client.get(f"/api2/users/{user.pk}").json()
+
+    assert data["name"] == "user0"
+    assert data["contacts"][0]["value"] == "user0@example.com"
+
+
+def test_get_me_answers_304_for_current_etag(
+    jwt_client,
+    django_assert_num_queries,
+):
+    first = jwt_client.get("/api2/users/me")
+    etag = first["ETag"]
+
+    # one aggregate query for the version; nothing is loaded or serialized
+    with django_assert_num_queries(1):
+        response = jwt_client.get("/api2/users/me", HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 304
+    assert response["ETag"] == etag
+    assert "Last-Modified" in first
+
+
+def test_unconditional_reads_are_served_from_profile_cache(
+    jwt_client,
+    django_assert_num_queries,
+):
+    user = _create_users(1)[0]
+    first = jwt_client.get(f"/api2/users/{user.pk}")
+
+    with django_assert_num_queries(1):
+        second = jwt_client.get(f"/api2/users/{user.pk}")
+
+    assert second.status_code == 200
+    assert second.json() == first.json()
+
+
+def test_contact_changes_change_the_etag(jwt_client):
+    user = _create_users(1)[0]
+    url = f"/api2/users/{user.pk}"
+    etag = jwt_client.get(url)["ETag"]
+
+    contact = Contact.objects.create(
+        user=user,
+        type=Contact.ContactType.PHONE,
+        value="81999",
+    )
+    response = jwt_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert len(response.json()["contacts"]) == 2
+
+    etag = response["ETag"]
+    contact.delete()
+    response = jwt_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert len(response.json()["contacts"]) == 1
+
+
+def test_get_missing_user_is_404(jwt_client):
+    assert jwt_client.get("/api2/users/999999").status_code == 404
+
+
+def test_update_user_writes_only_changed_columns(jwt_client):
+    user = _create_users(1)[0]
+
+    with CaptureQueriesContext(connection) as queries:
+        response = jwt_client.put(
+            f"/api2/users/{user.pk}",
+            {"first_name": "Ana", "email": user.email},
+            content_type="application/json",
+        )
+
+    assert response.status_code == 200
+    assert response.json()["name"] == "Ana"
+    [update] = [q["sql"] for q in queries if q["sql"].startswith("UPDATE")]
+    assert '"first_name"' in update
+    assert '"updated_at"' in update
+    assert '"email"' not in update
+    assert '"password"' not in update
+
+
+def test_update_user_rejects_stale_version(jwt_client):
+    user = _create_users(1)[0]
+    version = jwt_client.get(f"/api2/users/{user.pk}").json()["updated_at"]
+
+    first = jwt_client.put(
+        f"/api2/users/{user.pk}",
+        {"first_name": "Ana", "updated_at": version},
+        content_type="application/json",
+    )
+    second = jwt_client.put(
+        f"/api2/users/{user.pk}",
+        {"first_name": "Bia", "updated_at": version},
+        content_type="application/json",
+    )
+
+    assert first.status_code == 200
+    assert second.status_code == 409
+    user.refresh_from_db()
+    assert user.first_name == "Ana"
@@ -0,0 +1,105 @@
+import pytest
+from django.contrib.auth.models import Group, Permission
+from user.models import Address, Contact, User
+from user.pagination import UserCursorPagination
+from user.profile_cache import SERIALIZER, profile_cache
+
+# auth user lookup + users + contacts + addresses + groups + permissions
+LIST_QUERY_BUDGET = 6
+# the same plus the version aggregate of conditional requests
+RETRIEVE_QUERY_BUDGET = LIST_QUERY_BUDGET + 1
+
+
+def _create_users(count):
+    group = Group.objects.create(name=f"group-{count}")
+    permission = Permission.objects.first()
+    users = User.objects.bulk_create(
+        [User(username=f"user{i}-{count}", cpf=f"{i:011d}") for i in range(count)],
+    )
+    Contact.objects.bulk_create(
+        [Contact(user=u, type=Contact.ContactType.EMAIL, value="a@b.c") for u in users],
+    )
+    Address.objects.bulk_create([Address(user=u, city="Recife") for u in users])
+    for user in users:
+        user.groups.add(group)
+        user.user_permissions.add(permission)
+    return users
+
+
+@pytest.mark.parametrize("count", [1, 10, 100])
+def test_list_users_stays_within_query_budget(
+    jwt_client,
+    django_assert_max_num_queries,
+    count,
+):
+    _create_users(count)
+
+    with django_assert_max_num_queries(LIST_QUERY_BUDGET):
+        response = jwt_client.get("/api/users")
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    # The admin is listed too; the last case fills a whole page
+    assert len(results) == min(count + 1, UserCursorPagination.page_size)
+    assert results[-1]["contacts"][0]["value"] == "a@b.c"
+    assert results[-1]["addresses"][0]["city"] == "Recife"
+    assert len(results[-1]["groups"]) == 1
+    assert len(results[-1]["user_permissions"]) == 1
+
+
+def test_list_users_is_cursor_paginated(jwt_client):
+    _create_users(5)
+
+    response = jwt_client.get("/api/users?page_size=4")
+    first = response.json()
+    second = jwt_client.get(first["next"]).json()
+
+    ids = [row["id"] for row in first["results"] + second["results"]]
+    assert ids == sorted(ids)
+    assert len(ids) == 6
+    assert second["next"] is None
+
+
+def test_retrieve_user_stays_within_query_budget(
+    jwt_client,
+    django_assert_max_num_queries,
+):
+    user = _create_users(1)[0]
+
+    with django_assert_max_num_queries(RETRIEVE_QUERY_BUDGET):
+        response = jwt_client.get(f"/api/users/{user.pk}")
+
+    assert response.status_code == 200
+    assert response.json()["cpf"] == user.cpf
+
+
+def test_retrieve_user_is_conditional_on_groups(jwt_client):
+    user = _create_users(1)[0]
+    url = f"/api/users/{user.pk}"
+    etag = jwt_client.get(url)["ETag"]
+
+    assert jwt_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    user.groups.add(Group.objects.create(name="editors"))
+    response = jwt_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 200
+    assert len(response.json()["groups"]) == 2
+
+
+def test_retrieve_user_is_served_from_profile_cache(
+    jwt_client,
+    django_assert_num_queries,
+):
+    user = _create_users(1)[0]
+    url = f"/api/users/{user.pk}"
+    first = jwt_client.get(url)
+    before = profile_cache.stats()
+
+    # Only the version aggregate: the serialized data comes from the cache
+    with django_assert_num_queries(1):
+        response = jwt_client.get(url)
+
+    assert response.json() == first.json()
+    assert profile_cache.stats()["hits"] - before["hits"] == 1
+    assert profile_cache.cache.get(profile_cache.key(user.pk, SERIALIZER))
@@ -12,6 +12,18 @@ class BaseModel(models.Model):
 
         abstract = True
 
+    def save(self, *args, **kwargs):
+        """Save, writing ``updated_at`` even when ``update_fields`` is given.
+
+        ``auto_now`` only sets the attribute; without this, partial saves such
+        as ``save(update_fields=["last_login"])`` would leave the stored
+        ``updated_at``, and the versions derived from it, unchanged.
+        """
+        update_fields = kwargs.get("update_fields")
+        if update_fields:
+            kwargs["update_fields"] = {*update_fields, "updated_at"}
+        super().save(*args, **kwargs)
+
 
 class TenantAwareModel(BaseModel):
     """Abstract model that adds tenant isolation to models.
@@ -8,8 +8,6 @@ class UserNameMixin(Generic[T]):
 
     def get_display_name(self: T) -> str:
         """Retorna o nome completo ou o primeiro nome do usuário."""
-        if full_name := getattr(self, "get_full_name", lambda: None)():
-            return full_name
         first_name = getattr(self, "first_name", "")
         last_name = getattr(self, "last_name", "")
         return f"{first_name} {last_name}".strip()
@@ -1,9 +1,49 @@
+from django.http import Http404
+from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 
+from user.conditional import get_user_version, not_modified, set_version_headers
 from user.models import User
+from user.pagination import UserCursorPagination
+from user.profile_cache import SERIALIZER, profile_cache
+from user.querysets import users_for_serializer
 from user.serializers import UserSerializer
 
+# Related rows rendered by ``UserSerializer``; groups and permissions bump
+# ``User.updated_at`` themselves
+SERIALIZED_RELATIONS = ("contacts", "addresses")
+
 
 class UserView(ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
+    pagination_class = UserCursorPagination
+
+    def get_queryset(self):
+        """Use the prefetched, column-restricted queryset for read actions."""
+        queryset = super().get_queryset()
+        if self.action in ("list", "retrieve"):
+            return users_for_serializer(queryset)
+        return queryset
+
+    def retrieve(self, request, *args, **kwargs):
+        """Return the user, answering 304 when the client's copy is current.
+
+        The serialized data is kept in ``profile_cache`` with its version, so
+        repeated reads of an unchanged user cost one aggregate query.
+        """
+        try:
+            user_id = int(self.kwargs[self.lookup_field])
+        except ValueError as e:
+            raise Http404 from e
+        version = get_user_version(user_id, SERIALIZED_RELATIONS)
+        if version is None:
+            raise Http404
+        response = not_modified(request, version)
+        if response is None:
+            data = profile_cache.get(user_id, version.etag, SERIALIZER)
+            if data is None:
+                data = self.get_serializer(self.get_object()).data
+                profile_cache.set(user_id, version.etag, data, SERIALIZER)
+            response = Response(data)
+        return set_version_headers(response, version)
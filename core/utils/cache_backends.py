@@ -0,0 +1,85 @@
+"""Django cache backends that report how many entries they evicted.
+
+Each backend exposes an ``evictions`` count, read by cache users that publish
+statistics (e.g. ``user.profile_cache``):
+
+- ``LRULocMemCache``: per-process memory, evicting exactly the least recently
+  used entries once ``MAX_ENTRIES`` is reached (Django's backend drops a third
+  of the cache at once).
+- ``FileBasedCache``: Django's, counting the files culled by this process.
+- ``RedisCache``: Django's, reading the server's ``evicted_keys`` (None when
+  the server does not answer INFO). Redis only evicts with a ``maxmemory``
+  policy such as ``allkeys-lru``.
+
+Django creates backend instances per thread, so the LocMem and file counts are
+kept per cache location, as Django keeps the LocMem data.
+"""
+
+import random
+from collections import Counter
+
+from django.core.cache.backends import filebased, locmem, redis
+
+# Evictions per cache location, in this process
+_evictions: Counter = Counter()
+
+
+class LRULocMemCache(locmem.LocMemCache):
+    """Thread-safe in-memory cache bounded by LRU eviction."""
+
+    def __init__(self, name, params):
+        super().__init__(name, params)
+        self._name = name
+
+    @property
+    def evictions(self) -> int:
+        return _evictions[self._name]
+
+    def _set(self, key, value, timeout=locmem.DEFAULT_TIMEOUT):
+        if key not in self._cache and len(self._cache) >= self._max_entries:
+            self._cull()
+        self._cache[key] = value
+        self._cache.move_to_end(key, last=False)
+        self._expire_info[key] = self.get_backend_timeout(timeout)
+
+    def _cull(self):
+        # The least recently used entries are at the end of ``_cache`` (see
+        # ``LocMemCache.get``); drop them until there is room for one more.
+        while self._cache and len(self._cache) >= self._max_entries:
+            key, _ = self._cache.popitem()
+            del self._expire_info[key]
+            _evictions[self._name] += 1
+
+
+class FileBasedCache(filebased.FileBasedCache):
+    """File cache counting the entries it culled."""
+
+    @property
+    def evictions(self) -> int:
+        return _evictions[self._dir]
+
+    def _cull(self):
+        filelist = self._list_cache_files()
+        num_entries = len(filelist)
+        if num_entries < self._max_entries:
+            return
+        if self._cull_frequency == 0:
+            _evictions[self._dir] += num_entries
+            return self.clear()
+        filelist = random.sample(filelist, int(num_entries / self._cull_frequency))
+        for fname in filelist:
+            if self._delete(fname):
+                _evictions[self._dir] += 1
+
+
+class RedisCache(redis.RedisCache):
+    """Redis cache reporting the server's evictions."""
+
+    @property
+    def evictions(self) -> int | None:
+        client = self._cache.get_client(write=True)
+        try:
+            return client.info("stats").get("evicted_keys", 0)
+        except self._cache._lib.ResponseError:
+            # Servers or proxies without INFO (e.g. fakeredis) do not report it
+            return None
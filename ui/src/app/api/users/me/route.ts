@@ -54,14 +54,28 @@ export async function GET(request: NextRequest) {
       "🔗 BFF: Fazendo requisição para Django:",
       `${djangoApiUrl}/users/me`
     );
+    //    O ETag do cliente é repassado: se o usuário não mudou, o Django
+    //    responde 304 sem serializar nada.
+    const ifNoneMatch = request.headers.get("if-none-match");
     const response = await axios.get(`${djangoApiUrl}/users/me`, {
       headers: {
         Authorization: `Bearer ${token}`,
+        ...(ifNoneMatch ? { "If-None-Match": ifNoneMatch } : {}),
       },
+      validateStatus: (status) =>
+        status === 304 || (status >= 200 && status < 300),
     });
 
-    // 6. Retornamos os dados do usuário para o cliente.
-    return NextResponse.json(response.data);
+    // 6. Retornamos os dados do usuário (ou 304) para o cliente, com o ETag
+    //    para a próxima consulta.
+    const etag = response.headers["etag"];
+    const headers = etag
+      ? { ETag: etag, "Cache-Control": "private, no-cache" }
+      : undefined;
+    if (response.status === 304) {
+      return new NextResponse(null, { status: 304, headers });
+    }
+    return NextResponse.json(response.data, { headers });
   } catch (error) {
     // 7. Se a chamada ao Django falhar (ex: token inválido), logamos o erro
     //    e retornamos uma resposta de erro.